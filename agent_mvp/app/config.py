@@ -12,13 +12,101 @@ class Settings(BaseSettings):
     env: str = 'dev'
     openai_api_key: Optional[str] = None
     openai_model: str = 'gpt-4.1-mini'
+    openai_small_model: str = 'gpt-4.1-nano'
+    # 외부 API 주소(부하 테스트 시 scripts/fake_upstreams.py로 교체)
+    openai_base_url: str = 'https://api.openai.com/v1'
+    ddg_html_url: str = 'https://duckduckgo.com/html/'
+    ddg_api_url: str = 'https://api.duckduckgo.com/'
+    wikipedia_base_url: str = 'https://ja.wikipedia.org'
+    # OpenAI RPM/TPM 예산(이 프로세스 기준, worker가 여럿이면 나눠서 설정). 예산이 모자라면 대기 후 호출
+    openai_rpm_limit: int = 500
+    openai_tpm_limit: int = 200000
+    openai_queue_max_wait_s: float = 120.0
+    # 첫 응답 전 completion 토큰 추정값(이후 실제 사용량 평균으로 보정)
+    openai_completion_tokens_estimate: int = 1500
+    # 429 재시도: Retry-After가 없으면 base * 2^n(최대 max) 지수 backoff
+    openai_max_retries: int = 4
+    openai_retry_base_s: float = 1.0
+    openai_retry_max_s: float = 30.0
+    # 외부 HTTP 기록/재생(off|record|replay): 같은 입력으로 성능 비교/프로파일링
+    http_cassette_mode: str = 'off'
+    http_cassette_path: str = 'data/http_cassette.sqlite3'
+    # 재생 시 기록된 응답시간 배율(0이면 지연 없이 즉시 응답)
+    http_replay_latency_scale: float = 1.0
+    # 본문 해시가 달라도 method+URL만으로 재생할 경로(콤마 구분, 서명/타임스탬프가 본문에 드는 네이버 토큰 요청)
+    http_cassette_url_only_paths: str = '/v1/oauth2/token'
     llm_enabled: bool = True
+    llm_heuristic_max_price_jpy: int = 1000
+    llm_full_min_price_jpy: int = 20000
+    llm_full_min_margin_rate: float = 0.3
+    llm_full_below_completeness: float = 0.35
+    llm_min_detail_sections: int = 3
+    # USD / 1M tokens (small=gpt-4.1-nano, full=gpt-4.1-mini 기준)
+    llm_small_input_cost_per_1m: float = 0.10
+    llm_small_output_cost_per_1m: float = 0.40
+    llm_full_input_cost_per_1m: float = 0.40
+    llm_full_output_cost_per_1m: float = 1.60
+    precheck_skip_enrichment: bool = True
 
     default_markup_rate: float = 0.35
     min_margin_rate: float = 0.15
     default_fx_rate: float = 9.2
     default_shipping_cost_krw: int = 9000
     default_market_fee_rate: float = 0.13
+    pricing_tables_path: str = ''
+    pricing_rounding_rule: str = 'none'
+    catalog_db_path: str = 'data/catalog.sqlite3'
+    translation_memory_db_path: str = 'data/translation_memory.sqlite3'
+    translation_memory_seed_path: str = ''
+    # false면 LLM 번역은 미승인으로만 쌓고, POST /translation-memory로 승인한 것만 재사용
+    translation_memory_auto_approve: bool = True
+    # 다른 몰/URL의 같은 상품(MinHash 유사도) 보강 결과 재사용
+    near_duplicate_enabled: bool = True
+    near_duplicate_db_path: str = 'data/near_duplicates.sqlite3'
+    near_duplicate_threshold: float = 0.6
+    near_duplicate_model_match_threshold: float = 0.35
+    near_duplicate_max_candidates: int = 20
+    near_duplicate_bucket_cap: int = 200
+
+    response_compress_min_bytes: int = 1024
+    response_gzip_level: int = 5
+    response_brotli_quality: int = 5
+    # HTML 파싱/LLM 후처리 프로세스 수(0이면 요청 스레드에서 처리)
+    cpu_pool_workers: int = 0
+    # upstream(DDG/Wikipedia/OpenAI/쇼핑몰 호스트)별 circuit breaker
+    circuit_failure_threshold: int = 5
+    circuit_reset_timeout_s: float = 30.0
+    # 원문 페이지 fetch: 호스트별 p99 * multiplier로 timeout 조정, p95 초과 시 hedge 요청
+    fetch_timeout_s: float = 20.0
+    fetch_timeout_min_s: float = 3.0
+    fetch_timeout_p99_multiplier: float = 3.0
+    fetch_hedge_enabled: bool = True
+    fetch_hedge_min_delay_s: float = 0.3
+    fetch_hedge_threads: int = 16
+    host_latency_window: int = 200
+    host_latency_min_samples: int = 20
+    # 링크별 trace(단계/외부 호출 span): GET /traces/{trace_id}, JSON lines 파일 또는 OTLP/HTTP collector로 내보내기
+    tracing_enabled: bool = True
+    tracing_retention: int = 500
+    tracing_json_path: str = ''
+    tracing_otlp_endpoint: str = ''
+    tracing_service_name: str = 'agent-mvp'
+    # 요청 수락 제어: 동시 실행 슬롯을 interactive(단건)/batch(배치·벌크) lane이 나눠 쓰고, 대기열이 차면 429
+    admission_enabled: bool = True
+    admission_max_concurrency: int = 16
+    # batch lane이 쓸 수 없는(단건 요청 전용) 슬롯 수
+    admission_interactive_reserved: int = 4
+    admission_interactive_queue: int = 64
+    admission_interactive_max_wait_s: float = 5.0
+    admission_batch_queue: int = 8
+    admission_batch_max_wait_s: float = 30.0
+    # 관리자 기능(요청 프로파일링, /admin/*, 카탈로그 재가격, 재수집 실행/드리프트 처리, 번역 메모리 등록) 토큰. 비어 있으면 관리자 기능 비활성
+    admin_token: Optional[str] = None
+    profile_dir: str = 'data/profiles'
+    profile_retention: int = 50
+    profile_sample_interval_ms: float = 5.0
+    # 시작 직후 백그라운드에서 컴포넌트/파서를 미리 로드(Render free 플랜 콜드스타트 대비)
+    warm_up_on_startup: bool = False
 
     auto_publish: bool = False
     auto_publish_on_run_link: bool = True
@@ -29,7 +117,22 @@ class Settings(BaseSettings):
     naver_api_base_url: str = 'https://api.commerce.naver.com/external'
     naver_token_type: str = 'SELLER'
     naver_product_create_path: str = '/v2/products'
+    naver_product_price_update_path: str = '/v1/products/origin-products/{origin_product_no}/option-stock'
+    naver_product_update_path: str = '/v2/products/origin-products/{origin_product_no}'
+    # 등록/수정 때 보낸 payload(상품번호별). 다시 보낼 때 달라진 부분만 보고 가격/재고 수정·전체 수정·생략을 고른다
+    naver_payload_db_path: str = 'data/naver_payloads.sqlite3'
     naver_use_real_api: bool = False
+    # 실연동 시 원본 이미지를 네이버 이미지 호스트에 올려 그 URL로 등록(원본 URL → 내용 해시 → 네이버 URL 캐시)
+    naver_image_upload_enabled: bool = True
+    naver_image_upload_path: str = '/v1/product-images/upload'
+    naver_image_cache_db_path: str = 'data/naver_images.sqlite3'
+    # 원본 URL → 내용 해시 매핑 유효기간. 지나면 다시 내려받아 해시 확인(같은 URL로 이미지를 바꾸는 몰 대응, 내용이 같으면 재업로드 없음)
+    naver_image_source_ttl_s: float = 7 * 24 * 3600
+    naver_image_download_concurrency: int = 8
+    naver_image_download_timeout_s: float = 15.0
+    naver_image_max_bytes: int = 10 * 1024 * 1024
+    # 대표 1장 + 추가 이미지
+    naver_max_images: int = 10
     naver_default_leaf_category_id: int = 50000000
     naver_default_representative_image_url: Optional[str] = None
     naver_default_optional_image_urls: str = ''
@@ -40,6 +143,19 @@ class Settings(BaseSettings):
     naver_default_detail_content_html: str = '<p>상세 설명 준비 중</p>'
     naver_default_notice_type: str = 'FASHION_ITEMS'
     naver_payload_template_mode: str = 'auto'
+    # GET /v1/categories 덤프 경로. 비우면 카테고리 자동 선택 없이 기본 리프 ID 사용(샘플 트리: app/data/naver_category_tree.json)
+    naver_category_tree_path: str = ''
+    # 등록 상품 원문 재수집(가격/재고 변동 → /catalog/drift 큐). 상품별 주기는 변동 빈도에 따라 min~max에서 조정
+    recrawl_enabled: bool = False
+    recrawl_tick_s: float = 60.0
+    recrawl_budget_per_hour: int = 600
+    recrawl_concurrency: int = 4
+    recrawl_initial_interval_s: float = 6 * 3600
+    recrawl_min_interval_s: float = 3600
+    recrawl_max_interval_s: float = 7 * 86400
+    # 품절/재입고/삭제는 이 시간 뒤 한 번 더 같은 결과가 나와야 변동으로 기록
+    recrawl_confirm_delay_s: float = 600
+    naver_category_min_score: float = 4.0
 
 
 settings = Settings()
@@ -1,49 +1,340 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+import hmac
+import io
+import tempfile
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel
 from app.config import settings
 from app.schemas import (
+    CatalogRepriceRequest,
+    CatalogRepriceResponse,
+    DriftApplyRequest,
+    DriftApplyResponse,
+    DriftDismissRequest,
+    DriftEvent,
+    NaverBuildPayloadBatchRequest,
+    NaverBuildPayloadBatchResponse,
     NaverBuildPayloadRequest,
     NaverBuildPayloadResponse,
     NaverRawPublishRequest,
+    PricingSimulateRequest,
+    PricingSimulateResponse,
     PublishResult,
+    RecrawlRunRequest,
     RunLinkBatchRequest,
     RunLinkBatchResponse,
     RunLinkRequest,
     RunLinkResponse,
+    TranslationMemoryUpsertRequest,
+    TranslationMemoryUpsertResponse,
 )
+from app.services.admission import AdmissionController, AdmissionMiddleware
+from app.services.bulk_io import FORMAT_JSONL, detect_format
 from app.services.pipeline import LinkPipelineService
+from app.services.response_projection import ProjectionError, json_response, project, resolve_fields
+
+if TYPE_CHECKING:
+    from app.services.request_profiler import ProfileStore
 
 
 app = FastAPI(title=settings.app_name)
-service = LinkPipelineService()
+_admission = AdmissionController()
+app.add_middleware(AdmissionMiddleware, controller=_admission)
+_service: Optional[LinkPipelineService] = None
+_service_lock = threading.Lock()
+_profile_store: Optional[ProfileStore] = None
+
+
+def get_service() -> LinkPipelineService:
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = LinkPipelineService()
+    return _service
+
+
+@app.on_event('startup')
+def startup() -> None:
+    # 콜드스타트 응답(/health)을 막지 않도록 워밍업은 백그라운드에서
+    if settings.warm_up_on_startup:
+        threading.Thread(target=lambda: get_service().warm_up(), name='warm-up', daemon=True).start()
+    if settings.recrawl_enabled:
+        threading.Thread(target=lambda: get_service().recrawler.start(), name='recrawl-start', daemon=True).start()
+
+
+@app.on_event('startup')
+async def size_threadpool() -> None:
+    # 수락된 요청이 모두 스레드를 잡아도 제한 없는 경로(/health, /metrics 등)가 스레드를 기다리지 않도록
+    import anyio.to_thread
+
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = max(limiter.total_tokens, settings.admission_max_concurrency + 8)
+
+
+@app.on_event('shutdown')
+def shutdown() -> None:
+    if _service is not None and _service.is_loaded('recrawler'):
+        _service.recrawler.stop()
+    if _service is not None and _service.is_loaded('llm'):
+        _service.llm.cpu_pool.shutdown()
 
 
 @app.get('/health')
 def health() -> dict:
-    return {'status': 'ok', 'env': settings.env}
+    upstreams = get_service().upstream_health()
+    degraded = [name for name, st in upstreams.items() if st['state'] != 'closed']
+    return {'status': 'ok', 'env': settings.env, 'degraded_upstreams': degraded, 'upstreams': upstreams}
+
+
+@app.get('/metrics')
+def metrics() -> dict:
+    return {**get_service().metrics(), 'admission': _admission.snapshot()}
+
+
+@app.get('/traces/{trace_id}')
+def get_trace(
+    trace_id: str, output: str = Query(default='json', alias='format', description='json 또는 text')
+) -> Response:
+    tree = get_service().trace_waterfall(trace_id)
+    if tree is None:
+        raise HTTPException(status_code=404, detail=f'trace 없음(최근 TRACING_RETENTION건만 보관): {trace_id}')
+    if output == 'text':
+        from app.services.tracing import render_waterfall
+
+        return PlainTextResponse(render_waterfall(tree))
+    return json_response(tree, '')
+
+
+@app.post('/warmup')
+def warmup() -> dict:
+    return {'timings_ms': get_service().warm_up()}
+
+
+def _require_admin(request: Request) -> None:
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail='ADMIN_TOKEN 미설정: 관리자 기능 비활성')
+    if not hmac.compare_digest(request.headers.get('x-admin-token', ''), settings.admin_token):
+        raise HTTPException(status_code=403, detail='관리자 토큰이 올바르지 않습니다.')
+
+
+def _get_profile_store() -> ProfileStore:
+    global _profile_store
+    from app.services.request_profiler import ProfileStore
+
+    if _profile_store is None:
+        _profile_store = ProfileStore()
+    return _profile_store
+
+
+def _run_profiled(request: Request, meta: dict[str, Any], fn: Callable[[], Any]) -> tuple[Any, Optional[str]]:
+    """X-Profile: sample|cprofile 헤더(또는 ?debug_profile=)가 있으면 관리자 확인 후 이 요청을 프로파일링한다."""
+    mode = request.headers.get('x-profile') or request.query_params.get('debug_profile')
+    if not mode:
+        return fn(), None
+    _require_admin(request)
+    from app.services.request_profiler import ProfileError, ProfilerBusyError, profile_call
+
+    try:
+        result, saved = profile_call(_get_profile_store(), mode, {'path': request.url.path, **meta}, fn)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ProfileError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return result, saved['id']
+
+
+FIELDS_QUERY = Query(default=None, description='콤마 구분 필드 경로(예: extraction.title,pricing.target_price_krw)')
+PROFILE_QUERY = Query(default=None, description='full / sheet / ids-only')
+
+
+def _projected_response(
+    request: Request,
+    result: BaseModel,
+    fields: Optional[str],
+    profile: Optional[str],
+    key: Optional[str] = None,
+    profile_id: Optional[str] = None,
+) -> Response:
+    try:
+        tree = resolve_fields(fields, profile)
+    except ProjectionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if tree is None:
+        # 투영이 없으면 dict를 거치지 않고 pydantic이 바로 만든 JSON bytes를 쓴다.
+        body = result.model_dump_json().encode('utf-8')
+        res = json_response(body, request.headers.get('accept-encoding', ''))
+    else:
+        data = project(result.model_dump(mode='json'), {key: tree} if key else tree)
+        res = json_response(data, request.headers.get('accept-encoding', ''))
+    if profile_id:
+        res.headers['X-Profile-Id'] = profile_id
+    return res
 
 
 @app.post('/run-link', response_model=RunLinkResponse)
-def run_link(req: RunLinkRequest) -> RunLinkResponse:
-    return service.run(req.source_url, auto_publish=req.auto_publish)
+def run_link(
+    req: RunLinkRequest,
+    request: Request,
+    fields: Optional[str] = FIELDS_QUERY,
+    profile: Optional[str] = PROFILE_QUERY,
+) -> Response:
+    result, profile_id = _run_profiled(
+        request,
+        {'source_urls': [req.source_url]},
+        lambda: get_service().run(req.source_url, auto_publish=req.auto_publish, force_enrich=req.force_enrich),
+    )
+    return _projected_response(request, result, fields, profile, profile_id=profile_id)
 
 
 @app.post('/run-link-batch', response_model=RunLinkBatchResponse)
-def run_link_batch(req: RunLinkBatchRequest) -> RunLinkBatchResponse:
-    return service.run_batch(req.source_urls, auto_publish=req.auto_publish)
+def run_link_batch(
+    req: RunLinkBatchRequest,
+    request: Request,
+    fields: Optional[str] = FIELDS_QUERY,
+    profile: Optional[str] = PROFILE_QUERY,
+) -> Response:
+    result, profile_id = _run_profiled(
+        request,
+        {'source_urls': req.source_urls[:20]},
+        lambda: get_service().run_batch(req.source_urls, auto_publish=req.auto_publish, force_enrich=req.force_enrich),
+    )
+    return _projected_response(request, result, fields, profile, key='results', profile_id=profile_id)
+
+
+@app.post('/bulk/run')
+async def run_bulk(
+    request: Request,
+    input_format: Optional[str] = Query(default=None, alias='format', description='csv 또는 jsonl'),
+    output_format: Optional[str] = Query(default=None, alias='output', description='기본값: 입력과 동일'),
+    auto_publish: Optional[bool] = None,
+    force_enrich: Optional[bool] = None,
+) -> StreamingResponse:
+    in_fmt = detect_format(input_format, request.headers.get('content-type', ''))
+    out_fmt = detect_format(output_format, '') if output_format else in_fmt
+
+    # 업로드 본문은 디스크 임시파일로 흘려 받고, 결과는 한 행씩 처리해 바로 내려보낸다.
+    # 디스크 쓰기는 event loop를 막지 않도록 threadpool에서 한다.
+    spool = await run_in_threadpool(tempfile.TemporaryFile, mode='w+b')
+    try:
+        async for chunk in request.stream():
+            await run_in_threadpool(spool.write, chunk)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    text = io.TextIOWrapper(spool, encoding='utf-8-sig', newline='')
+
+    def body():
+        try:
+            yield from get_service().stream_bulk(
+                text, in_fmt, out_fmt, auto_publish=auto_publish, force_enrich=force_enrich
+            )
+        finally:
+            text.close()
+
+    media_type = 'application/x-ndjson' if out_fmt == FORMAT_JSONL else 'text/csv; charset=utf-8'
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={'Content-Disposition': f'attachment; filename="results.{out_fmt}"'},
+    )
 
 
 @app.post('/naver/publish-raw', response_model=PublishResult)
 def publish_naver_raw(req: NaverRawPublishRequest) -> PublishResult:
-    return service.publish_naver_raw(req.product_payload)
+    return get_service().publish_naver_raw(req.product_payload)
 
 
 @app.post('/naver/build-payload', response_model=NaverBuildPayloadResponse)
 def build_naver_payload(req: NaverBuildPayloadRequest) -> NaverBuildPayloadResponse:
-    return service.build_naver_payload(
+    return get_service().build_naver_payload(
         title=req.title,
         sale_price_krw=req.sale_price_krw,
         overrides=req.overrides,
         template_hint=req.template_hint,
     )
+
+
+@app.post('/naver/build-payload-batch', response_model=NaverBuildPayloadBatchResponse)
+def build_naver_payload_batch(req: NaverBuildPayloadBatchRequest) -> NaverBuildPayloadBatchResponse:
+    return get_service().build_naver_payload_batch(req.items)
+
+
+@app.post('/pricing/simulate', response_model=PricingSimulateResponse)
+def simulate_pricing(req: PricingSimulateRequest) -> PricingSimulateResponse:
+    try:
+        return get_service().simulate_pricing(req)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post('/catalog/reprice', response_model=CatalogRepriceResponse)
+def reprice_catalog(req: CatalogRepriceRequest, request: Request) -> CatalogRepriceResponse:
+    _require_admin(request)
+    return get_service().reprice_catalog(req.fx_rate, push_updates=req.push_updates, dry_run=req.dry_run)
+
+
+@app.get('/recrawl/status')
+def recrawl_status() -> dict:
+    return get_service().recrawl_status()
+
+
+@app.post('/recrawl/run')
+def run_recrawl(req: RecrawlRunRequest, request: Request) -> dict:
+    _require_admin(request)
+    # RECRAWL_ENABLED 없이 외부 cron으로 돌릴 때
+    return get_service().run_recrawl(req.limit)
+
+
+@app.get('/catalog/drift', response_model=list[DriftEvent])
+def list_drift(
+    status: Optional[str] = Query(default='pending', description='pending | applied | dismissed (비우면 전체)'),
+    limit: int = Query(default=200, ge=1, le=5000),
+) -> list[DriftEvent]:
+    return get_service().drift_events(status or None, limit)
+
+
+@app.post('/catalog/drift/apply', response_model=DriftApplyResponse)
+def apply_drift(req: DriftApplyRequest, request: Request) -> DriftApplyResponse:
+    _require_admin(request)
+    return get_service().apply_drift(req.ids, push_updates=req.push_updates)
+
+
+@app.post('/catalog/drift/dismiss')
+def dismiss_drift(req: DriftDismissRequest, request: Request) -> dict:
+    _require_admin(request)
+    return {'dismissed': get_service().dismiss_drift(req.ids, req.note)}
+
+
+@app.post('/translation-memory', response_model=TranslationMemoryUpsertResponse)
+def upsert_translation_memory(
+    req: TranslationMemoryUpsertRequest, request: Request
+) -> TranslationMemoryUpsertResponse:
+    _require_admin(request)
+    return get_service().upsert_translations(req.entries)
+
+
+@app.get('/admin/profiles')
+def list_profiles(request: Request) -> dict:
+    _require_admin(request)
+    return {'profiles': _get_profile_store().list()}
+
+
+@app.get('/admin/profiles/{profile_id}')
+def download_profile(profile_id: str, request: Request) -> FileResponse:
+    _require_admin(request)
+    from app.services.request_profiler import MODE_SAMPLE, ProfileError
+
+    try:
+        meta, path = _get_profile_store().get(profile_id)
+    except ProfileError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    media_type = 'text/plain; charset=utf-8' if meta['mode'] == MODE_SAMPLE else 'application/octet-stream'
+    return FileResponse(path, media_type=media_type, filename=path.name)
@@ -11,11 +11,15 @@ class RunLinkRequest(BaseModel):
     auto_publish: Optional[bool] = Field(
         default=None, description='None이면 서버 기본값 사용, true/false면 요청 기준'
     )
+    force_enrich: Optional[bool] = Field(
+        default=None, description='true면 사전검사에서 반려돼도 웹 컨텍스트/LLM 보강까지 실행(검수용)'
+    )
 
 
 class RunLinkBatchRequest(BaseModel):
     source_urls: list[str] = Field(default_factory=list)
     auto_publish: Optional[bool] = None
+    force_enrich: Optional[bool] = None
 
 
 class NaverRawPublishRequest(BaseModel):
@@ -35,6 +39,14 @@ class NaverBuildPayloadResponse(BaseModel):
     validation_errors: list[str] = Field(default_factory=list)
 
 
+class NaverBuildPayloadBatchRequest(BaseModel):
+    items: list[NaverBuildPayloadRequest] = Field(default_factory=list)
+
+
+class NaverBuildPayloadBatchResponse(BaseModel):
+    results: list[NaverBuildPayloadResponse] = Field(default_factory=list)
+
+
 class ProductExtraction(BaseModel):
     source_site: str
     source_url: str
@@ -61,6 +73,126 @@ class PricingResult(BaseModel):
     estimated_margin_rate: float
 
 
+class PricingSimulateItem(BaseModel):
+    sku: str = ''
+    source_price_jpy: float
+    category: Optional[str] = Field(default=None, description='leaf 카테고리 ID 또는 "대분류>중분류>소분류"')
+    weight_g: Optional[float] = None
+
+
+class PricingScenarioInput(BaseModel):
+    name: str
+    fx_rate: Optional[float] = None
+    markup_rate: Optional[float] = None
+    market_fee_rate: Optional[float] = Field(default=None, description='지정 시 카테고리 수수료 테이블 무시')
+    shipping_cost_krw: Optional[int] = Field(default=None, description='지정 시 무게/카테고리 배송비 테이블 무시')
+    min_margin_rate: Optional[float] = None
+    rounding_rule: Optional[str] = Field(default=None, description='none/ceil_10/ceil_100/ceil_1000/charm_900')
+
+
+class PricingSimulateRequest(BaseModel):
+    items: list[PricingSimulateItem] = Field(default_factory=list)
+    scenarios: list[PricingScenarioInput] = Field(default_factory=list)
+    include_items: bool = Field(default=True, description='false면 시나리오별 집계만 반환')
+
+
+class PricingScenarioResult(BaseModel):
+    name: str
+    fx_rate: float
+    approved_count: int
+    rejected_count: int
+    avg_margin_rate: float
+    total_target_price_krw: int
+    target_price_krw: list[int] = Field(default_factory=list)
+    estimated_margin_rate: list[float] = Field(default_factory=list)
+    approved: list[bool] = Field(default_factory=list)
+
+
+class PricingSimulateResponse(BaseModel):
+    item_count: int
+    skus: list[str] = Field(default_factory=list)
+    scenarios: list[PricingScenarioResult] = Field(default_factory=list)
+
+
+class CatalogRepriceRequest(BaseModel):
+    fx_rate: float = Field(..., gt=0, description='새 JPY->KRW 환율 스냅샷')
+    push_updates: bool = Field(default=True, description='등록된 상품 중 판매가가 바뀐 것만 네이버 가격수정 호출')
+    dry_run: bool = Field(default=False, description='true면 계산만 하고 저장/호출하지 않음')
+
+
+class RepricedItem(BaseModel):
+    source_url: str
+    market_product_id: Optional[str] = None
+    old_target_price_krw: int
+    new_target_price_krw: int
+    old_approval_status: str
+    new_approval_status: str
+    estimated_margin_rate: float
+    update_attempted: bool = False
+    update_success: bool = False
+    update_message: str = ''
+
+
+class CatalogRepriceResponse(BaseModel):
+    fx_rate: float
+    item_count: int
+    changed_count: int
+    approval_changed_count: int
+    updates_sent: int
+    updates_failed: int
+    dry_run: bool
+    items: list[RepricedItem] = Field(default_factory=list)
+
+
+class RecrawlRunRequest(BaseModel):
+    limit: Optional[int] = Field(default=None, ge=1, le=5000, description='이번 실행에서 확인할 최대 상품 수(시간당 예산 안에서)')
+
+
+class DriftEvent(BaseModel):
+    id: int
+    source_url: str
+    market_product_id: Optional[str] = None
+    kind: str = Field(..., description='price | out_of_stock | back_in_stock | gone')
+    old_price_jpy: Optional[int] = None
+    new_price_jpy: Optional[int] = None
+    status: str = Field(..., description='pending | applied | dismissed')
+    detected_at: str
+    resolved_at: Optional[str] = None
+    note: str = ''
+
+
+class DriftApplyRequest(BaseModel):
+    ids: Optional[list[int]] = Field(default=None, description='비우면 대기 중인 가격 변동 전체')
+    push_updates: bool = Field(default=True, description='판매가가 바뀐 등록 상품은 네이버 가격수정 호출')
+
+
+class DriftApplyResponse(BaseModel):
+    applied_ids: list[int] = Field(default_factory=list)
+    failed_ids: list[int] = Field(default_factory=list)
+    # 품절/재입고/삭제는 판매중지·재개 처리 후 dismiss(또는 수동 처리)
+    availability_pending_ids: list[int] = Field(default_factory=list)
+    reprice: Optional[CatalogRepriceResponse] = None
+
+
+class DriftDismissRequest(BaseModel):
+    ids: list[int] = Field(..., min_length=1)
+    note: str = Field(default='수동 취소', max_length=300)
+
+
+class TranslationMemoryEntry(BaseModel):
+    ja: str
+    ko: str
+
+
+class TranslationMemoryUpsertRequest(BaseModel):
+    entries: list[TranslationMemoryEntry]
+
+
+class TranslationMemoryUpsertResponse(BaseModel):
+    stored: int
+    entries: int
+
+
 class PolicyResult(BaseModel):
     risk: str
     blocked: bool
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import threading
+import time
+from collections import deque
+from typing import Any
+from typing import Optional
+
+from app.config import settings
+
+LANE_INTERACTIVE = 'interactive'
+LANE_BATCH = 'batch'
+# 경로 → lane. 여기 없는 경로(/health, /metrics, /traces, /admin 등)는 제한하지 않는다.
+ROUTE_LANES = {
+    '/run-link': LANE_INTERACTIVE,
+    '/naver/build-payload': LANE_INTERACTIVE,
+    '/naver/publish-raw': LANE_INTERACTIVE,
+    # 벡터화된 가격 시뮬레이션은 수 ms라 시트 대량 실행 뒤에 줄 세울 이유가 없다.
+    '/pricing/simulate': LANE_INTERACTIVE,
+    '/run-link-batch': LANE_BATCH,
+    '/naver/build-payload-batch': LANE_BATCH,
+    '/bulk/run': LANE_BATCH,
+    '/catalog/reprice': LANE_BATCH,
+    '/catalog/drift/apply': LANE_BATCH,
+    '/recrawl/run': LANE_BATCH,
+    '/translation-memory': LANE_BATCH,
+}
+_WINDOW = 200
+_RETRY_AFTER_MAX_S = 120
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, lane: str, reason: str, retry_after_s: int) -> None:
+        super().__init__(f'{lane} lane 포화({reason}): {retry_after_s}초 후 다시 시도하세요.')
+        self.lane = lane
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+
+
+class _Waiter:
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.future: asyncio.Future[None] = loop.create_future()
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+
+
+class _Lane:
+    def __init__(self, name: str, slots: int, queue_limit: int, max_wait_s: float) -> None:
+        self.name = name
+        self.slots = max(slots, 1)
+        self.queue_limit = queue_limit
+        self.max_wait_s = max_wait_s
+        self.running = 0
+        self.waiters: deque[_Waiter] = deque()
+        self.wait_s: deque[float] = deque(maxlen=_WINDOW)
+        self.service_s: deque[float] = deque(maxlen=_WINDOW)
+        self.counts = {'admitted': 0, 'rejected_queue_full': 0, 'rejected_timeout': 0}
+
+    def retry_after(self) -> int:
+        # 앞에 기다리는 요청이 다 빠질 때까지의 대략적인 시간(최근 평균 처리시간 기준)
+        avg = sum(self.service_s) / len(self.service_s) if self.service_s else self.max_wait_s
+        return min(max(math.ceil(avg * (len(self.waiters) + 1) / self.slots), 1), _RETRY_AFTER_MAX_S)
+
+
+def _percentile_ms(samples: deque[float], q: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)] * 1000, 1)
+
+
+class AdmissionController:
+    """동시 실행 슬롯 max_concurrency개를 두 lane이 나눠 쓴다.
+
+    interactive는 빈 슬롯이 있으면 바로, 슬롯이 나면 batch보다 먼저 들어간다.
+    batch는 interactive용 예약 슬롯을 남겨 둔 만큼만 쓴다(남는 용량만 사용).
+    대기열이 차 있거나 max_wait_s 안에 슬롯을 못 받으면 AdmissionRejected(→ 429 + Retry-After).
+    대기는 이벤트 루프에서 하므로 기다리는 요청이 스레드풀 스레드를 잡지 않는다.
+    """
+
+    def __init__(self) -> None:
+        self.max_concurrency = max(settings.admission_max_concurrency, 1)
+        batch_slots = self.max_concurrency - min(settings.admission_interactive_reserved, self.max_concurrency - 1)
+        self._lock = threading.Lock()
+        self._running = 0
+        self._lanes = {
+            LANE_INTERACTIVE: _Lane(
+                LANE_INTERACTIVE,
+                self.max_concurrency,
+                settings.admission_interactive_queue,
+                settings.admission_interactive_max_wait_s,
+            ),
+            LANE_BATCH: _Lane(
+                LANE_BATCH, batch_slots, settings.admission_batch_queue, settings.admission_batch_max_wait_s
+            ),
+        }
+
+    async def acquire(self, lane_name: str) -> float:
+        """슬롯을 받을 때까지 기다린다. 기다린 초를 돌려준다."""
+        lane = self._lanes[lane_name]
+        started = time.monotonic()
+        with self._lock:
+            if not lane.waiters and self._has_room(lane):
+                self._admit(lane, 0.0)
+                return 0.0
+            if len(lane.waiters) >= lane.queue_limit:
+                lane.counts['rejected_queue_full'] += 1
+                raise AdmissionRejected(lane.name, 'queue_full', lane.retry_after())
+            waiter = _Waiter(asyncio.get_running_loop())
+            lane.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter.future, timeout=lane.max_wait_s)
+        except BaseException as e:
+            with self._lock:
+                if waiter.granted:
+                    if isinstance(e, asyncio.TimeoutError):
+                        # 시간 초과와 슬롯 배정이 겹침: 배정받은 것으로 처리
+                        return time.monotonic() - started
+                    self._release_locked(lane, None)  # 클라이언트가 끊음
+                    raise
+                lane.waiters.remove(waiter)
+                if not isinstance(e, asyncio.TimeoutError):
+                    raise
+                lane.counts['rejected_timeout'] += 1
+                retry_after = lane.retry_after()
+            raise AdmissionRejected(lane.name, 'timeout', retry_after) from None
+        return time.monotonic() - started
+
+    def release(self, lane_name: str, service_s: float) -> None:
+        with self._lock:
+            self._release_locked(self._lanes[lane_name], service_s)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            lanes = {
+                name: {
+                    'running': lane.running,
+                    'queued': len(lane.waiters),
+                    'slots': lane.slots,
+                    'queue_limit': lane.queue_limit,
+                    **lane.counts,
+                    'wait_p50_ms': _percentile_ms(lane.wait_s, 0.5),
+                    'wait_p95_ms': _percentile_ms(lane.wait_s, 0.95),
+                    'service_p50_ms': _percentile_ms(lane.service_s, 0.5),
+                }
+                for name, lane in self._lanes.items()
+            }
+            return {'max_concurrency': self.max_concurrency, 'running': self._running, 'lanes': lanes}
+
+    def _has_room(self, lane: _Lane) -> bool:
+        # batch는 전체 실행 수 기준으로 막아야 interactive 예약 슬롯이 항상 비어 있다.
+        return self._running < lane.slots
+
+    def _admit(self, lane: _Lane, waited_s: float) -> None:
+        lane.running += 1
+        self._running += 1
+        lane.counts['admitted'] += 1
+        lane.wait_s.append(waited_s)
+
+    def _release_locked(self, lane: _Lane, service_s: Optional[float]) -> None:
+        lane.running -= 1
+        self._running -= 1
+        if service_s is not None:
+            lane.service_s.append(service_s)
+        now = time.monotonic()
+        for next_lane in (self._lanes[LANE_INTERACTIVE], self._lanes[LANE_BATCH]):
+            while next_lane.waiters and self._has_room(next_lane):
+                waiter = next_lane.waiters.popleft()
+                waiter.granted = True
+                self._admit(next_lane, max(now - waiter.enqueued_at, 0.0))
+                waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+
+
+def _wake(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def lane_for(path: str) -> Optional[str]:
+    return ROUTE_LANES.get(path.rstrip('/') or '/')
+
+
+class AdmissionMiddleware:
+    """ASGI 미들웨어: 경로별 lane에서 슬롯을 받은 요청만 앱으로 넘기고, 응답 본문 전송이 끝나면 반납한다."""
+
+    def __init__(self, app: Any, controller: AdmissionController) -> None:
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        lane = lane_for(scope['path']) if scope['type'] == 'http' and settings.admission_enabled else None
+        if lane is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            waited_s = await self.controller.acquire(lane)
+        except AdmissionRejected as e:
+            await _send_rejection(send, e)
+            return
+
+        async def send_with_wait(message: dict) -> None:
+            if message['type'] == 'http.response.start':
+                message['headers'] = [
+                    *message.get('headers', []),
+                    (b'x-admission-lane', lane.encode()),
+                    (b'x-admission-wait-ms', f'{waited_s * 1000:.0f}'.encode()),
+                ]
+            await send(message)
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send_with_wait)
+        finally:
+            self.controller.release(lane, time.monotonic() - started)
+
+
+async def _send_rejection(send: Any, e: AdmissionRejected) -> None:
+    body = json.dumps(
+        {'detail': str(e), 'lane': e.lane, 'reason': e.reason, 'retry_after_s': e.retry_after_s},
+        ensure_ascii=False,
+    ).encode('utf-8')
+    await send(
+        {
+            'type': 'http.response.start',
+            'status': 429,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode()),
+                (b'retry-after', str(e.retry_after_s).encode()),
+            ],
+        }
+    )
+    await send({'type': 'http.response.body', 'body': body})
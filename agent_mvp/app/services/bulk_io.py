@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+from typing import TextIO
+
+from app.schemas import RunLinkResponse
+
+# sheet_bridge/sheet_template.csv, apps_script_bridge.gs의 COL과 같은 순서
+SHEET_COLUMNS = [
+    'source_url',
+    'source_site',
+    'title',
+    'source_price_jpy',
+    'target_price_krw',
+    'estimated_margin_rate',
+    'policy_risk',
+    'approval_status',
+    'publish_status',
+    'market_product_id',
+    'publish_message',
+    'representative_image_url',
+    'notes',
+    'last_run_at',
+    'image_urls',
+    'source_description',
+    'key_features',
+    'specs_json',
+    'llm_summary_ko',
+    'llm_selling_points_ko',
+    'llm_detail_outline_ko',
+    'raw_text_snippet',
+    'llm_product_judgement_ko',
+    'llm_detail_sections_ko',
+]
+
+FORMAT_CSV = 'csv'
+FORMAT_JSONL = 'jsonl'
+
+
+def detect_format(explicit: Optional[str], content_type: str) -> str:
+    if explicit:
+        return FORMAT_JSONL if explicit.strip().lower() in ('jsonl', 'ndjson', 'json') else FORMAT_CSV
+    ct = (content_type or '').lower()
+    if 'ndjson' in ct or 'jsonl' in ct or 'json' in ct:
+        return FORMAT_JSONL
+    return FORMAT_CSV
+
+
+def iter_input_rows(f: TextIO, fmt: str) -> Iterator[dict[str, str]]:
+    """파일을 한 행씩 읽는다(전체를 메모리에 올리지 않음)."""
+    if fmt == FORMAT_JSONL:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                yield {'source_url': '', 'publish_status': 'error', 'publish_message': 'JSONL 파싱 실패'}
+                continue
+            if isinstance(obj, str):
+                obj = {'source_url': obj}
+            if isinstance(obj, dict):
+                yield {k: '' if v is None else str(v) for k, v in obj.items()}
+        return
+
+    for row in csv.DictReader(f):
+        yield {k: v or '' for k, v in row.items() if k}
+
+
+def response_to_row(base: dict[str, str], res: RunLinkResponse, now: datetime) -> dict[str, str]:
+    ex = res.extraction
+    row = {c: base.get(c, '') for c in SHEET_COLUMNS}
+    row.update(
+        {
+            'source_site': ex.source_site,
+            'title': ex.title,
+            'source_price_jpy': str(ex.source_price_jpy),
+            'target_price_krw': str(res.pricing.target_price_krw),
+            'estimated_margin_rate': str(res.pricing.estimated_margin_rate),
+            'policy_risk': res.policy.risk,
+            'approval_status': res.approval_status,
+            'publish_status': res.publish_status,
+            'market_product_id': res.publish_result.market_product_id or '',
+            'publish_message': res.publish_result.message,
+            'representative_image_url': ex.representative_image_url or '',
+            'notes': ' | '.join(n for n in res.notes if n),
+            'last_run_at': now.isoformat(timespec='seconds'),
+            'image_urls': ' | '.join(ex.image_urls),
+            'source_description': ex.source_description,
+            'key_features': ' | '.join(ex.key_features),
+            'specs_json': json.dumps(ex.specs, ensure_ascii=False) if ex.specs else '',
+            'llm_summary_ko': ex.llm_summary_ko,
+            'llm_selling_points_ko': ' | '.join(ex.llm_selling_points_ko),
+            'llm_detail_outline_ko': ' | '.join(ex.llm_detail_outline_ko),
+            'raw_text_snippet': ex.raw_text_snippet,
+            'llm_product_judgement_ko': ex.llm_product_judgement_ko,
+            'llm_detail_sections_ko': ' | '.join(ex.llm_detail_sections_ko),
+        }
+    )
+    return row
+
+
+def error_row(base: dict[str, str], message: str, now: datetime) -> dict[str, str]:
+    row = {c: base.get(c, '') for c in SHEET_COLUMNS}
+    row['publish_status'] = 'error'
+    row['publish_message'] = message[:500]
+    row['last_run_at'] = now.isoformat(timespec='seconds')
+    return row
+
+
+class RowEncoder:
+    def __init__(self, fmt: str) -> None:
+        self.fmt = fmt
+        self._buf = io.StringIO()
+        self._writer = csv.DictWriter(self._buf, fieldnames=SHEET_COLUMNS, extrasaction='ignore')
+
+    def header(self) -> bytes:
+        if self.fmt != FORMAT_CSV:
+            return b''
+        self._writer.writeheader()
+        return self._drain()
+
+    def encode(self, row: dict[str, Any]) -> bytes:
+        if self.fmt == FORMAT_JSONL:
+            return (json.dumps({c: row.get(c, '') for c in SHEET_COLUMNS}, ensure_ascii=False) + '\n').encode('utf-8')
+        self._writer.writerow(row)
+        return self._drain()
+
+    def _drain(self) -> bytes:
+        out = self._buf.getvalue().encode('utf-8')
+        self._buf.seek(0)
+        self._buf.truncate(0)
+        return out
+
+
+def stream_bulk_results(
+    f: TextIO,
+    in_fmt: str,
+    out_fmt: str,
+    run_one: Callable[[str], RunLinkResponse],
+) -> Iterator[bytes]:
+    encoder = RowEncoder(out_fmt)
+    header = encoder.header()
+    if header:
+        yield header
+    for base in iter_input_rows(f, in_fmt):
+        now = datetime.now()
+        url = (base.get('source_url') or '').strip()
+        if not url:
+            yield encoder.encode({c: base.get(c, '') for c in SHEET_COLUMNS})
+            continue
+        try:
+            row = response_to_row(base, run_one(url), now)
+        except Exception as e:
+            row = error_row(base, f'처리 실패: {e}', now)
+        yield encoder.encode(row)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from dataclasses import asdict
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import Optional
+
+from app.config import settings
+
+
+@dataclass
+class CatalogItem:
+    source_url: str
+    source_site: str
+    title: str
+    source_price_jpy: int
+    category: Optional[str]
+    weight_g: Optional[float]
+    policy_blocked: bool
+    policy_risk: str
+    fx_rate: float
+    shipping_cost_krw: int
+    market_fee_rate: float
+    target_price_krw: int
+    estimated_margin_rate: float
+    approval_status: str
+    publish_status: str
+    market_product_id: Optional[str] = None
+    updated_at: str = ''
+
+
+_COLUMNS = list(CatalogItem.__dataclass_fields__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS catalog_items (
+    source_url TEXT PRIMARY KEY,
+    source_site TEXT NOT NULL,
+    title TEXT NOT NULL,
+    source_price_jpy INTEGER NOT NULL,
+    category TEXT,
+    weight_g REAL,
+    policy_blocked INTEGER NOT NULL,
+    policy_risk TEXT NOT NULL,
+    fx_rate REAL NOT NULL,
+    shipping_cost_krw INTEGER NOT NULL,
+    market_fee_rate REAL NOT NULL,
+    target_price_krw INTEGER NOT NULL,
+    estimated_margin_rate REAL NOT NULL,
+    approval_status TEXT NOT NULL,
+    publish_status TEXT NOT NULL,
+    market_product_id TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fx_snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    fx_rate REAL NOT NULL,
+    created_at TEXT NOT NULL
+);
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+class CatalogStore:
+    """처리한 링크별 가격 계산 입력값(JPY 원가/카테고리/무게)과 최근 결과를 보관한다."""
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        path = db_path or settings.catalog_db_path
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+
+    def upsert(self, item: CatalogItem) -> None:
+        row = asdict(item)
+        row['policy_blocked'] = int(item.policy_blocked)
+        row['updated_at'] = _now()
+        placeholders = ', '.join(f':{c}' for c in _COLUMNS)
+        # 재실행이 draft로 끝나도 이미 등록된 market_product_id는 유지
+        updates = ', '.join(
+            f'{c} = COALESCE(excluded.{c}, catalog_items.{c})' if c == 'market_product_id' else f'{c} = excluded.{c}'
+            for c in _COLUMNS
+            if c != 'source_url'
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO catalog_items ({', '.join(_COLUMNS)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(source_url) DO UPDATE SET {updates}",
+                row,
+            )
+
+    def all_items(self) -> list[CatalogItem]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM catalog_items ORDER BY source_url"
+            ).fetchall()
+        return [self._to_item(r) for r in rows]
+
+    def get(self, source_url: str) -> Optional[CatalogItem]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM catalog_items WHERE source_url = ?", (source_url,)
+            ).fetchone()
+        return self._to_item(row) if row else None
+
+    def update_pricing_many(self, items: list[CatalogItem]) -> None:
+        now = _now()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE catalog_items SET fx_rate = ?, shipping_cost_krw = ?, market_fee_rate = ?, "
+                "target_price_krw = ?, estimated_margin_rate = ?, approval_status = ?, updated_at = ? "
+                "WHERE source_url = ?",
+                [
+                    (
+                        it.fx_rate,
+                        it.shipping_cost_krw,
+                        it.market_fee_rate,
+                        it.target_price_krw,
+                        it.estimated_margin_rate,
+                        it.approval_status,
+                        now,
+                        it.source_url,
+                    )
+                    for it in items
+                ],
+            )
+
+    def update_source_prices(self, pairs: list[tuple[str, int]]) -> None:
+        """재수집으로 확인한 원문 JPY 가격 반영 (source_url, source_price_jpy)"""
+        now = _now()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE catalog_items SET source_price_jpy = ?, updated_at = ? WHERE source_url = ?",
+                [(price, now, url) for url, price in pairs],
+            )
+
+    def record_fx_snapshot(self, fx_rate: float) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO fx_snapshots (fx_rate, created_at) VALUES (?, ?)", (fx_rate, _now())
+            )
+
+    def current_fx_rate(self) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute("SELECT fx_rate FROM fx_snapshots ORDER BY id DESC LIMIT 1").fetchone()
+        return float(row['fx_rate']) if row else None
+
+    def _to_item(self, row: sqlite3.Row) -> CatalogItem:
+        data = dict(row)
+        data['policy_blocked'] = bool(data['policy_blocked'])
+        return CatalogItem(**data)
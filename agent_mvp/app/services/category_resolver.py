@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import json
+import math
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+from app.config import settings
+
+# 개발/데모용 샘플 트리. 리프 ID가 실제 스토어 카테고리와 다를 수 있어 NAVER_CATEGORY_TREE_PATH로 지정했을 때만 쓴다.
+SAMPLE_TREE_PATH = Path(__file__).resolve().parent.parent / "data" / "naver_category_tree.json"
+
+# 네이버 카테고리 최상위 이름 -> 상품정보제공고시 템플릿
+NOTICE_TYPE_BY_ROOT = {
+    "패션의류": "FASHION_ITEMS",
+    "패션잡화": "FASHION_ITEMS",
+    "디지털/가전": "DIGITAL_CONTENTS",
+    "생활/건강": "LIVING",
+    "가구/인테리어": "LIVING",
+    "출산/육아": "LIVING",
+}
+
+NAME_WEIGHT = 3.0
+KEYWORD_WEIGHT = 3.0
+PATH_WEIGHT = 1.0
+SPEC_QUERY_WEIGHT = 0.5
+# 너무 흔한 term(예: 대분류명)은 변별력이 없고 posting 순회 비용만 커서 색인에서 뺀다.
+MAX_POSTING_RATIO = 0.05
+MIN_POSTING_CAP = 200
+
+# 라틴 토큰 또는 한글/히라가나/가타카나/한자 연속 구간
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9\-]+|[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7a3]+")
+_LATIN_RE = re.compile(r"[a-z0-9]")
+_KATAKANA_RE = re.compile(r"[\u30a0-\u30ff]")
+# 점수가 높은 후보부터 이만큼만 이름/키워드 일치를 확인한다.
+MAX_VERIFY_CANDIDATES = 20
+
+
+@dataclass(frozen=True)
+class CategoryLeaf:
+    category_id: int
+    whole_name: str
+    notice_type: Optional[str]
+    # 리프 이름/키워드(소문자). 이 중 하나가 상품명에 단어로 들어 있어야 채택
+    labels: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class CategoryMatch:
+    leaf_category_id: int
+    notice_type: Optional[str]
+    whole_name: str
+    score: float
+
+
+def _terms(text: str, *, with_unigrams: bool = False) -> list[str]:
+    # CJK 구간은 띄어쓰기가 없어 구간 전체 + 문자 bigram으로 색인/조회한다.
+    out: list[str] = []
+    for run in _TOKEN_RE.findall((text or "").lower()):
+        out.append(run)
+        if _LATIN_RE.match(run):
+            continue
+        out.extend(run[i : i + 2] for i in range(len(run) - 1))
+        if with_unigrams and len(run) > 1:
+            out.extend(run)
+    return out
+
+
+def _label_in(label: str, text: str) -> bool:
+    """label이 text 안에 단어로 들어 있는지. bigram 하나 겹친 것(食パン/パンツ)은 일치로 보지 않는다.
+
+    라틴 토큰은 앞뒤가 영숫자가 아니어야 하고, 가타카나 label은 뒤에 가타카나가 이어지면 안 된다
+    (ケーブルカー는 ケーブル이 아님, モバイルバッテリー는 バッテリー). 한자/한글은 부분 문자열이면 일치.
+    """
+    start = text.find(label)
+    while start >= 0:
+        end = start + len(label)
+        before = text[start - 1] if start > 0 else ""
+        after = text[end] if end < len(text) else ""
+        if _LATIN_RE.match(label[0]) and _LATIN_RE.match(before):
+            ok = False
+        elif _LATIN_RE.match(label[-1]) and _LATIN_RE.match(after):
+            ok = False
+        elif _KATAKANA_RE.match(label[-1]) and _KATAKANA_RE.match(after):
+            ok = False
+        else:
+            ok = True
+        if ok:
+            return True
+        start = text.find(label, start + 1)
+    return False
+
+
+class NaverCategoryResolver:
+    def __init__(self, categories: list[dict[str, Any]]) -> None:
+        self._leaves: list[CategoryLeaf] = []
+        postings: dict[str, dict[int, float]] = {}
+
+        for node in categories:
+            if not node.get("last", True):
+                continue
+            try:
+                category_id = int(node["id"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            whole_name = str(node.get("wholeCategoryName") or node.get("name") or "")
+            path = [p.strip() for p in whole_name.split(">") if p.strip()]
+            name = str(node.get("name") or (path[-1] if path else ""))
+            notice_type = node.get("noticeType") or NOTICE_TYPE_BY_ROOT.get(path[0] if path else "")
+
+            idx = len(self._leaves)
+            labels = tuple(
+                dict.fromkeys(t.strip().lower() for t in [name, *(node.get("keywords") or [])] if str(t).strip())
+            )
+            self._leaves.append(CategoryLeaf(category_id, whole_name, notice_type, labels))
+
+            fields = [(p, PATH_WEIGHT) for p in path[:-1]]
+            fields.append((name, NAME_WEIGHT))
+            fields.extend((str(k), KEYWORD_WEIGHT) for k in node.get("keywords") or [])
+            for text, weight in fields:
+                for term in _terms(text):
+                    doc = postings.setdefault(term, {})
+                    doc[idx] = max(doc.get(idx, 0.0), weight)
+
+        n = max(len(self._leaves), 1)
+        posting_cap = max(MIN_POSTING_CAP, int(n * MAX_POSTING_RATIO))
+        # term -> ((leaf idx, idf * field weight), ...) 로 미리 계산해 조회 시 곱셈만 남긴다.
+        self._index: dict[str, tuple[tuple[int, float], ...]] = {}
+        for term, doc in postings.items():
+            if len(doc) > posting_cap:
+                continue
+            idf = math.log(1 + n / len(doc))
+            self._index[term] = tuple((i, idf * w) for i, w in doc.items())
+
+    @classmethod
+    def from_file(cls, path: Path) -> "NaverCategoryResolver":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        # GET /v1/categories 응답(list) 또는 {"categories": [...]} 형태 모두 허용
+        if isinstance(data, dict):
+            data = data.get("categories") or []
+        return cls(data if isinstance(data, list) else [])
+
+    @classmethod
+    def from_settings(cls) -> "NaverCategoryResolver":
+        path = settings.naver_category_tree_path.strip()
+        if not path:
+            # 트리가 없으면 자동 선택 없이 항상 NAVER_DEFAULT_LEAF_CATEGORY_ID
+            return cls([])
+        return cls.from_file(Path(path))
+
+    @property
+    def leaf_count(self) -> int:
+        return len(self._leaves)
+
+    def resolve(self, title: str, specs: Optional[dict[str, str]] = None) -> Optional[CategoryMatch]:
+        scores: dict[int, float] = {}
+        queries = [(title, 1.0)]
+        if specs:
+            queries.append((" ".join(f"{k} {v}" for k, v in specs.items()), SPEC_QUERY_WEIGHT))
+
+        for text, query_weight in queries:
+            for term in set(_terms(text, with_unigrams=True)):
+                for idx, weight in self._index.get(term, ()):
+                    scores[idx] = scores.get(idx, 0.0) + weight * query_weight
+
+        if not scores:
+            return None
+        # 점수는 후보 순위만 정한다. 리프 이름/키워드가 상품명(또는 스펙)에 단어로 없으면 추측하지 않고 None.
+        haystack = " ".join(text for text, _ in queries).lower()
+        candidates = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:MAX_VERIFY_CANDIDATES]
+        for idx, score in candidates:
+            if score < settings.naver_category_min_score:
+                break
+            leaf = self._leaves[idx]
+            if any(_label_in(label, haystack) for label in leaf.labels):
+                return CategoryMatch(
+                    leaf_category_id=leaf.category_id,
+                    notice_type=leaf.notice_type,
+                    whole_name=leaf.whole_name,
+                    score=round(score, 3),
+                )
+        return None
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class CircuitBreaker:
+    """연속 실패가 threshold에 닿으면 open → reset_timeout_s 동안 호출 차단 → half-open 1건으로 복구 확인."""
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout_s: float) -> None:
+        self.name = name
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout_s = reset_timeout_s
+        self._lock = threading.Lock()
+        self._state = STATE_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._last_error = ''
+        self._counts = {'success': 0, 'failure': 0, 'short_circuited': 0, 'opened': 0}
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self._state == STATE_OPEN and time.monotonic() - self._opened_at >= self.reset_timeout_s:
+                self._state = STATE_HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == STATE_CLOSED:
+                return
+            if self._state == STATE_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            self._counts['short_circuited'] += 1
+        raise CircuitOpenError(f'{self.name} 차단 중(circuit open): {self._last_error}')
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._counts['success'] += 1
+            self._consecutive_failures = 0
+            self._state = STATE_CLOSED
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        """결과를 아직 모르는 호출(재시도할 429 등): 성공/실패를 세지 않고 half-open 시험 호출 자리만 돌려준다."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self, reason: str) -> None:
+        with self._lock:
+            self._counts['failure'] += 1
+            self._consecutive_failures += 1
+            self._last_error = reason[:200]
+            if self._state == STATE_HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != STATE_OPEN:
+                    self._counts['opened'] += 1
+                self._state = STATE_OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            state = self._state
+            retry_in = 0.0
+            if state == STATE_OPEN:
+                retry_in = max(self.reset_timeout_s - (time.monotonic() - self._opened_at), 0.0)
+            return {
+                'state': state,
+                'consecutive_failures': self._consecutive_failures,
+                'retry_in_s': round(retry_in, 1),
+                'last_error': self._last_error,
+                **self._counts,
+            }
+
+
+class BreakerRegistry:
+    def __init__(self, failure_threshold: int, reset_timeout_s: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self._lock = threading.Lock()
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker(name, self.failure_threshold, self.reset_timeout_s)
+            return breaker
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {n: b.snapshot() for n, b in sorted(breakers.items())}
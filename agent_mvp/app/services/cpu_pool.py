@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+from app.services.tracing import span
+
+
+def _timed_call(fn: Callable[..., Any], args: tuple[Any, ...], submitted_at: float) -> tuple[Any, float, float]:
+    # 워커 프로세스에서 실행: (결과, 대기 시간, 실행 시간)
+    started_at = time.time()
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, max(started_at - submitted_at, 0.0), time.perf_counter() - t0
+
+
+class CpuPool:
+    """HTML 파싱/후처리 같은 순수 CPU 작업을 프로세스 풀로 보낸다.
+
+    workers=0이면 호출 스레드에서 바로 실행한다. 작업 함수는 모듈 최상위 함수여야 하고
+    인자/결과는 피클 가능한 bytes/str/dict만 쓴다.
+    """
+
+    def __init__(self, workers: int = 0) -> None:
+        self.workers = max(workers, 0)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, Any]] = {}
+
+    def run(self, task: str, fn: Callable[..., Any], *args: Any) -> Any:
+        with span(f'cpu {task}') as s:
+            result, wait_s, exec_s, inline = self._call(fn, args)
+            s.set(queue_wait_ms=round(wait_s * 1000, 2), exec_ms=round(exec_s * 1000, 2), inline=inline)
+        self._record(task, wait_s, exec_s, inline=inline)
+        return result
+
+    def _call(self, fn: Callable[..., Any], args: tuple[Any, ...]) -> tuple[Any, float, float, bool]:
+        executor = self._get_executor()
+        if executor is None:
+            return (*_timed_call(fn, args, time.time()), True)
+        try:
+            return (*executor.submit(_timed_call, fn, args, time.time()).result(), False)
+        except BrokenProcessPool:
+            # 워커가 죽으면 풀을 새로 만들고 이번 작업은 현재 스레드에서 처리
+            self._reset_executor(executor)
+            return (*_timed_call(fn, args, time.time()), True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            tasks = {}
+            for task, st in self._stats.items():
+                calls = st['calls']
+                tasks[task] = {
+                    'calls': calls,
+                    'inline_calls': st['inline_calls'],
+                    'avg_queue_wait_ms': round(st['wait_s'] / calls * 1000, 2) if calls else 0.0,
+                    'max_queue_wait_ms': round(st['max_wait_s'] * 1000, 2),
+                    'avg_exec_ms': round(st['exec_s'] / calls * 1000, 2) if calls else 0.0,
+                    'max_exec_ms': round(st['max_exec_s'] * 1000, 2),
+                }
+            return {'workers': self.workers, 'tasks': tasks}
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers == 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                # fork는 요청 스레드/열린 소켓까지 복제하므로 spawn 사용
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+            return self._executor
+
+    def _reset_executor(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _record(self, task: str, wait_s: float, exec_s: float, *, inline: bool) -> None:
+        with self._lock:
+            st = self._stats.get(task)
+            if st is None:
+                st = self._stats[task] = {
+                    'calls': 0,
+                    'inline_calls': 0,
+                    'wait_s': 0.0,
+                    'max_wait_s': 0.0,
+                    'exec_s': 0.0,
+                    'max_exec_s': 0.0,
+                }
+            st['calls'] += 1
+            st['inline_calls'] += int(inline)
+            st['wait_s'] += wait_s
+            st['max_wait_s'] = max(st['max_wait_s'], wait_s)
+            st['exec_s'] += exec_s
+            st['max_exec_s'] = max(st['max_exec_s'], exec_s)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Any
+from typing import Optional
+
+from app.config import settings
+
+
+class HostLatencyTracker:
+    """호스트별 최근 응답시간으로 timeout/hedge 시점을 정한다."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque[float]] = {}
+        self._counts: dict[str, dict[str, int]] = {}
+
+    def record(self, host: str, latency_s: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            samples = self._samples.get(host)
+            if samples is None:
+                samples = self._samples[host] = deque(maxlen=settings.host_latency_window)
+            samples.append(latency_s)
+            if timed_out:
+                self._count(host, 'timeouts')
+
+    def record_hedge(self, host: str, *, won: bool) -> None:
+        with self._lock:
+            self._count(host, 'hedged')
+            if won:
+                self._count(host, 'hedge_wins')
+
+    def percentile(self, host: str, q: float) -> Optional[float]:
+        with self._lock:
+            samples = self._samples.get(host)
+            if not samples or len(samples) < settings.host_latency_min_samples:
+                return None
+            ordered = sorted(samples)
+        idx = min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)
+        return ordered[idx]
+
+    def timeout_for(self, host: str) -> float:
+        p99 = self.percentile(host, 0.99)
+        if p99 is None:
+            return settings.fetch_timeout_s
+        adaptive = p99 * settings.fetch_timeout_p99_multiplier
+        return min(max(adaptive, settings.fetch_timeout_min_s), settings.fetch_timeout_s)
+
+    def hedge_delay(self, host: str) -> Optional[float]:
+        if not settings.fetch_hedge_enabled:
+            return None
+        p95 = self.percentile(host, 0.95)
+        if p95 is None:
+            return None
+        return max(p95, settings.fetch_hedge_min_delay_s)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            hosts = {h: (len(s), self._counts.get(h, {})) for h, s in self._samples.items()}
+        out = {}
+        for host, (n, counts) in sorted(hosts.items()):
+            p50, p95, p99 = (self.percentile(host, q) for q in (0.5, 0.95, 0.99))
+            out[host] = {
+                'samples': n,
+                'p50_ms': round(p50 * 1000, 1) if p50 is not None else None,
+                'p95_ms': round(p95 * 1000, 1) if p95 is not None else None,
+                'p99_ms': round(p99 * 1000, 1) if p99 is not None else None,
+                'timeout_s': round(self.timeout_for(host), 2),
+                'timeouts': counts.get('timeouts', 0),
+                'hedged': counts.get('hedged', 0),
+                'hedge_wins': counts.get('hedge_wins', 0),
+            }
+        return out
+
+    def _count(self, host: str, key: str) -> None:
+        counts = self._counts.setdefault(host, {})
+        counts[key] = counts.get(key, 0) + 1
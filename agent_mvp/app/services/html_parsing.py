@@ -0,0 +1,415 @@
+from __future__ import annotations
+
+import json
+import re
+from html import unescape
+from typing import Any
+from typing import Optional
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+# CpuPool 워커 프로세스에서 실행되는 순수 함수들.
+# 입력은 raw bytes/str, 출력은 dict/list/str만 사용한다(피클 가능, app.config 미의존).
+
+AVAILABILITY_IN_STOCK = 'in_stock'
+AVAILABILITY_OUT_OF_STOCK = 'out_of_stock'
+# schema.org ItemAvailability / product:availability 값(소문자, 영문만 남김)
+_IN_STOCK_VALUES = {'instock', 'limitedavailability', 'preorder', 'presale', 'backorder', 'onlineonly', 'instoreonly'}
+_OUT_OF_STOCK_VALUES = {'outofstock', 'soldout', 'discontinued', 'oos'}
+# 구조화 데이터에 재고 정보가 없을 때만 보는 품절 문구. 몰 페이지는 다른 옵션/추천상품/다른 판매자의
+# "在庫切れ"도 보여 주므로 페이지 전체가 아니라 구매 영역(재고/장바구니 요소) 바로 뒤에서만 찾는다.
+_SOLD_OUT_TEXT = re.compile(r'在庫切れ|売り切れ|品切れ|販売終了|現在お取り扱いできません|sold\s*out', re.IGNORECASE)
+_SCRIPT_STYLE = re.compile(r'<(script|style)\b.*?</\1>', re.IGNORECASE | re.DOTALL)
+_BUY_BOX_TAG = re.compile(
+    r'<[a-z0-9]+\b[^>]*\b(?:id|class)\s*=\s*["\'][^"\']*'
+    r'(?:availability|stock|zaiko|buy-?box|add-?to-?cart|cart-?button|purchase)[^"\']*["\'][^>]*>',
+    re.IGNORECASE,
+)
+_BUY_BOX_WINDOW = 400
+_MICRODATA_AVAILABILITY = re.compile(
+    r'<[^>]+itemprop\s*=\s*["\']availability["\'][^>]*?(?:href|content)\s*=\s*["\']([^"\']+)["\']'
+    r'|<[^>]+(?:href|content)\s*=\s*["\']([^"\']+)["\'][^>]*?itemprop\s*=\s*["\']availability["\']',
+    re.IGNORECASE,
+)
+_TAG = re.compile(r'<[^>]+>')
+
+
+def decode_body(raw: bytes, encoding: Optional[str]) -> str:
+    try:
+        return raw.decode(encoding or 'utf-8', errors='replace')
+    except LookupError:
+        return raw.decode('utf-8', errors='replace')
+
+
+def parse_product_html(source_url: str, raw: bytes, encoding: Optional[str] = None) -> dict[str, Any]:
+    html = decode_body(raw, encoding)
+    soup = BeautifulSoup(html or '', 'html.parser')
+
+    jsonld = _extract_jsonld_product(html)
+    meta_title = _find_meta(html, 'og:title')
+    title_tag = _find_title_tag(html)
+    meta_desc = _find_meta(html, 'og:description') or _find_meta(html, 'description') or ''
+    meta_price = _find_meta(html, 'product:price:amount')
+
+    title = None
+    price_jpy = None
+    jsonld_images: list[str] = []
+    if jsonld:
+        title = jsonld.get('name')
+        price_jpy = _to_int_price(jsonld.get('price'))
+        raw_images = jsonld.get('images') or []
+        jsonld_images = [_abs_url(source_url, u) for u in raw_images if u]
+
+    if not title:
+        h1 = soup.find('h1')
+        title = (h1.get_text(' ', strip=True) if h1 else None) or meta_title or title_tag
+    if not price_jpy:
+        price_jpy = _to_int_price(meta_price)
+
+    og_image = _find_meta(html, 'og:image')
+    all_images = []
+    if og_image:
+        all_images.append(_abs_url(source_url, og_image))
+    all_images.extend(jsonld_images)
+    all_images.extend(_extract_img_urls(source_url, soup))
+    all_images = unique_keep_order([u for u in all_images if u])[:15]
+
+    key_features = _extract_features(soup)
+    specs = _extract_specs(soup)
+    raw_text_snippet = _extract_text_snippet(soup)
+
+    note = 'JSON-LD 추출' if jsonld else 'meta/title 추출'
+    return {
+        'title': title,
+        'price_jpy': price_jpy,
+        'availability': detect_availability(html, jsonld),
+        'representative_image_url': all_images[0] if all_images else None,
+        'image_urls': all_images,
+        'source_description': meta_desc,
+        'key_features': key_features,
+        'specs': specs,
+        'raw_text_snippet': raw_text_snippet,
+        'note': note,
+    }
+
+
+def parse_source_snapshot(raw: bytes, encoding: Optional[str] = None) -> dict[str, Any]:
+    """재수집용: 가격/재고만 읽는다(BeautifulSoup 없이 JSON-LD/meta/품절 문구)."""
+    html = decode_body(raw, encoding)
+    jsonld = _extract_jsonld_product(html)
+    price_jpy = _to_int_price(jsonld.get('price')) if jsonld else None
+    if not price_jpy:
+        price_jpy = _to_int_price(_find_meta(html, 'product:price:amount'))
+    return {'price_jpy': price_jpy, 'availability': detect_availability(html, jsonld)}
+
+
+def detect_availability(html: str, jsonld: Optional[dict[str, Any]] = None) -> Optional[str]:
+    """in_stock / out_of_stock / None(판단 불가)
+
+    JSON-LD/meta/microdata 재고값을 먼저 보고, 없을 때만 구매 영역 안의 품절 문구를 본다.
+    """
+    microdata = _MICRODATA_AVAILABILITY.search(html)
+    for value in (
+        jsonld.get('availability') if jsonld else None,
+        _find_meta(html, 'product:availability'),
+        _find_meta(html, 'og:availability'),
+        (microdata.group(1) or microdata.group(2)) if microdata else None,
+    ):
+        key = re.sub(r'[^a-z]', '', str(value or '').rsplit('/', 1)[-1].lower())
+        if key in _OUT_OF_STOCK_VALUES:
+            return AVAILABILITY_OUT_OF_STOCK
+        if key in _IN_STOCK_VALUES:
+            return AVAILABILITY_IN_STOCK
+    body = _SCRIPT_STYLE.sub(' ', html)
+    for m in _BUY_BOX_TAG.finditer(body):
+        window = _TAG.sub(' ', body[m.end():m.end() + _BUY_BOX_WINDOW])
+        if _SOLD_OUT_TEXT.search(window):
+            return AVAILABILITY_OUT_OF_STOCK
+    return None
+
+
+def parse_ddg_results(raw: bytes, encoding: Optional[str] = None, limit: int = 5) -> list[tuple[str, str]]:
+    """DuckDuckGo HTML 검색결과 → [(href, title)]."""
+    soup = BeautifulSoup(decode_body(raw, encoding), 'html.parser')
+    anchors = soup.select('a.result__a')
+    if not anchors:
+        anchors = soup.select('a[href]')
+    out: list[tuple[str, str]] = []
+    for a in anchors[:limit]:
+        href = (a.get('href') or '').strip()
+        title = a.get_text(' ', strip=True)
+        if not href or not title:
+            continue
+        if href.startswith('/'):
+            continue
+        out.append((href, title))
+    return out
+
+
+def parse_page_snippet(raw: bytes, encoding: Optional[str] = None) -> str:
+    soup = BeautifulSoup(decode_body(raw, encoding), 'html.parser')
+    parts: list[str] = []
+    h1 = soup.find('h1')
+    if h1:
+        parts.append(h1.get_text(' ', strip=True))
+    for p in soup.find_all(['p', 'li']):
+        t = p.get_text(' ', strip=True)
+        if len(t) < 30:
+            continue
+        parts.append(t)
+        if len(' '.join(parts)) > 700:
+            break
+    return ' '.join(parts)[:800]
+
+
+def quality_postprocess(out: dict[str, Any], facts_blob: str) -> dict[str, Any]:
+    text_fields = [
+        'summary_ko',
+        'product_judgement_ko',
+        'translated_source_description_ko',
+        'translated_raw_text_snippet_ko',
+    ]
+    for f in text_fields:
+        out[f] = _clean_text(str(out.get(f, '')))
+
+    for f in ['selling_points_ko', 'detail_outline_ko', 'detail_sections_ko', 'translated_key_features_ko']:
+        out[f] = [_clean_text(x) for x in to_str_list(out.get(f))]
+        out[f] = [x for x in out[f] if x]
+    out['detail_sections_ko'] = [x for x in out.get('detail_sections_ko', []) if len(x) >= 18][:12]
+    out['selling_points_ko'] = [x for x in out.get('selling_points_ko', []) if len(x) >= 6][:10]
+
+    # 근거에 없는 평점/배송품질/연령문구 제거
+    allow_rating = any(k in facts_blob.lower() for k in ['rating', 'review', '별점', '평점'])
+    if not allow_rating:
+        block_words = ['평점', '별점', '배송', '만족도', '연령', '세 이상']
+        for f in text_fields:
+            if any(w in out[f] for w in block_words):
+                out[f] = _remove_sentences_with_words(out[f], block_words)
+        for f in ['selling_points_ko', 'detail_sections_ko', 'translated_key_features_ko']:
+            out[f] = [x for x in out[f] if not any(w in x for w in block_words)]
+
+    # 한글화 실패 시 원문 혼입 방지.
+    for f in ['summary_ko', 'product_judgement_ko', 'translated_source_description_ko']:
+        if out.get(f) and not _contains_korean(str(out.get(f))):
+            out[f] = ''
+
+    return out
+
+
+def to_str_list(v: Any) -> list[str]:
+    if not isinstance(v, list):
+        return []
+    out: list[str] = []
+    for x in v:
+        s = str(x).strip()
+        if s:
+            out.append(s)
+    return out
+
+
+def unique_keep_order(arr: list[str]) -> list[str]:
+    seen = set()
+    out = []
+    for x in arr:
+        if x in seen:
+            continue
+        seen.add(x)
+        out.append(x)
+    return out
+
+
+def _extract_img_urls(source_url: str, soup: BeautifulSoup) -> list[str]:
+    urls: list[str] = []
+    for img in soup.find_all('img'):
+        src = img.get('src') or img.get('data-src') or img.get('data-original')
+        if not src:
+            continue
+        src = src.strip()
+        if not src or src.startswith('data:image'):
+            continue
+        urls.append(_abs_url(source_url, src))
+    return urls
+
+
+def _extract_features(soup: BeautifulSoup) -> list[str]:
+    features: list[str] = []
+    for li in soup.find_all('li'):
+        t = li.get_text(' ', strip=True)
+        if len(t) < 8 or len(t) > 160:
+            continue
+        if re.search(r'^(home|login|cart|menu)$', t, re.IGNORECASE):
+            continue
+        features.append(t)
+        if len(features) >= 20:
+            break
+    return unique_keep_order(features)
+
+
+def _extract_specs(soup: BeautifulSoup) -> dict[str, str]:
+    specs: dict[str, str] = {}
+
+    # table 기반 스펙
+    for tr in soup.find_all('tr'):
+        th = tr.find('th')
+        td = tr.find('td')
+        if not th or not td:
+            continue
+        k = th.get_text(' ', strip=True)
+        v = td.get_text(' ', strip=True)
+        if not k or not v:
+            continue
+        if len(k) > 80 or len(v) > 300:
+            continue
+        specs[k] = v
+        if len(specs) >= 20:
+            break
+
+    # dl 기반 스펙
+    if len(specs) < 20:
+        dts = soup.find_all('dt')
+        for dt in dts:
+            dd = dt.find_next_sibling('dd')
+            if not dd:
+                continue
+            k = dt.get_text(' ', strip=True)
+            v = dd.get_text(' ', strip=True)
+            if not k or not v:
+                continue
+            if len(k) > 80 or len(v) > 300:
+                continue
+            if k not in specs:
+                specs[k] = v
+            if len(specs) >= 20:
+                break
+
+    return specs
+
+
+def _extract_text_snippet(soup: BeautifulSoup) -> str:
+    blocks: list[str] = []
+    for tag in soup.find_all(['h1', 'h2', 'h3', 'p']):
+        t = tag.get_text(' ', strip=True)
+        if len(t) < 15:
+            continue
+        blocks.append(t)
+        if len(' '.join(blocks)) > 3500:
+            break
+    snippet = '\n'.join(blocks)
+    return snippet[:4000]
+
+
+def _clean_text(s: str) -> str:
+    t = s.replace('|', ' ').replace('  ', ' ').strip()
+    t = re.sub(r'\s+\.', '.', t)
+    t = re.sub(r'\s+', ' ', t).strip()
+    return t
+
+
+def _remove_sentences_with_words(text: str, words: list[str]) -> str:
+    chunks = re.split(r'(?<=[.!?])\s+', text)
+    kept = [c for c in chunks if not any(w in c for w in words)]
+    return ' '.join(kept).strip()
+
+
+def _contains_korean(text: str) -> bool:
+    return bool(re.search(r'[가-힣]', text or ''))
+
+
+def _extract_jsonld_product(html: str) -> Optional[dict[str, Any]]:
+    pattern = re.compile(
+        r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+        re.IGNORECASE | re.DOTALL,
+    )
+    for m in pattern.finditer(html):
+        raw = m.group(1).strip()
+        if not raw:
+            continue
+        parsed = _try_json_load(raw)
+        if parsed is None:
+            continue
+        product = _find_product_node(parsed)
+        if not product:
+            continue
+        price = None
+        availability = None
+        offers = product.get('offers')
+        if isinstance(offers, list) and offers:
+            offers = offers[0]
+        if isinstance(offers, dict):
+            price = offers.get('price') or offers.get('lowPrice')
+            availability = offers.get('availability')
+        images = product.get('image')
+        if isinstance(images, str):
+            images = [images]
+        if not isinstance(images, list):
+            images = []
+        return {'name': product.get('name'), 'price': price, 'availability': availability, 'images': images}
+    return None
+
+
+def _find_product_node(obj: Any) -> Optional[dict[str, Any]]:
+    if isinstance(obj, list):
+        for item in obj:
+            found = _find_product_node(item)
+            if found:
+                return found
+        return None
+    if not isinstance(obj, dict):
+        return None
+
+    t = obj.get('@type')
+    if t == 'Product' or (isinstance(t, list) and 'Product' in t):
+        return obj
+    if '@graph' in obj:
+        return _find_product_node(obj.get('@graph'))
+    for _, v in obj.items():
+        found = _find_product_node(v)
+        if found:
+            return found
+    return None
+
+
+def _find_meta(html: str, prop: str) -> Optional[str]:
+    p = re.compile(
+        rf'<meta[^>]+(?:property|name)=["\']{re.escape(prop)}["\'][^>]+content=["\'](.*?)["\']',
+        re.IGNORECASE | re.DOTALL,
+    )
+    m = p.search(html)
+    if not m:
+        return None
+    return unescape(m.group(1)).strip()
+
+
+def _find_title_tag(html: str) -> Optional[str]:
+    m = re.search(r'<title[^>]*>(.*?)</title>', html, re.IGNORECASE | re.DOTALL)
+    if not m:
+        return None
+    return unescape(re.sub(r'\s+', ' ', m.group(1))).strip()
+
+
+def _try_json_load(raw: str) -> Optional[Any]:
+    try:
+        return json.loads(raw)
+    except Exception:
+        try:
+            fixed = raw.replace('\n', ' ').replace('\t', ' ')
+            return json.loads(fixed)
+        except Exception:
+            return None
+
+
+def _to_int_price(value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    text = re.sub(r'[^\d.]', '', str(value))
+    if not text:
+        return None
+    try:
+        return int(float(text))
+    except Exception:
+        return None
+
+
+def _abs_url(source_url: str, u: str) -> str:
+    return urljoin(source_url, u.strip())
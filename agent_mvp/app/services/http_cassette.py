@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import Any
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+from app.config import settings
+
+MODES = ('off', 'record', 'replay')
+# 본문은 디코딩된 상태로 저장하므로 전송 관련 헤더는 버린다.
+_DROP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS exchanges (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    body_hash TEXT NOT NULL,
+    status INTEGER,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    error TEXT,
+    elapsed_ms REAL NOT NULL,
+    recorded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_exchanges_match ON exchanges (method, url, body_hash);
+"""
+
+
+class CassetteMissError(httpx.ConnectError):
+    """재생 모드에서 기록에 없는 요청(실제 네트워크로 나가지 않는다)."""
+
+
+def _match_url(url: httpx.URL) -> str:
+    parts = urlsplit(str(url))
+    query = sorted(parse_qsl(parts.query, keep_blank_values=True))
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), ''))
+
+
+def _url_only_match(url: httpx.URL) -> bool:
+    # OpenAI처럼 본문이 곧 입력인 요청을 URL만으로 재생하면 다른 상품의 응답이 나간다.
+    paths = [p.strip() for p in settings.http_cassette_url_only_paths.split(',') if p.strip()]
+    return any(url.path.endswith(p) for p in paths)
+
+
+def _body_hash(request: httpx.Request) -> str:
+    return hashlib.sha256(request.content).hexdigest()[:32]
+
+
+class CassetteStore:
+    """외부 HTTP 요청/응답(상태, 헤더, 본문, 소요시간)을 기록하고 같은 요청에 순서대로 돌려준다."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        path = path or settings.http_cassette_path
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        # 같은 요청이 여러 번 기록됐으면 n번째 재생 요청에 n번째 응답(모자라면 마지막 응답)
+        self._cursors: dict[tuple, int] = {}
+        self._stats = {'recorded': 0, 'replayed': 0, 'replayed_by_url': 0, 'misses': 0}
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+
+    def save(
+        self,
+        request: httpx.Request,
+        elapsed_ms: float,
+        *,
+        status: Optional[int] = None,
+        headers: Optional[httpx.Headers] = None,
+        body: bytes = b'',
+        error: Optional[BaseException] = None,
+    ) -> None:
+        kept = [(k, v) for k, v in (headers or httpx.Headers()).multi_items() if k.lower() not in _DROP_HEADERS]
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO exchanges (method, url, body_hash, status, headers, body, error, elapsed_ms, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    request.method,
+                    _match_url(request.url),
+                    _body_hash(request),
+                    status,
+                    json.dumps(kept, ensure_ascii=False),
+                    body,
+                    f'{type(error).__name__}: {error}' if error else None,
+                    round(elapsed_ms, 1),
+                    datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                ),
+            )
+            self._stats['recorded'] += 1
+
+    def find(self, request: httpx.Request) -> Optional[sqlite3.Row]:
+        """본문까지 같은 기록을 찾는다. HTTP_CASSETTE_URL_ONLY_PATHS 경로(서명/타임스탬프가 든 요청)만
+        본문이 달라도 method+URL이 같은 기록으로 대신한다."""
+        method, url = request.method, _match_url(request.url)
+        body_hash = _body_hash(request)
+        lookups = [
+            (
+                (method, url, body_hash),
+                "SELECT * FROM exchanges WHERE method = ? AND url = ? AND body_hash = ? ORDER BY id",
+                (method, url, body_hash),
+            )
+        ]
+        if _url_only_match(request.url):
+            lookups.append(
+                ((method, url), "SELECT * FROM exchanges WHERE method = ? AND url = ? ORDER BY id", (method, url))
+            )
+        with self._lock:
+            for key, sql, params in lookups:
+                rows = self._conn.execute(sql, params).fetchall()
+                if not rows:
+                    continue
+                idx = self._cursors.get(key, 0)
+                self._cursors[key] = idx + 1
+                self._stats['replayed' if len(key) == 3 else 'replayed_by_url'] += 1
+                return rows[min(idx, len(rows) - 1)]
+            self._stats['misses'] += 1
+            return None
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM exchanges").fetchone()[0]
+            return {'mode': settings.http_cassette_mode, 'exchanges': count, **self._stats}
+
+
+class RecordingTransport(httpx.BaseTransport):
+    def __init__(self, store: CassetteStore) -> None:
+        self._store = store
+        self._inner = httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        started = time.perf_counter()
+        try:
+            res = self._inner.handle_request(request)
+            body = res.read()
+        except httpx.TransportError as e:
+            self._store.save(request, (time.perf_counter() - started) * 1000, error=e)
+            raise
+        self._store.save(
+            request, (time.perf_counter() - started) * 1000, status=res.status_code, headers=res.headers, body=body
+        )
+        headers = [(k, v) for k, v in res.headers.multi_items() if k.lower() not in _DROP_HEADERS]
+        return httpx.Response(res.status_code, headers=headers, content=body, request=request)
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+class ReplayTransport(httpx.BaseTransport):
+    def __init__(self, store: CassetteStore, latency_scale: float) -> None:
+        self._store = store
+        self._latency_scale = latency_scale
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        row = self._store.find(request)
+        if row is None:
+            raise CassetteMissError(f'기록 없음: {request.method} {request.url}', request=request)
+
+        delay = row['elapsed_ms'] / 1000 * self._latency_scale
+        read_timeout = (request.extensions.get('timeout') or {}).get('read')
+        if read_timeout is not None and delay > read_timeout:
+            time.sleep(read_timeout)
+            raise httpx.ReadTimeout('재생: 기록된 응답시간이 timeout 초과', request=request)
+        time.sleep(delay)
+
+        if row['error']:
+            name, _, message = row['error'].partition(': ')
+            error_cls = getattr(httpx, name, None)
+            if not (isinstance(error_cls, type) and issubclass(error_cls, httpx.TransportError)):
+                error_cls = httpx.TransportError
+            raise error_cls(message, request=request)
+        return httpx.Response(
+            row['status'], headers=json.loads(row['headers']), content=bytes(row['body']), request=request
+        )
+
+
+_store: Optional[CassetteStore] = None
+_store_lock = threading.Lock()
+
+
+def cassette_store() -> Optional[CassetteStore]:
+    global _store
+    if settings.http_cassette_mode not in MODES:
+        raise ValueError(f'HTTP_CASSETTE_MODE는 {"/".join(MODES)} 중 하나여야 합니다: {settings.http_cassette_mode}')
+    if settings.http_cassette_mode == 'off':
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CassetteStore()
+    return _store
+
+
+def http_client(**kwargs: Any) -> httpx.Client:
+    """외부 HTTP 호출용 httpx.Client. HTTP_CASSETTE_MODE가 record/replay면 기록/재생 transport를 끼운다."""
+    store = cassette_store()
+    if store is None:
+        return httpx.Client(**kwargs)
+    if settings.http_cassette_mode == 'record':
+        return httpx.Client(transport=RecordingTransport(store), **kwargs)
+    return httpx.Client(transport=ReplayTransport(store, settings.http_replay_latency_scale), **kwargs)
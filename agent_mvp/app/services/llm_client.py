@@ -1,21 +1,73 @@
 from __future__ import annotations
 
+import contextvars
 import json
 import re
-from html import unescape
+import threading
+import time
+import unicodedata
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from typing import Any
+from typing import Callable
 from typing import Optional
-from urllib.parse import urljoin
 from urllib.parse import quote
 from urllib.parse import urlparse
 
 import httpx
-from bs4 import BeautifulSoup
 
 from app.config import settings
+from app.services.circuit_breaker import BreakerRegistry
+from app.services.cpu_pool import CpuPool
+from app.services.host_latency import HostLatencyTracker
+from app.services.html_parsing import (
+    parse_ddg_results,
+    parse_page_snippet,
+    parse_product_html,
+    parse_source_snapshot,
+    quality_postprocess,
+    to_str_list,
+    unique_keep_order,
+)
+from app.services.http_cassette import http_client
+from app.services.llm_router import TIER_HEURISTIC, LLMRouter, TierAttempt, extraction_completeness
+from app.services.near_duplicate import NearDuplicateIndex
+from app.services.openai_scheduler import OpenAIRateScheduler, retry_after_s
+from app.services.tracing import current_span, span, traced
+from app.services.translation_memory import TranslationMemory
+
+# 차단/과부하 응답은 5xx와 같이 upstream 실패로 센다.
+UPSTREAM_BLOCK_STATUSES = {403, 429}
+# 원문 페이지가 이 상태면 상품이 내려간 것으로 본다.
+SOURCE_GONE_STATUSES = {404, 410}
+
+
+class SourceHttpError(RuntimeError):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f'HTTP {status_code}')
+        self.status_code = status_code
+
+
+def _quota_exhausted(res: httpx.Response) -> bool:
+    """OpenAI 429 중 요금/한도 소진(insufficient_quota)은 기다려도 풀리지 않으므로 재시도하지 않는다."""
+    try:
+        error = res.json().get('error')
+    except ValueError:
+        return False
+    return isinstance(error, dict) and error.get('code') == 'insufficient_quota'
 
 
 class LLMClient:
+    def __init__(self) -> None:
+        self.router = LLMRouter()
+        self.cpu_pool = CpuPool(settings.cpu_pool_workers)
+        self.breakers = BreakerRegistry(settings.circuit_failure_threshold, settings.circuit_reset_timeout_s)
+        self.host_latency = HostLatencyTracker()
+        self.translation_memory = TranslationMemory()
+        self.near_duplicates = NearDuplicateIndex()
+        self.openai_scheduler = OpenAIRateScheduler()
+        self._fetch_executor = ThreadPoolExecutor(max_workers=settings.fetch_hedge_threads, thread_name_prefix='fetch')
+
     def detect_source_site(self, url: str) -> str:
         host = urlparse(url).netloc.lower()
         if 'amazon.co.jp' in host:
@@ -27,51 +79,33 @@ class LLMClient:
         return 'other'
 
     def extract_product_from_link(self, source_url: str) -> dict[str, Any]:
+        return self.enrich_product(self.fetch_source_product(source_url))
+
+    def fetch_source_product(self, source_url: str) -> dict[str, Any]:
+        """원문 페이지만 가져와 파싱한다(웹 컨텍스트/LLM 없음). 실패 시 fallback 값을 채운다."""
         site = self.detect_source_site(source_url)
         try:
-            html = self._fetch_html(source_url)
-            parsed = self._extract_from_html(source_url, html)
+            raw, encoding = self._fetch_html(source_url)
+            parsed = self.cpu_pool.run('parse_product_html', parse_product_html, source_url, raw, encoding)
 
-            title = parsed.get('title') or self._fallback_title(site)
-            source_price_jpy = parsed.get('price_jpy') or self._fallback_price(site)
             images = parsed.get('image_urls') or []
             representative_image_url = parsed.get('representative_image_url')
             if not representative_image_url and images:
                 representative_image_url = images[0]
 
-            web_pack = self._fetch_web_context_pack(title)
-
-            llm_pack = self._llm_enrich(
-                source_url=source_url,
-                title=title,
-                source_description=parsed.get('source_description', ''),
-                key_features=parsed.get('key_features', []),
-                specs=parsed.get('specs', {}),
-                raw_text_snippet=parsed.get('raw_text_snippet', ''),
-                web_context=web_pack.get('snippets', []),
-                web_source_links=web_pack.get('links', []),
-            )
-
             return {
                 'source_site': site,
                 'source_url': source_url,
-                'title': llm_pack.get('title_ko') or title,
-                'source_price_jpy': source_price_jpy,
+                'title': parsed.get('title') or self._fallback_title(site),
+                'source_price_jpy': parsed.get('price_jpy') or self._fallback_price(site),
                 'representative_image_url': representative_image_url,
                 'image_urls': images,
-                'source_description': llm_pack.get('translated_source_description_ko')
-                or parsed.get('source_description', ''),
-                'key_features': llm_pack.get('translated_key_features_ko') or parsed.get('key_features', []),
-                'specs': llm_pack.get('translated_specs_ko') or parsed.get('specs', {}),
-                'raw_text_snippet': llm_pack.get('translated_raw_text_snippet_ko')
-                or parsed.get('raw_text_snippet', ''),
-                'llm_summary_ko': llm_pack.get('summary_ko', ''),
-                'llm_product_judgement_ko': llm_pack.get('product_judgement_ko', ''),
-                'llm_selling_points_ko': llm_pack.get('selling_points_ko', []),
-                'llm_detail_outline_ko': llm_pack.get('detail_outline_ko', []),
-                'llm_detail_sections_ko': llm_pack.get('detail_sections_ko', []),
-                'source_links': web_pack.get('links', []),
+                'source_description': parsed.get('source_description', ''),
+                'key_features': parsed.get('key_features', []),
+                'specs': parsed.get('specs', {}),
+                'raw_text_snippet': parsed.get('raw_text_snippet', ''),
                 'note': parsed.get('note', 'HTML 추출'),
+                'fetched': True,
             }
         except Exception as e:
             return {
@@ -85,152 +119,305 @@ class LLMClient:
                 'key_features': [],
                 'specs': {},
                 'raw_text_snippet': '',
-                'llm_summary_ko': '',
-                'llm_product_judgement_ko': '',
-                'llm_selling_points_ko': [],
-                'llm_detail_outline_ko': [],
-                'llm_detail_sections_ko': [],
-                'source_links': [],
                 'note': f'fallback extraction 사용: {str(e)[:100]}',
+                'fetched': False,
             }
 
-    def _fetch_html(self, source_url: str) -> str:
+    def fetch_source_snapshot(self, source_url: str) -> dict[str, Any]:
+        """재수집용: 원문 페이지의 가격/재고만 본다. 실패하면 예외(fallback 값으로 채우지 않음).
+
+        availability: in_stock / out_of_stock / gone(404·410) / None(판단 불가)
+        """
+        try:
+            raw, encoding = self._fetch_html(source_url)
+        except SourceHttpError as e:
+            if e.status_code in SOURCE_GONE_STATUSES:
+                return {'price_jpy': None, 'availability': 'gone'}
+            raise
+        return self.cpu_pool.run('parse_source_snapshot', parse_source_snapshot, raw, encoding)
+
+    def enrich_product(self, source: dict[str, Any], margin_rate: Optional[float] = None) -> dict[str, Any]:
+        """fetch_source_product 결과에 웹 컨텍스트 + LLM 한국어 자료를 붙인다.
+
+        가격/마진/몰/추출 완성도로 휴리스틱-소형 모델-기본 모델 중 tier를 고르고,
+        소형 모델 결과가 품질 기준에 못 미치면 기본 모델로 한 번 승급한다.
+        """
+        if not source.get('fetched'):
+            return self.skip_enrichment(source)
+        tier, tier_reason = self.router.choose_tier(
+            price_jpy=source['source_price_jpy'],
+            margin_rate=margin_rate,
+            source_site=source['source_site'],
+            completeness=extraction_completeness(source),
+        )
+        current_span().set(tier=tier)
+        model_numbers = self._extract_model_numbers(source['title'])
+        if tier != TIER_HEURISTIC and settings.near_duplicate_enabled:
+            # 다른 몰/URL에서 이미 보강한 같은 상품이면 웹 컨텍스트/LLM 없이 그 결과를 재사용
+            match = self.near_duplicates.find(source['source_url'], source['title'], model_numbers, source['specs'])
+            current_span().set(cache='near_duplicate_hit' if match else 'near_duplicate_miss')
+            if match:
+                report = {
+                    'initial_tier': tier,
+                    'reason': tier_reason,
+                    'final_tier': match.enrichment.get('tier', tier),
+                    'attempts': [],
+                    'reused_from': {
+                        'source_url': match.source_url,
+                        'title': match.title,
+                        'similarity': match.similarity,
+                        'model_match': match.model_match,
+                    },
+                }
+                pack = match.enrichment['llm_pack']
+                return self._enriched_result(source, pack, match.enrichment.get('source_links', []), report)
+
+        try:
+            if tier == TIER_HEURISTIC:
+                web_pack: dict[str, list[str]] = {'snippets': [], 'links': []}
+            else:
+                web_pack = self._fetch_web_context_pack(source['title'])
+
+            llm_pack, attempts = self._routed_llm_enrich(tier, source, web_pack)
+        except Exception as e:
+            out = self.skip_enrichment(source)
+            out['note'] = f"{source['note']} / enrichment 실패: {str(e)[:100]}"
+            return out
+
+        final = attempts[-1]
+        if final.tier != TIER_HEURISTIC and final.accepted and settings.near_duplicate_enabled:
+            self.near_duplicates.add(
+                source['source_url'],
+                source['title'],
+                model_numbers,
+                source['specs'],
+                {'tier': final.tier, 'llm_pack': llm_pack, 'source_links': web_pack.get('links', [])},
+            )
+        report = {
+            'initial_tier': tier,
+            'reason': tier_reason,
+            'final_tier': final.tier,
+            'attempts': [a.as_dict() for a in attempts],
+        }
+        return self._enriched_result(source, llm_pack, web_pack.get('links', []), report)
+
+    def _enriched_result(
+        self, source: dict[str, Any], llm_pack: dict[str, Any], source_links: list[str], tier_report: dict[str, Any]
+    ) -> dict[str, Any]:
+        return {
+            'source_site': source['source_site'],
+            'source_url': source['source_url'],
+            'title': llm_pack.get('title_ko') or source['title'],
+            'source_price_jpy': source['source_price_jpy'],
+            'representative_image_url': source['representative_image_url'],
+            'image_urls': source['image_urls'],
+            'source_description': llm_pack.get('translated_source_description_ko')
+            or source['source_description'],
+            'key_features': llm_pack.get('translated_key_features_ko') or source['key_features'],
+            'specs': llm_pack.get('translated_specs_ko') or source['specs'],
+            'raw_text_snippet': llm_pack.get('translated_raw_text_snippet_ko') or source['raw_text_snippet'],
+            'llm_summary_ko': llm_pack.get('summary_ko', ''),
+            'llm_product_judgement_ko': llm_pack.get('product_judgement_ko', ''),
+            'llm_selling_points_ko': llm_pack.get('selling_points_ko', []),
+            'llm_detail_outline_ko': llm_pack.get('detail_outline_ko', []),
+            'llm_detail_sections_ko': llm_pack.get('detail_sections_ko', []),
+            'source_links': source_links,
+            'note': source['note'],
+            'llm_tier_report': tier_report,
+        }
+
+    def _routed_llm_enrich(
+        self, tier: str, source: dict[str, Any], web_pack: dict[str, list[str]]
+    ) -> tuple[dict[str, Any], list[TierAttempt]]:
+        attempts: list[TierAttempt] = []
+        while True:
+            model = self.router.model_for(tier)
+            started = time.perf_counter()
+            if tier == TIER_HEURISTIC:
+                pack = self._heuristic_llm_pack(
+                    source['title'], source['source_description'], source['key_features']
+                )
+                usage: dict[str, Any] = {'prompt_tokens': 0, 'completion_tokens': 0, 'fallback': False}
+            else:
+                with span('llm', tier=tier, model=model) as s:
+                    pack, usage = self._llm_enrich(
+                        source_url=source['source_url'],
+                        title=source['title'],
+                        source_description=source['source_description'],
+                        key_features=source['key_features'],
+                        specs=source['specs'],
+                        raw_text_snippet=source['raw_text_snippet'],
+                        web_context=web_pack.get('snippets', []),
+                        web_source_links=web_pack.get('links', []),
+                        model=model,
+                    )
+                    tm = usage.get('translation_memory') or {}
+                    s.set(
+                        prompt_tokens=usage['prompt_tokens'],
+                        completion_tokens=usage['completion_tokens'],
+                        fallback=usage['fallback'],
+                        fallback_reason=usage.get('fallback_reason'),
+                        **{
+                            'cache.translation_memory_hits': tm.get('hits'),
+                            'cache.translation_memory_sent': tm.get('sent_to_llm'),
+                        },
+                    )
+            latency_ms = (time.perf_counter() - started) * 1000
+
+            if tier == TIER_HEURISTIC:
+                failures: list[str] = []
+            elif usage['fallback']:
+                failures = [f"LLM 호출 실패(휴리스틱 대체: {usage.get('fallback_reason', '알 수 없음')})"]
+            else:
+                failures = self.router.quality_failures(pack)
+            next_tier = self.router.next_tier(tier) if failures else None
+
+            attempt = TierAttempt(
+                tier=tier,
+                model=model,
+                latency_ms=latency_ms,
+                prompt_tokens=usage['prompt_tokens'],
+                completion_tokens=usage['completion_tokens'],
+                cost_usd=self.router.cost_usd(tier, usage['prompt_tokens'], usage['completion_tokens']),
+                accepted=next_tier is None,
+                reason=', '.join(failures),
+                translation_memory=usage.get('translation_memory'),
+            )
+            self.router.record(attempt, escalated=next_tier is not None)
+            attempts.append(attempt)
+            if next_tier is None:
+                return pack, attempts
+            tier = next_tier
+
+    def skip_enrichment(self, source: dict[str, Any]) -> dict[str, Any]:
+        return {
+            'source_site': source['source_site'],
+            'source_url': source['source_url'],
+            'title': source['title'],
+            'source_price_jpy': source['source_price_jpy'],
+            'representative_image_url': source['representative_image_url'],
+            'image_urls': source['image_urls'],
+            'source_description': source['source_description'],
+            'key_features': source['key_features'],
+            'specs': source['specs'],
+            'raw_text_snippet': source['raw_text_snippet'],
+            'llm_summary_ko': '',
+            'llm_product_judgement_ko': '',
+            'llm_selling_points_ko': [],
+            'llm_detail_outline_ko': [],
+            'llm_detail_sections_ko': [],
+            'source_links': [],
+            'note': source['note'],
+        }
+
+    def _guarded_request(
+        self,
+        upstream: str,
+        method: str,
+        url: str,
+        *,
+        timeout: float,
+        follow_redirects: bool = False,
+        will_retry: Optional[Callable[[httpx.Response], bool]] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """upstream별 circuit breaker를 거쳐 요청한다. 차단 중이면 타임아웃을 기다리지 않고 CircuitOpenError.
+
+        will_retry: 호출한 쪽이 이 응답을 backoff 후 재시도하면 True. 결과가 정해지지 않았으므로 breaker에
+        성공/실패 어느 쪽도 기록하지 않는다(재시도하지 않는 429, 마지막 429는 실패로 기록).
+        """
+        breaker = self.breakers.get(upstream)
+        with span(f'http {upstream}', **{'http.method': method, 'http.host': urlparse(url).netloc.lower()}) as s:
+            breaker.before_call()
+            try:
+                with http_client(timeout=timeout, follow_redirects=follow_redirects) as client:
+                    res = client.request(method, url, **kwargs)
+            except Exception as e:
+                breaker.record_failure(f'{type(e).__name__}: {e}')
+                raise
+            s.set(**{'http.status_code': res.status_code, 'http.response_bytes': len(res.content)})
+            if will_retry is not None and will_retry(res):
+                breaker.release()
+            elif res.status_code >= 500 or res.status_code in UPSTREAM_BLOCK_STATUSES:
+                breaker.record_failure(f'HTTP {res.status_code}')
+            else:
+                breaker.record_success()
+        return res
+
+    @traced('fetch')
+    def _fetch_html(self, source_url: str) -> tuple[bytes, Optional[str]]:
         headers = {
             'User-Agent': (
                 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
                 'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36'
             )
         }
-        with httpx.Client(timeout=20.0, follow_redirects=True, headers=headers) as client:
-            res = client.get(source_url)
+        host = urlparse(source_url).netloc.lower()
+        timeout = self.host_latency.timeout_for(host)
+        current_span().set(**{'http.host': host, 'timeout_s': round(timeout, 2)})
+
+        def fetch() -> httpx.Response:
+            t0 = time.perf_counter()
+            try:
+                res = self._guarded_request(
+                    f'shop:{host}', 'GET', source_url, timeout=timeout, follow_redirects=True, headers=headers
+                )
+            except httpx.TimeoutException:
+                self.host_latency.record(host, timeout, timed_out=True)
+                raise
+            if res.status_code < 400:
+                self.host_latency.record(host, time.perf_counter() - t0)
+            return res
+
+        hedge_after = self.host_latency.hedge_delay(host)
+        res = fetch() if hedge_after is None else self._hedged_call(host, fetch, hedge_after)
+        current_span().set(**{'http.status_code': res.status_code, 'http.response_bytes': len(res.content)})
         if res.status_code >= 400:
-            raise RuntimeError(f'HTTP {res.status_code}')
-        return res.text or ''
-
-    def _extract_from_html(self, source_url: str, html: str) -> dict[str, Any]:
-        soup = BeautifulSoup(html or '', 'html.parser')
-
-        jsonld = self._extract_jsonld_product(html)
-        meta_title = self._find_meta(html, 'og:title')
-        title_tag = self._find_title_tag(html)
-        meta_desc = self._find_meta(html, 'og:description') or self._find_meta(html, 'description') or ''
-        meta_price = self._find_meta(html, 'product:price:amount')
-
-        title = None
-        price_jpy = None
-        jsonld_images: list[str] = []
-        if jsonld:
-            title = jsonld.get('name')
-            price_jpy = self._to_int_price(jsonld.get('price'))
-            raw_images = jsonld.get('images') or []
-            jsonld_images = [self._abs_url(source_url, u) for u in raw_images if u]
-
-        if not title:
-            h1 = soup.find('h1')
-            title = (h1.get_text(' ', strip=True) if h1 else None) or meta_title or title_tag
-        if not price_jpy:
-            price_jpy = self._to_int_price(meta_price)
-
-        og_image = self._find_meta(html, 'og:image')
-        all_images = []
-        if og_image:
-            all_images.append(self._abs_url(source_url, og_image))
-        all_images.extend(jsonld_images)
-        all_images.extend(self._extract_img_urls(source_url, soup))
-        all_images = self._unique_keep_order([u for u in all_images if u])[:15]
-
-        key_features = self._extract_features(soup)
-        specs = self._extract_specs(soup)
-        raw_text_snippet = self._extract_text_snippet(soup)
-
-        note = 'JSON-LD 추출' if jsonld else 'meta/title 추출'
-        return {
-            'title': title,
-            'price_jpy': price_jpy,
-            'representative_image_url': all_images[0] if all_images else None,
-            'image_urls': all_images,
-            'source_description': meta_desc,
-            'key_features': key_features,
-            'specs': specs,
-            'raw_text_snippet': raw_text_snippet,
-            'note': note,
-        }
+            raise SourceHttpError(res.status_code)
+        return res.content or b'', res.encoding
 
-    def _extract_img_urls(self, source_url: str, soup: BeautifulSoup) -> list[str]:
-        urls: list[str] = []
-        for img in soup.find_all('img'):
-            src = img.get('src') or img.get('data-src') or img.get('data-original')
-            if not src:
-                continue
-            src = src.strip()
-            if not src or src.startswith('data:image'):
-                continue
-            urls.append(self._abs_url(source_url, src))
-        return urls
-
-    def _extract_features(self, soup: BeautifulSoup) -> list[str]:
-        features: list[str] = []
-        for li in soup.find_all('li'):
-            t = li.get_text(' ', strip=True)
-            if len(t) < 8 or len(t) > 160:
-                continue
-            if re.search(r'^(home|login|cart|menu)$', t, re.IGNORECASE):
-                continue
-            features.append(t)
-            if len(features) >= 20:
-                break
-        return self._unique_keep_order(features)
-
-    def _extract_specs(self, soup: BeautifulSoup) -> dict[str, str]:
-        specs: dict[str, str] = {}
-
-        # table 기반 스펙
-        for tr in soup.find_all('tr'):
-            th = tr.find('th')
-            td = tr.find('td')
-            if not th or not td:
-                continue
-            k = th.get_text(' ', strip=True)
-            v = td.get_text(' ', strip=True)
-            if not k or not v:
-                continue
-            if len(k) > 80 or len(v) > 300:
-                continue
-            specs[k] = v
-            if len(specs) >= 20:
-                break
-
-        # dl 기반 스펙
-        if len(specs) < 20:
-            dts = soup.find_all('dt')
-            for dt in dts:
-                dd = dt.find_next_sibling('dd')
-                if not dd:
-                    continue
-                k = dt.get_text(' ', strip=True)
-                v = dd.get_text(' ', strip=True)
-                if not k or not v:
+    def _hedged_call(self, host: str, fn: Any, hedge_after: float) -> httpx.Response:
+        """첫 요청이 호스트 p95를 넘기면 같은 요청을 한 번 더 보내고 먼저 성공한 응답을 쓴다.
+
+        5xx/403/429 응답은 예외와 같이 실패로 보고 나머지 요청을 기다린다(둘 다 실패하면 그 응답을 돌려준다).
+        """
+        started = threading.Event()
+
+        def run() -> httpx.Response:
+            started.set()
+            return fn()
+
+        # 요청별로 context를 복사해 넘겨야 worker 스레드의 http span이 이 trace에 붙는다.
+        first = self._fetch_executor.submit(contextvars.copy_context().run, run)
+        # p95 대기는 worker가 실제로 요청을 시작한 뒤부터 잰다(풀 대기열 시간으로 hedge를 남발하지 않게).
+        started.wait()
+        try:
+            return first.result(timeout=hedge_after)
+        except FutureTimeoutError:
+            pass
+        current_span().set(hedged=True)
+        second = self._fetch_executor.submit(contextvars.copy_context().run, fn)
+        pending: set[Future] = {first, second}
+        error: Optional[BaseException] = None
+        failed: Optional[httpx.Response] = None
+        # 늦은 쪽 요청은 취소할 수 없어 백그라운드에서 timeout까지 마무리된다.
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                if fut.exception() is not None:
+                    error = fut.exception()
                     continue
-                if len(k) > 80 or len(v) > 300:
+                res = fut.result()
+                if res.status_code >= 500 or res.status_code in UPSTREAM_BLOCK_STATUSES:
+                    failed = res
                     continue
-                if k not in specs:
-                    specs[k] = v
-                if len(specs) >= 20:
-                    break
-
-        return specs
-
-    def _extract_text_snippet(self, soup: BeautifulSoup) -> str:
-        blocks: list[str] = []
-        for tag in soup.find_all(['h1', 'h2', 'h3', 'p']):
-            t = tag.get_text(' ', strip=True)
-            if len(t) < 15:
-                continue
-            blocks.append(t)
-            if len(' '.join(blocks)) > 3500:
-                break
-        snippet = '\n'.join(blocks)
-        return snippet[:4000]
+                self.host_latency.record_hedge(host, won=fut is second)
+                current_span().set(hedge_won=fut is second)
+                return res
+        self.host_latency.record_hedge(host, won=False)
+        if failed is not None:
+            return failed
+        raise error
 
     def _llm_enrich(
         self,
@@ -243,14 +430,21 @@ class LLMClient:
         raw_text_snippet: str,
         web_context: list[str],
         web_source_links: list[str],
-    ) -> dict[str, Any]:
+        model: Optional[str] = None,
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """(pack, usage). 호출 실패로 휴리스틱 pack을 돌려주면 usage['fallback']=True."""
+        usage: dict[str, Any] = {'prompt_tokens': 0, 'completion_tokens': 0, 'fallback': True}
         if not settings.llm_enabled or not settings.openai_api_key:
-            return self._heuristic_llm_pack(title, source_description, key_features)
+            usage['fallback_reason'] = 'LLM 비활성'
+            return self._heuristic_llm_pack(title, source_description, key_features), usage
 
+        # 스펙 항목/특징 문장은 번역 메모리에 있는 세그먼트를 한국어로 바꿔 보내고, 일본어로 남은 것만 LLM이 번역한다.
+        tm_plan = self.translation_memory.plan(key_features[:20], specs)
+        prompt_features, prompt_specs = tm_plan.assemble()
         facts_blob = self._build_facts_blob(
             source_description=source_description,
-            key_features=key_features,
-            specs=specs,
+            key_features=prompt_features,
+            specs=prompt_specs,
             raw_text_snippet=raw_text_snippet,
         )
 
@@ -258,8 +452,8 @@ class LLMClient:
             'source_url': source_url,
             'title': title,
             'source_description': source_description,
-            'key_features': key_features[:20],
-            'specs': specs,
+            'key_features': prompt_features,
+            'specs': prompt_specs,
             'raw_text_snippet': raw_text_snippet[:2500],
             'web_context': web_context[:12],
             'web_source_links': web_source_links[:10],
@@ -274,8 +468,7 @@ class LLMClient:
                     'detail_outline_ko': ['string'],
                     'detail_sections_ko': ['string'],
                     'translated_source_description_ko': 'string',
-                    'translated_key_features_ko': ['string'],
-                    'translated_specs_ko': {'key': 'value'},
+                    'translated_segments_ko': {'<Japanese segment>': 'string'},
                     'translated_raw_text_snippet_ko': 'string',
                 },
                 'constraints': [
@@ -288,16 +481,14 @@ class LLMClient:
                     'Write in clean Korean for ecommerce detail page, avoid awkward literal translation',
                     'detail_sections_ko should be practical section-style copy for detail page blocks',
                     'When web_context suggests likely product identity or brand/IP story, include cautious judgement in product_judgement_ko',
+                    'translated_segments_ko maps each key_features item, spec key and spec value still in Japanese '
+                    '(verbatim as the key) to its Korean translation; skip items already in Korean',
                 ],
             },
         }
 
-        headers = {
-            'Authorization': f'Bearer {settings.openai_api_key}',
-            'Content-Type': 'application/json',
-        }
         body = {
-            'model': settings.openai_model,
+            'model': model or settings.openai_model,
             'temperature': 0.2,
             'messages': [
                 {
@@ -312,30 +503,86 @@ class LLMClient:
         }
 
         try:
-            with httpx.Client(timeout=35.0) as client:
-                res = client.post('https://api.openai.com/v1/chat/completions', headers=headers, json=body)
-            if res.status_code >= 400:
-                return self._heuristic_llm_pack(title, source_description, key_features)
-            payload = res.json()
+            res, payload = self._openai_chat(body)
+            if payload is None:
+                usage['fallback_reason'] = f'HTTP {res.status_code}'
+                return self._heuristic_llm_pack(title, source_description, key_features), usage
+            token_usage = payload.get('usage') or {}
+            usage['prompt_tokens'] = int(token_usage.get('prompt_tokens') or 0)
+            usage['completion_tokens'] = int(token_usage.get('completion_tokens') or 0)
             content = payload['choices'][0]['message']['content']
             parsed = self._extract_json_object(content)
             if not parsed:
-                return self._heuristic_llm_pack(title, source_description, key_features)
+                usage['fallback_reason'] = 'JSON 응답 파싱 실패'
+                return self._heuristic_llm_pack(title, source_description, key_features), usage
             out = {
                 'title_ko': str(parsed.get('title_ko') or title),
                 'summary_ko': str(parsed.get('summary_ko') or ''),
-                'selling_points_ko': self._to_str_list(parsed.get('selling_points_ko')),
-                'detail_outline_ko': self._to_str_list(parsed.get('detail_outline_ko')),
-                'detail_sections_ko': self._to_str_list(parsed.get('detail_sections_ko')),
+                'selling_points_ko': to_str_list(parsed.get('selling_points_ko')),
+                'detail_outline_ko': to_str_list(parsed.get('detail_outline_ko')),
+                'detail_sections_ko': to_str_list(parsed.get('detail_sections_ko')),
                 'product_judgement_ko': str(parsed.get('product_judgement_ko') or ''),
                 'translated_source_description_ko': str(parsed.get('translated_source_description_ko') or ''),
-                'translated_key_features_ko': self._to_str_list(parsed.get('translated_key_features_ko')),
-                'translated_specs_ko': self._to_str_dict(parsed.get('translated_specs_ko')),
                 'translated_raw_text_snippet_ko': str(parsed.get('translated_raw_text_snippet_ko') or ''),
             }
-            return self._quality_postprocess(out, facts_blob)
-        except Exception:
-            return self._heuristic_llm_pack(title, source_description, key_features)
+            self.translation_memory.learn(tm_plan, parsed.get('translated_segments_ko'))
+            out['translated_key_features_ko'], out['translated_specs_ko'] = tm_plan.assemble()
+            self.translation_memory.record(tm_plan)
+            usage['translation_memory'] = tm_plan.report()
+            usage['fallback'] = False
+            return self.cpu_pool.run('quality_postprocess', quality_postprocess, out, facts_blob), usage
+        except Exception as e:
+            usage['fallback_reason'] = f'{type(e).__name__}: {str(e)[:120]}'
+            return self._heuristic_llm_pack(title, source_description, key_features), usage
+
+    def _openai_chat(self, body: dict[str, Any]) -> tuple[httpx.Response, Optional[dict[str, Any]]]:
+        """RPM/TPM 예산을 받아 호출하고 429는 backoff 후 재시도한다. (마지막 응답, 성공 시 JSON 본문)."""
+        scheduler = self.openai_scheduler
+        headers = {
+            'Authorization': f'Bearer {settings.openai_api_key}',
+            'Content-Type': 'application/json',
+        }
+        queue_wait_s = 0.0
+        retries = 0
+
+        def will_retry(res: httpx.Response) -> bool:
+            return res.status_code == 429 and retries < settings.openai_max_retries and not _quota_exhausted(res)
+
+        while True:
+            permit = scheduler.acquire(body['messages'])
+            queue_wait_s += permit.wait_s
+            try:
+                res = self._guarded_request(
+                    'openai',
+                    'POST',
+                    f"{settings.openai_base_url.rstrip('/')}/chat/completions",
+                    timeout=35.0,
+                    will_retry=will_retry,
+                    headers=headers,
+                    json=body,
+                )
+            except Exception:
+                scheduler.settle(permit, None, None)
+                raise
+            scheduler.observe(res.headers)
+            if will_retry(res):
+                scheduler.rate_limited(permit, retry_after_s(res.headers, retries))
+                retries += 1
+                continue
+            current_span().set(
+                **{
+                    'openai.queue_wait_ms': round(queue_wait_s * 1000, 1),
+                    'openai.estimated_tokens': permit.estimated_tokens,
+                    'openai.retries_429': retries,
+                }
+            )
+            if res.status_code >= 400:
+                scheduler.settle(permit, None, None)
+                return res, None
+            payload = res.json()
+            token_usage = payload.get('usage') or {}
+            scheduler.settle(permit, token_usage.get('prompt_tokens'), token_usage.get('completion_tokens'))
+            return res, payload
 
     def _heuristic_llm_pack(
         self, title: str, source_description: str, key_features: list[str]
@@ -364,6 +611,7 @@ class LLMClient:
             'translated_raw_text_snippet_ko': '',
         }
 
+    @traced('web_context')
     def _fetch_web_context_pack(self, query: str) -> dict[str, list[str]]:
         q = query.strip()
         if not q:
@@ -380,43 +628,40 @@ class LLMClient:
 
         s1, l1 = self._fetch_duckduckgo_context(q)
         s2, l2 = self._fetch_wikipedia_context(q)
+        current_span().set(queries=len(queries[:4]), snippets=len(snippets) + len(s1) + len(s2))
         snippets.extend(s1)
         snippets.extend(s2)
         links.extend(l1)
         links.extend(l2)
         return {
-            "snippets": self._unique_keep_order([s for s in snippets if s])[:16],
-            "links": self._unique_keep_order([x for x in links if x])[:12],
+            "snippets": unique_keep_order([s for s in snippets if s])[:16],
+            "links": unique_keep_order([x for x in links if x])[:12],
         }
 
     def _extract_search_keywords(self, title: str) -> list[str]:
         # 상품명에서 모델/브랜드 단서를 뽑아 보조 검색 쿼리를 만든다.
-        tokens = re.findall(r"[A-Za-z0-9][A-Za-z0-9\\-_/]{3,}", title)
-        strong = [t for t in tokens if any(ch.isdigit() for ch in t) and len(t) >= 5]
-        phrases = re.findall(r"[A-Za-z]{3,}\\s+[A-Za-z0-9\\-]{2,}", title)
-        out = strong[:3] + phrases[:2]
-        return self._unique_keep_order(out)
+        phrases = re.findall(r"[A-Za-z]{3,}\s+[A-Za-z0-9\-]{2,}", unicodedata.normalize('NFKC', title))
+        out = self._extract_model_numbers(title)[:3] + phrases[:2]
+        return unique_keep_order(out)
+
+    def _extract_model_numbers(self, title: str) -> list[str]:
+        tokens = re.findall(r"[A-Za-z0-9][A-Za-z0-9\-_/]{3,}", unicodedata.normalize('NFKC', title))
+        return unique_keep_order([t for t in tokens if any(ch.isdigit() for ch in t) and len(t) >= 5])
 
+    @traced('ddg_query')
     def _fetch_ddg_html_search_context(self, query: str) -> tuple[list[str], list[str]]:
+        current_span().set(query=query)
         try:
-            with httpx.Client(timeout=10.0, follow_redirects=True) as client:
-                res = client.get("https://duckduckgo.com/html/", params={"q": query})
+            res = self._guarded_request(
+                'ddg_html', 'GET', settings.ddg_html_url, timeout=10.0, follow_redirects=True, params={"q": query}
+            )
             if res.status_code >= 400:
                 return [], []
-            soup = BeautifulSoup(res.text or "", "html.parser")
+            results = self.cpu_pool.run('parse_ddg_results', parse_ddg_results, res.content, res.encoding)
+            current_span().set(results=len(results))
             snippets: list[str] = []
             links: list[str] = []
-
-            anchors = soup.select("a.result__a")
-            if not anchors:
-                anchors = soup.select("a[href]")
-            for a in anchors[:5]:
-                href = (a.get("href") or "").strip()
-                title = a.get_text(" ", strip=True)
-                if not href or not title:
-                    continue
-                if href.startswith("/"):
-                    continue
+            for href, title in results:
                 links.append(href)
                 snippets.append(f"Search result: {title}")
                 page_snippet = self._fetch_page_snippet(href)
@@ -426,9 +671,11 @@ class LLMClient:
         except Exception:
             return [], []
 
+    @traced('page_snippet')
     def _fetch_page_snippet(self, url: str) -> str:
+        current_span().set(**{'http.host': urlparse(url).netloc.lower()})
         try:
-            with httpx.Client(timeout=8.0, follow_redirects=True) as client:
+            with http_client(timeout=8.0, follow_redirects=True) as client:
                 res = client.get(
                     url,
                     headers={
@@ -438,31 +685,24 @@ class LLMClient:
                         )
                     },
                 )
+            current_span().set(**{'http.status_code': res.status_code, 'http.response_bytes': len(res.content)})
             if res.status_code >= 400:
                 return ""
-            soup = BeautifulSoup(res.text or "", "html.parser")
-            parts: list[str] = []
-            h1 = soup.find("h1")
-            if h1:
-                parts.append(h1.get_text(" ", strip=True))
-            for p in soup.find_all(["p", "li"]):
-                t = p.get_text(" ", strip=True)
-                if len(t) < 30:
-                    continue
-                parts.append(t)
-                if len(" ".join(parts)) > 700:
-                    break
-            return " ".join(parts)[:800]
+            return self.cpu_pool.run('parse_page_snippet', parse_page_snippet, res.content, res.encoding)
         except Exception:
             return ""
 
+    @traced('ddg_api')
     def _fetch_duckduckgo_context(self, query: str) -> tuple[list[str], list[str]]:
+        current_span().set(query=query)
         try:
-            with httpx.Client(timeout=10.0) as client:
-                res = client.get(
-                    'https://api.duckduckgo.com/',
-                    params={'q': query, 'format': 'json', 'no_html': '1', 'skip_disambig': '1'},
-                )
+            res = self._guarded_request(
+                'ddg_api',
+                'GET',
+                settings.ddg_api_url,
+                timeout=10.0,
+                params={'q': query, 'format': 'json', 'no_html': '1', 'skip_disambig': '1'},
+            )
             if res.status_code >= 400:
                 return [], []
             data = res.json()
@@ -496,19 +736,23 @@ class LLMClient:
         except Exception:
             return [], []
 
+    @traced('wikipedia')
     def _fetch_wikipedia_context(self, query: str) -> tuple[list[str], list[str]]:
+        current_span().set(query=query)
         try:
-            with httpx.Client(timeout=10.0) as client:
-                search = client.get(
-                    'https://ja.wikipedia.org/w/api.php',
-                    params={
-                        'action': 'query',
-                        'list': 'search',
-                        'srsearch': query,
-                        'format': 'json',
-                        'srlimit': 2,
-                    },
-                )
+            search = self._guarded_request(
+                'wikipedia',
+                'GET',
+                f"{settings.wikipedia_base_url.rstrip('/')}/w/api.php",
+                timeout=10.0,
+                params={
+                    'action': 'query',
+                    'list': 'search',
+                    'srsearch': query,
+                    'format': 'json',
+                    'srlimit': 2,
+                },
+            )
             if search.status_code >= 400:
                 return [], []
             data = search.json()
@@ -517,10 +761,12 @@ class LLMClient:
             links: list[str] = []
             for t in titles:
                 try:
-                    with httpx.Client(timeout=10.0) as client:
-                        s = client.get(
-                            f'https://ja.wikipedia.org/api/rest_v1/page/summary/{quote(str(t))}'
-                        )
+                    s = self._guarded_request(
+                        'wikipedia',
+                        'GET',
+                        f"{settings.wikipedia_base_url.rstrip('/')}/api/rest_v1/page/summary/{quote(str(t))}",
+                        timeout=10.0,
+                    )
                     if s.status_code >= 400:
                         continue
                     js = s.json()
@@ -554,27 +800,6 @@ class LLMClient:
         except Exception:
             return None
 
-    def _to_str_list(self, v: Any) -> list[str]:
-        if not isinstance(v, list):
-            return []
-        out: list[str] = []
-        for x in v:
-            s = str(x).strip()
-            if s:
-                out.append(s)
-        return out
-
-    def _to_str_dict(self, v: Any) -> dict[str, str]:
-        if not isinstance(v, dict):
-            return {}
-        out: dict[str, str] = {}
-        for k, val in v.items():
-            ks = str(k).strip()
-            vs = str(val).strip()
-            if ks and vs:
-                out[ks] = vs
-        return out
-
     def _build_facts_blob(
         self,
         *,
@@ -595,153 +820,6 @@ class LLMClient:
             parts.append("[raw_text_snippet] " + raw_text_snippet[:2500])
         return "\n".join(parts)
 
-    def _quality_postprocess(self, out: dict[str, Any], facts_blob: str) -> dict[str, Any]:
-        text_fields = [
-            "summary_ko",
-            "product_judgement_ko",
-            "translated_source_description_ko",
-            "translated_raw_text_snippet_ko",
-        ]
-        for f in text_fields:
-            out[f] = self._clean_text(str(out.get(f, "")))
-
-        for f in ["selling_points_ko", "detail_outline_ko", "detail_sections_ko", "translated_key_features_ko"]:
-            out[f] = [self._clean_text(x) for x in self._to_str_list(out.get(f))]
-            out[f] = [x for x in out[f] if x]
-        out["detail_sections_ko"] = [x for x in out.get("detail_sections_ko", []) if len(x) >= 18][:12]
-        out["selling_points_ko"] = [x for x in out.get("selling_points_ko", []) if len(x) >= 6][:10]
-
-        # 근거에 없는 평점/배송품질/연령문구 제거
-        allow_rating = any(k in facts_blob.lower() for k in ["rating", "review", "별점", "평점"])
-        if not allow_rating:
-            block_words = ["평점", "별점", "배송", "만족도", "연령", "세 이상"]
-            for f in text_fields:
-                if any(w in out[f] for w in block_words):
-                    out[f] = self._remove_sentences_with_words(out[f], block_words)
-            for f in ["selling_points_ko", "detail_sections_ko", "translated_key_features_ko"]:
-                out[f] = [x for x in out[f] if not any(w in x for w in block_words)]
-
-        # 한글화 실패 시 원문 혼입 방지.
-        for f in ["summary_ko", "product_judgement_ko", "translated_source_description_ko"]:
-            if out.get(f) and not self._contains_korean(str(out.get(f))):
-                out[f] = ""
-
-        return out
-
-    def _clean_text(self, s: str) -> str:
-        t = s.replace("|", " ").replace("  ", " ").strip()
-        t = re.sub(r"\s+\.", ".", t)
-        t = re.sub(r"\s+", " ", t).strip()
-        return t
-
-    def _remove_sentences_with_words(self, text: str, words: list[str]) -> str:
-        chunks = re.split(r"(?<=[.!?])\s+", text)
-        kept = [c for c in chunks if not any(w in c for w in words)]
-        return " ".join(kept).strip()
-
-    def _contains_korean(self, text: str) -> bool:
-        return bool(re.search(r"[가-힣]", text or ""))
-
-    def _extract_jsonld_product(self, html: str) -> Optional[dict[str, Any]]:
-        pattern = re.compile(
-            r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
-            re.IGNORECASE | re.DOTALL,
-        )
-        for m in pattern.finditer(html):
-            raw = m.group(1).strip()
-            if not raw:
-                continue
-            parsed = self._try_json_load(raw)
-            if parsed is None:
-                continue
-            product = self._find_product_node(parsed)
-            if not product:
-                continue
-            price = None
-            offers = product.get('offers')
-            if isinstance(offers, list) and offers:
-                price = offers[0].get('price') or offers[0].get('lowPrice')
-            elif isinstance(offers, dict):
-                price = offers.get('price') or offers.get('lowPrice')
-            images = product.get('image')
-            if isinstance(images, str):
-                images = [images]
-            if not isinstance(images, list):
-                images = []
-            return {'name': product.get('name'), 'price': price, 'images': images}
-        return None
-
-    def _find_product_node(self, obj: Any) -> Optional[dict[str, Any]]:
-        if isinstance(obj, list):
-            for item in obj:
-                found = self._find_product_node(item)
-                if found:
-                    return found
-            return None
-        if not isinstance(obj, dict):
-            return None
-
-        t = obj.get('@type')
-        if t == 'Product' or (isinstance(t, list) and 'Product' in t):
-            return obj
-        if '@graph' in obj:
-            return self._find_product_node(obj.get('@graph'))
-        for _, v in obj.items():
-            found = self._find_product_node(v)
-            if found:
-                return found
-        return None
-
-    def _find_meta(self, html: str, prop: str) -> Optional[str]:
-        p = re.compile(
-            rf'<meta[^>]+(?:property|name)=["\']{re.escape(prop)}["\'][^>]+content=["\'](.*?)["\']',
-            re.IGNORECASE | re.DOTALL,
-        )
-        m = p.search(html)
-        if not m:
-            return None
-        return unescape(m.group(1)).strip()
-
-    def _find_title_tag(self, html: str) -> Optional[str]:
-        m = re.search(r'<title[^>]*>(.*?)</title>', html, re.IGNORECASE | re.DOTALL)
-        if not m:
-            return None
-        return unescape(re.sub(r'\s+', ' ', m.group(1))).strip()
-
-    def _try_json_load(self, raw: str) -> Optional[Any]:
-        try:
-            return json.loads(raw)
-        except Exception:
-            try:
-                fixed = raw.replace('\n', ' ').replace('\t', ' ')
-                return json.loads(fixed)
-            except Exception:
-                return None
-
-    def _to_int_price(self, value: Any) -> Optional[int]:
-        if value is None:
-            return None
-        text = re.sub(r'[^\d.]', '', str(value))
-        if not text:
-            return None
-        try:
-            return int(float(text))
-        except Exception:
-            return None
-
-    def _abs_url(self, source_url: str, u: str) -> str:
-        return urljoin(source_url, u.strip())
-
-    def _unique_keep_order(self, arr: list[str]) -> list[str]:
-        seen = set()
-        out = []
-        for x in arr:
-            if x in seen:
-                continue
-            seen.add(x)
-            out.append(x)
-        return out
-
     def _fallback_title(self, site: str) -> str:
         fallback_titles = {
             'amazon_jp': 'Amazon JP 샘플 상품',
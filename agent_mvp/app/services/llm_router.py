@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any
+from typing import Optional
+
+from app.config import settings
+
+TIER_HEURISTIC = 'heuristic'
+TIER_SMALL = 'small'
+TIER_FULL = 'full'
+TIERS = (TIER_HEURISTIC, TIER_SMALL, TIER_FULL)
+
+# 구조화된 상품 페이지(JSON-LD/스펙표)가 보통 잘 나오는 몰
+STRUCTURED_SITES = {'amazon_jp', 'rakuten', 'yahoo_jp'}
+
+
+@dataclass
+class TierAttempt:
+    tier: str
+    model: str
+    latency_ms: float
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+    accepted: bool = True
+    reason: str = ''
+    translation_memory: Optional[dict[str, Any]] = None
+
+    def as_dict(self) -> dict[str, Any]:
+        out = {
+            'tier': self.tier,
+            'model': self.model,
+            'latency_ms': round(self.latency_ms, 1),
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'cost_usd': round(self.cost_usd, 6),
+            'accepted': self.accepted,
+            'reason': self.reason,
+        }
+        if self.translation_memory is not None:
+            out['translation_memory'] = self.translation_memory
+        return out
+
+
+def extraction_completeness(source: dict[str, Any]) -> float:
+    """0~1. 설명/특징/스펙/원문이 얼마나 채워졌는지(많을수록 작은 모델로도 충분)."""
+    score = 0.0
+    if len(source.get('source_description') or '') >= 40:
+        score += 0.25
+    score += min(len(source.get('key_features') or []), 5) / 5 * 0.25
+    score += min(len(source.get('specs') or {}), 5) / 5 * 0.25
+    score += min(len(source.get('raw_text_snippet') or ''), 800) / 800 * 0.25
+    return round(score, 3)
+
+
+class LLMRouter:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats = {t: self._empty_stats() for t in TIERS}
+
+    def choose_tier(
+        self,
+        *,
+        price_jpy: int,
+        margin_rate: Optional[float],
+        source_site: str,
+        completeness: float,
+    ) -> tuple[str, str]:
+        if not settings.llm_enabled or not settings.openai_api_key:
+            return TIER_HEURISTIC, 'LLM 비활성'
+        if price_jpy < settings.llm_heuristic_max_price_jpy:
+            return TIER_HEURISTIC, f'저가 상품(¥{price_jpy})'
+        if price_jpy >= settings.llm_full_min_price_jpy:
+            return TIER_FULL, f'고가 상품(¥{price_jpy})'
+        if margin_rate is not None and margin_rate >= settings.llm_full_min_margin_rate:
+            return TIER_FULL, f'고마진 상품({margin_rate:.2f})'
+        min_completeness = settings.llm_full_below_completeness
+        if source_site not in STRUCTURED_SITES:
+            min_completeness += 0.2
+        if completeness < min_completeness:
+            return TIER_FULL, f'추출 정보 부족({completeness:.2f})'
+        return TIER_SMALL, '기본'
+
+    def model_for(self, tier: str) -> str:
+        if tier == TIER_SMALL:
+            return settings.openai_small_model
+        if tier == TIER_FULL:
+            return settings.openai_model
+        return TIER_HEURISTIC
+
+    def next_tier(self, tier: str) -> Optional[str]:
+        # 휴리스틱은 일부러 고른 저비용 경로라 승급하지 않는다.
+        return TIER_FULL if tier == TIER_SMALL else None
+
+    def quality_failures(self, pack: dict[str, Any]) -> list[str]:
+        failures: list[str] = []
+        if not re.search(r'[가-힣]', str(pack.get('summary_ko') or '')):
+            failures.append('summary_ko 한국어 없음')
+        if len(pack.get('detail_sections_ko') or []) < settings.llm_min_detail_sections:
+            failures.append('detail_sections_ko 부족')
+        return failures
+
+    def cost_usd(self, tier: str, prompt_tokens: int, completion_tokens: int) -> float:
+        if tier == TIER_SMALL:
+            in_rate, out_rate = settings.llm_small_input_cost_per_1m, settings.llm_small_output_cost_per_1m
+        elif tier == TIER_FULL:
+            in_rate, out_rate = settings.llm_full_input_cost_per_1m, settings.llm_full_output_cost_per_1m
+        else:
+            return 0.0
+        return (prompt_tokens * in_rate + completion_tokens * out_rate) / 1_000_000
+
+    def record(self, attempt: TierAttempt, *, escalated: bool) -> None:
+        with self._lock:
+            st = self._stats[attempt.tier]
+            st['calls'] += 1
+            st['escalated'] += int(escalated)
+            st['latency_ms_total'] += attempt.latency_ms
+            st['prompt_tokens'] += attempt.prompt_tokens
+            st['completion_tokens'] += attempt.completion_tokens
+            st['cost_usd'] += attempt.cost_usd
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            out = {}
+            for tier, st in self._stats.items():
+                calls = st['calls']
+                out[tier] = {
+                    'calls': calls,
+                    'escalated': st['escalated'],
+                    'avg_latency_ms': round(st['latency_ms_total'] / calls, 1) if calls else 0.0,
+                    'prompt_tokens': st['prompt_tokens'],
+                    'completion_tokens': st['completion_tokens'],
+                    'cost_usd': round(st['cost_usd'], 6),
+                }
+            return out
+
+    def _empty_stats(self) -> dict[str, Any]:
+        return {
+            'calls': 0,
+            'escalated': 0,
+            'latency_ms_total': 0.0,
+            'prompt_tokens': 0,
+            'completion_tokens': 0,
+            'cost_usd': 0.0,
+        }
@@ -4,11 +4,14 @@ import base64
 import time
 from typing import Any
 from typing import Optional
+from urllib.parse import urlparse
 
 import bcrypt
 import httpx
 
 from app.config import settings
+from app.services.http_cassette import http_client
+from app.services.tracing import current_span, traced
 
 
 class NaverAuthError(Exception):
@@ -24,10 +27,13 @@ class NaverClient:
         self._access_token: Optional[str] = None
         self._token_expire_at: float = 0
 
+    @traced('naver_token')
     def _get_bearer_token(self) -> str:
         now_ms = int(time.time() * 1000)
         if self._access_token and now_ms < self._token_expire_at - 60_000:
+            current_span().set(cache='hit')
             return self._access_token
+        current_span().set(cache='miss')
 
         client_id = settings.naver_client_id
         client_secret = settings.naver_client_secret
@@ -55,8 +61,9 @@ class NaverClient:
             data["account_id"] = settings.naver_account_id
 
         token_url = f"{settings.naver_api_base_url.rstrip('/')}/v1/oauth2/token"
-        with httpx.Client(timeout=20.0) as client:
+        with http_client(timeout=20.0) as client:
             res = client.post(token_url, data=data)
+        current_span().set(**{'http.host': urlparse(token_url).netloc, 'http.status_code': res.status_code})
 
         if res.status_code >= 400:
             raise NaverAuthError(f"토큰 발급 실패: {res.status_code} {res.text[:300]}")
@@ -72,20 +79,87 @@ class NaverClient:
         return token
 
     def create_product(self, product_payload: dict[str, Any]) -> dict[str, Any]:
-        token = self._get_bearer_token()
         url = f"{settings.naver_api_base_url.rstrip('/')}{settings.naver_product_create_path}"
-        headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+        res = self._send("POST", url, product_payload)
+
+        if res.status_code >= 400:
+            raise NaverApiError(f"상품등록 실패: {res.status_code} {res.text[:500]}")
+
+        return res.json() if res.text else {}
+
+    def update_sale_price(self, origin_product_no: str, sale_price_krw: int) -> dict[str, Any]:
+        return self.update_option_stock(origin_product_no, sale_price_krw=sale_price_krw)
+
+    def update_option_stock(
+        self,
+        origin_product_no: str,
+        *,
+        sale_price_krw: Optional[int] = None,
+        stock_quantity: Optional[int] = None,
+    ) -> dict[str, Any]:
+        """판매가/재고만 수정(원상품 전체를 다시 보내지 않음)."""
+        body: dict[str, Any] = {}
+        if sale_price_krw is not None:
+            body["productSalePrice"] = {"salePrice": int(sale_price_krw)}
+        if stock_quantity is not None:
+            body["stockQuantity"] = int(stock_quantity)
+        path = settings.naver_product_price_update_path.format(origin_product_no=origin_product_no)
+        url = f"{settings.naver_api_base_url.rstrip('/')}{path}"
+        res = self._send("PUT", url, body)
 
-        with httpx.Client(timeout=30.0) as client:
-            res = client.post(url, headers=headers, json=product_payload)
+        if res.status_code >= 400:
+            raise NaverApiError(f"가격/재고 수정 실패: {res.status_code} {res.text[:500]}")
+
+        return res.json() if res.text else {}
+
+    def update_product(self, origin_product_no: str, product_payload: dict[str, Any]) -> dict[str, Any]:
+        """원상품 전체 수정(등록 때와 같은 payload)."""
+        path = settings.naver_product_update_path.format(origin_product_no=origin_product_no)
+        url = f"{settings.naver_api_base_url.rstrip('/')}{path}"
+        res = self._send("PUT", url, product_payload)
+
+        if res.status_code >= 400:
+            raise NaverApiError(f"상품수정 실패: {res.status_code} {res.text[:500]}")
+
+        return res.json() if res.text else {}
+
+    def upload_images(self, images: list[tuple[str, bytes, str]]) -> list[str]:
+        """(파일명, 내용, content-type) 목록을 네이버 이미지 호스트에 올리고 같은 순서의 이미지 URL을 돌려준다."""
+        url = f"{settings.naver_api_base_url.rstrip('/')}{settings.naver_image_upload_path}"
+        res = self._send("POST", url, files=[("imageFiles", image) for image in images])
+
+        if res.status_code >= 400:
+            raise NaverApiError(f"이미지 업로드 실패: {res.status_code} {res.text[:500]}")
+
+        urls = [str((item or {}).get("url") or "") for item in (res.json().get("images") or [])]
+        if len(urls) != len(images) or not all(urls):
+            raise NaverApiError(f"이미지 업로드 응답 이상: {len(images)}장 요청, URL {len([u for u in urls if u])}개")
+        return urls
+
+    @traced('naver_api')
+    def _send(
+        self,
+        method: str,
+        url: str,
+        body: Optional[dict[str, Any]] = None,
+        *,
+        files: Optional[list[tuple[str, tuple[str, bytes, str]]]] = None,
+    ) -> httpx.Response:
+        parts = urlparse(url)
+        current_span().set(**{'http.method': method, 'http.host': parts.netloc, 'http.path': parts.path})
+        token = self._get_bearer_token()
+        headers = {"Authorization": f"Bearer {token}"}
+        if files is None:
+            headers["Content-Type"] = "application/json"
+
+        with http_client(timeout=30.0) as client:
+            res = client.request(method, url, headers=headers, json=body, files=files)
             if res.status_code == 401:
                 # 토큰 만료/인증 오류 시 1회 재시도
                 self._access_token = None
                 retry_token = self._get_bearer_token()
                 headers["Authorization"] = f"Bearer {retry_token}"
-                res = client.post(url, headers=headers, json=product_payload)
-
-        if res.status_code >= 400:
-            raise NaverApiError(f"상품등록 실패: {res.status_code} {res.text[:500]}")
-
-        return res.json() if res.text else {}
+                res = client.request(method, url, headers=headers, json=body, files=files)
+                current_span().set(retried_after_401=True)
+        current_span().set(**{'http.status_code': res.status_code, 'http.response_bytes': len(res.content)})
+        return res
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Iterable
+from typing import Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from app.config import settings
+from app.services.http_cassette import http_client
+from app.services.tracing import current_span, span, traced
+
+if TYPE_CHECKING:
+    from app.services.naver_client import NaverClient
+
+# 네이버 이미지 업로드 API는 요청당 최대 10장
+UPLOAD_BATCH = 10
+# (magic bytes, 확장자, content-type): 네이버가 받는 형식만
+_IMAGE_TYPES = (
+    (b'\xff\xd8\xff', 'jpg', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'png', 'image/png'),
+    (b'GIF87a', 'gif', 'image/gif'),
+    (b'GIF89a', 'gif', 'image/gif'),
+    (b'BM', 'bmp', 'image/bmp'),
+)
+_USER_AGENT = (
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
+    'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36'
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS source_images (
+    source_url TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    fetched_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS uploaded_images (
+    content_hash TEXT PRIMARY KEY,
+    naver_url TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    uploaded_at TEXT NOT NULL
+);
+"""
+
+
+class ImageDownloadError(Exception):
+    pass
+
+
+def _now(offset_s: float = 0.0) -> str:
+    return (datetime.now(timezone.utc) + timedelta(seconds=offset_s)).isoformat(timespec='seconds')
+
+
+def image_type(data: bytes) -> Optional[tuple[str, str]]:
+    for magic, ext, content_type in _IMAGE_TYPES:
+        if data.startswith(magic):
+            return ext, content_type
+    return None
+
+
+class NaverImageStore:
+    """원본 이미지 URL → 내용 해시(sha256) → 네이버 이미지 URL(SQLite). 같은 내용은 URL이 달라도 한 번만 올린다."""
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        path = db_path or settings.naver_image_cache_db_path
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+
+    def lookup_sources(
+        self, source_urls: list[str], max_age_s: Optional[float] = None
+    ) -> dict[str, tuple[str, Optional[str]]]:
+        """source_url → (content_hash, 업로드됐으면 naver_url). max_age_s(기본 NAVER_IMAGE_SOURCE_TTL_S)보다 오래된 매핑은 제외"""
+        if not source_urls:
+            return {}
+        max_age_s = settings.naver_image_source_ttl_s if max_age_s is None else max_age_s
+        marks = ','.join('?' * len(source_urls))
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT s.source_url, s.content_hash, u.naver_url FROM source_images s "
+                "LEFT JOIN uploaded_images u ON u.content_hash = s.content_hash "
+                f"WHERE s.source_url IN ({marks}) AND s.fetched_at >= ?",
+                [*source_urls, _now(-max_age_s)],
+            ).fetchall()
+        return {url: (content_hash, naver_url) for url, content_hash, naver_url in rows}
+
+    def lookup_hashes(self, hashes: Iterable[str]) -> dict[str, str]:
+        hashes = list(hashes)
+        if not hashes:
+            return {}
+        marks = ','.join('?' * len(hashes))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT content_hash, naver_url FROM uploaded_images WHERE content_hash IN ({marks})", hashes
+            ).fetchall()
+        return dict(rows)
+
+    def save_sources(self, pairs: Iterable[tuple[str, str]]) -> None:
+        now = _now()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO source_images (source_url, content_hash, fetched_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(source_url) DO UPDATE SET content_hash = excluded.content_hash, "
+                "fetched_at = excluded.fetched_at",
+                [(url, h, now) for url, h in pairs],
+            )
+
+    def save_uploads(self, rows: Iterable[tuple[str, str, int]]) -> None:
+        now = _now()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO uploaded_images (content_hash, naver_url, bytes, uploaded_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(h, naver_url, size, now) for h, naver_url, size in rows],
+            )
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            sources = self._conn.execute("SELECT COUNT(*) FROM source_images").fetchone()[0]
+            uploads = self._conn.execute("SELECT COUNT(*) FROM uploaded_images").fetchone()[0]
+        return {'source_urls': sources, 'uploaded_images': uploads}
+
+
+@dataclass
+class ImageUploadResult:
+    urls: dict[str, str] = field(default_factory=dict)
+    failed: dict[str, str] = field(default_factory=dict)
+    cache_hits: int = 0
+    downloaded: int = 0
+    deduplicated: int = 0
+    uploaded: int = 0
+
+    def report(self) -> dict[str, Any]:
+        return {
+            'requested': len(self.urls) + len(self.failed),
+            'cache_hits': self.cache_hits,
+            'downloaded': self.downloaded,
+            'deduplicated': self.deduplicated,
+            'uploaded': self.uploaded,
+            'failed': len(self.failed),
+        }
+
+
+class NaverImageUploader:
+    """원본 이미지를 동시에 내려받아 네이버 이미지 호스트에 올린다.
+
+    이미 올린 URL은 내려받지 않고, 내려받은 내용이 이미 올린 이미지와 같으면 올리지 않는다.
+    같은 내용을 여러 요청이 동시에 올리려 하면 먼저 시작한 요청의 업로드 결과를 같이 쓴다.
+    """
+
+    def __init__(self, client: NaverClient, store: Optional[NaverImageStore] = None) -> None:
+        self.client = client
+        self.store = store or NaverImageStore()
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.naver_image_download_concurrency, thread_name_prefix='image'
+        )
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future[str]] = {}
+        self._counters = dict.fromkeys(ImageUploadResult().report(), 0)
+
+    def upload(self, source_urls: list[str]) -> ImageUploadResult:
+        urls = list(dict.fromkeys(u.strip() for u in source_urls if u and u.strip()))
+        result = ImageUploadResult()
+        known = self.store.lookup_sources(urls)
+        for url, (_, naver_url) in known.items():
+            if naver_url:
+                result.urls[url] = naver_url
+                result.cache_hits += 1
+
+        hash_for: dict[str, str] = {}
+        blobs: dict[str, tuple[bytes, str, str]] = {}
+        to_download = [u for u in urls if u not in result.urls]
+        if to_download:
+            with http_client(timeout=settings.naver_image_download_timeout_s, follow_redirects=True) as http:
+                futures = {
+                    url: self._executor.submit(contextvars.copy_context().run, self._download, http, url)
+                    for url in to_download
+                }
+                for url, fut in futures.items():
+                    try:
+                        data = fut.result()
+                    except (httpx.HTTPError, ImageDownloadError) as e:
+                        result.failed[url] = f'다운로드 실패: {e}'
+                        continue
+                    kind = image_type(data)
+                    if kind is None:
+                        result.failed[url] = '지원하지 않는 이미지 형식(jpg/png/gif/bmp만 가능)'
+                        continue
+                    content_hash = hashlib.sha256(data).hexdigest()
+                    hash_for[url] = content_hash
+                    blobs.setdefault(content_hash, (data, *kind))
+                    result.downloaded += 1
+            self.store.save_sources(hash_for.items())
+
+        naver_by_hash = self._upload_new(blobs, result)
+        resolved = 0
+        for url, content_hash in hash_for.items():
+            if content_hash in naver_by_hash:
+                result.urls[url] = naver_by_hash[content_hash]
+                resolved += 1
+            else:
+                result.failed[url] = '업로드 실패'
+        # 내려받았지만 이미 올라가 있던(또는 이번 요청 안에서 같은 내용인) 이미지 수
+        result.deduplicated = max(resolved - result.uploaded, 0)
+        self._record(result)
+        return result
+
+    def _upload_new(self, blobs: dict[str, tuple[bytes, str, str]], result: ImageUploadResult) -> dict[str, str]:
+        """아직 안 올린 내용만 올린다. content_hash → naver_url"""
+        naver_by_hash = self.store.lookup_hashes(blobs)
+        waiting: dict[str, Future[str]] = {}
+        mine: list[str] = []
+        with self._lock:
+            for content_hash in blobs:
+                if content_hash in naver_by_hash:
+                    continue
+                fut = self._inflight.get(content_hash)
+                if fut is None:
+                    fut = self._inflight[content_hash] = Future()
+                    mine.append(content_hash)
+                waiting[content_hash] = fut
+        try:
+            # 조회와 선점 사이에 다른 요청이 올리기를 끝냈을 수 있다.
+            done = self.store.lookup_hashes(mine)
+            for content_hash, naver_url in done.items():
+                waiting[content_hash].set_result(naver_url)
+            pending = [h for h in mine if h not in done]
+            for start in range(0, len(pending), UPLOAD_BATCH):
+                chunk = pending[start : start + UPLOAD_BATCH]
+                try:
+                    with span('naver_image_upload', images=len(chunk)):
+                        naver_urls = self.client.upload_images(
+                            [(f'{h[:16]}.{blobs[h][1]}', blobs[h][0], blobs[h][2]) for h in chunk]
+                        )
+                except Exception as e:
+                    for h in chunk:
+                        waiting[h].set_exception(e)
+                    continue
+                self.store.save_uploads((h, u, len(blobs[h][0])) for h, u in zip(chunk, naver_urls))
+                result.uploaded += len(chunk)
+                for h, u in zip(chunk, naver_urls):
+                    waiting[h].set_result(u)
+        finally:
+            with self._lock:
+                for content_hash in mine:
+                    fut = self._inflight.pop(content_hash)
+                    if not fut.done():
+                        fut.set_exception(RuntimeError('업로드 중단'))
+        for content_hash, fut in waiting.items():
+            try:
+                naver_by_hash[content_hash] = fut.result(timeout=settings.naver_image_download_timeout_s * 4)
+            except Exception:
+                continue
+        return naver_by_hash
+
+    @traced('image_download')
+    def _download(self, http: httpx.Client, url: str) -> bytes:
+        current_span().set(**{'http.host': urlparse(url).netloc.lower()})
+        chunks: list[bytes] = []
+        size = 0
+        with http.stream('GET', url, headers={'User-Agent': _USER_AGENT}) as res:
+            current_span().set(**{'http.status_code': res.status_code})
+            if res.status_code >= 400:
+                raise ImageDownloadError(f'HTTP {res.status_code}')
+            for chunk in res.iter_bytes():
+                size += len(chunk)
+                if size > settings.naver_image_max_bytes:
+                    raise ImageDownloadError(f'{settings.naver_image_max_bytes // (1024 * 1024)}MB 초과')
+                chunks.append(chunk)
+        current_span().set(**{'http.response_bytes': size})
+        return b''.join(chunks)
+
+    def _record(self, result: ImageUploadResult) -> None:
+        with self._lock:
+            for key, value in result.report().items():
+                self._counters[key] += value
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        return {**counters, **self.store.counts()}
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from copy import deepcopy
 from typing import Any
+from typing import Iterable
 from typing import Optional
 
 from app.config import settings
+from app.services.category_resolver import CategoryMatch, NaverCategoryResolver
 
 NOTICE_KEYS = {
     "FASHION_ITEMS": "fashionItems",
@@ -12,8 +13,21 @@ NOTICE_KEYS = {
     "DIGITAL_CONTENTS": "digitalContents",
 }
 
+REP_IMAGE_URL_PATH = ("originProduct", "images", "0", "url")
+
 
 class NaverPayloadBuilder:
+    """템플릿은 고시 유형별로 시작 시 1회 생성하고 이후 수정하지 않는다.
+
+    build()가 돌려주는 payload는 override 경로의 dict만 새로 만들고 나머지 하위 dict는
+    템플릿과 공유하므로, 호출자는 결과를 직접 수정하지 말고 overrides로 넘겨야 한다.
+    """
+
+    def __init__(self) -> None:
+        self.category_resolver = NaverCategoryResolver.from_settings()
+        self._templates = {t: self._compile_template(t) for t in NOTICE_KEYS}
+        self._required_paths = {t: self._compile_required_paths(t) for t in NOTICE_KEYS}
+
     def build(
         self,
         *,
@@ -21,19 +35,38 @@ class NaverPayloadBuilder:
         sale_price_krw: int,
         overrides: Optional[dict[str, Any]] = None,
         template_hint: Optional[str] = None,
+        specs: Optional[dict[str, str]] = None,
     ) -> tuple[dict[str, Any], list[str], str]:
-        template_used = self._resolve_template_type(title=title, template_hint=template_hint)
-        payload = self._base_payload(
-            title=title,
-            sale_price_krw=sale_price_krw,
-            template_type=template_used,
+        category = self.category_resolver.resolve(title, specs)
+        template_used = self._resolve_template_type(
+            title=title, template_hint=template_hint, category=category
+        )
+        payload = self._deep_merge(
+            self._templates.get(template_used) or self._compile_template(template_used),
+            {
+                "originProduct": {
+                    "leafCategoryId": (
+                        category.leaf_category_id if category else settings.naver_default_leaf_category_id
+                    ),
+                    "name": title[:100],
+                    "salePrice": int(sale_price_krw),
+                }
+            },
         )
         if overrides:
             payload = self._deep_merge(payload, overrides)
         errors = self._validate_required(payload, template_used)
         return payload, errors, template_used
 
-    def _resolve_template_type(self, *, title: str, template_hint: Optional[str]) -> str:
+    def build_many(
+        self, items: Iterable[dict[str, Any]]
+    ) -> list[tuple[dict[str, Any], list[str], str]]:
+        # items: build()의 keyword 인자 dict 목록
+        return [self.build(**item) for item in items]
+
+    def _resolve_template_type(
+        self, *, title: str, template_hint: Optional[str], category: Optional[CategoryMatch] = None
+    ) -> str:
         if template_hint:
             hint = template_hint.strip().upper()
             if hint in NOTICE_KEYS:
@@ -45,6 +78,8 @@ class NaverPayloadBuilder:
             if fixed in NOTICE_KEYS:
                 return fixed
 
+        if category and category.notice_type in NOTICE_KEYS:
+            return category.notice_type
         return self._infer_template_type_by_title(title)
 
     def _infer_template_type_by_title(self, title: str) -> str:
@@ -61,7 +96,7 @@ class NaverPayloadBuilder:
             return "FASHION_ITEMS"
         return settings.naver_default_notice_type.strip().upper() or "FASHION_ITEMS"
 
-    def _base_payload(self, *, title: str, sale_price_krw: int, template_type: str) -> dict[str, Any]:
+    def _compile_template(self, template_type: str) -> dict[str, Any]:
         rep_image_url = settings.naver_default_representative_image_url or ""
         optional_urls = [
             u.strip()
@@ -79,10 +114,10 @@ class NaverPayloadBuilder:
             "originProduct": {
                 "statusType": "SALE",
                 "leafCategoryId": settings.naver_default_leaf_category_id,
-                "name": title[:100],
+                "name": "",
                 "detailContent": settings.naver_default_detail_content_html,
                 "images": images,
-                "salePrice": int(sale_price_krw),
+                "salePrice": 0,
                 "stockQuantity": 99,
                 "detailAttribute": {
                     "afterServiceInfo": {
@@ -150,7 +185,7 @@ class NaverPayloadBuilder:
             "afterServiceDirector": "상품 상세 참조",
         }
 
-    def _validate_required(self, payload: dict[str, Any], template_type: str) -> list[str]:
+    def _compile_required_paths(self, template_type: str) -> tuple[tuple[str, tuple[str, ...]], ...]:
         required_paths = [
             "originProduct.statusType",
             "originProduct.leafCategoryId",
@@ -166,10 +201,14 @@ class NaverPayloadBuilder:
             "smartstoreChannelProduct.channelProductDisplayStatusType",
             "smartstoreChannelProduct.naverShoppingRegistration",
         ]
+        return tuple((path, tuple(path.split("."))) for path in required_paths)
+
+    def _validate_required(self, payload: dict[str, Any], template_type: str) -> list[str]:
+        required_paths = self._required_paths.get(template_type) or self._compile_required_paths(template_type)
 
         errors: list[str] = []
-        for path in required_paths:
-            value = self._get_path(payload, path)
+        for path, parts in required_paths:
+            value = self._get_path(payload, parts)
             if value is None:
                 errors.append(f"필수값 누락: {path}")
                 continue
@@ -178,23 +217,25 @@ class NaverPayloadBuilder:
             if isinstance(value, list) and len(value) == 0:
                 errors.append(f"필수값 비어있음: {path}")
 
-        rep_url = self._get_path(payload, "originProduct.images.0.url")
+        rep_url = self._get_path(payload, REP_IMAGE_URL_PATH)
         if not rep_url:
             errors.append("필수값 누락: originProduct.images[0].url (대표이미지 URL)")
         return errors
 
     def _deep_merge(self, base: dict[str, Any], updates: dict[str, Any]) -> dict[str, Any]:
-        merged = deepcopy(base)
+        # copy-on-write: updates가 닿는 경로의 dict만 얕게 복사하고 나머지는 base와 공유
+        merged = dict(base)
         for key, value in updates.items():
-            if key in merged and isinstance(merged[key], dict) and isinstance(value, dict):
-                merged[key] = self._deep_merge(merged[key], value)
+            current = merged.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                merged[key] = self._deep_merge(current, value)
             else:
                 merged[key] = value
         return merged
 
-    def _get_path(self, payload: dict[str, Any], path: str) -> Any:
+    def _get_path(self, payload: dict[str, Any], parts: tuple[str, ...]) -> Any:
         current: Any = payload
-        for part in path.split("."):
+        for part in parts:
             if isinstance(current, list):
                 if not part.isdigit():
                     return None
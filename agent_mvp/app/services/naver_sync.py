@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Optional
+
+from app.config import settings
+from app.services.tracing import span
+from app.tools.base import MarketPublishResponse
+
+if TYPE_CHECKING:
+    from app.tools.naver_market import NaverMarketPublisher
+
+UPDATE_SKIP = 'skip'
+UPDATE_OPTION_STOCK = 'option_stock'
+UPDATE_FULL = 'full'
+# 이 경로만 바뀌었으면 option-stock(판매가/재고) 수정으로 충분하다.
+PRICE_PATH = 'originProduct.salePrice'
+STOCK_PATH = 'originProduct.stockQuantity'
+_NARROW_PATHS = {PRICE_PATH, STOCK_PATH}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sent_payloads (
+    market_product_id TEXT PRIMARY KEY,
+    source_url TEXT,
+    payload_json TEXT NOT NULL,
+    payload_hash TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+_MISSING = object()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def canonical_json(payload: dict[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+
+def _flatten(value: Any, prefix: str, out: dict[str, Any]) -> None:
+    # 목록(images 등)은 통째로 한 값으로 비교한다(부분 수정 API가 없음).
+    if isinstance(value, dict) and value:
+        for k, v in value.items():
+            _flatten(v, f'{prefix}.{k}' if prefix else str(k), out)
+    else:
+        out[prefix] = value
+
+
+def diff_paths(old: dict[str, Any], new: dict[str, Any]) -> list[str]:
+    """값이 다르거나 한쪽에만 있는 leaf 경로(점 구분)"""
+    a: dict[str, Any] = {}
+    b: dict[str, Any] = {}
+    _flatten(old, '', a)
+    _flatten(new, '', b)
+    return sorted(k for k in a.keys() | b.keys() if a.get(k, _MISSING) != b.get(k, _MISSING))
+
+
+@dataclass
+class UpdatePlan:
+    kind: str
+    changed_paths: list[str] = field(default_factory=list)
+    sale_price_krw: Optional[int] = None
+    stock_quantity: Optional[int] = None
+
+
+def plan_update(last: Optional[dict[str, Any]], new: dict[str, Any]) -> UpdatePlan:
+    """지난번 보낸 payload와 비교해 가장 좁은 수정 방법을 고른다. 비교 기준이 없으면 전체 수정."""
+    if last is None:
+        return UpdatePlan(UPDATE_FULL, ['*'])
+    changed = diff_paths(last, new)
+    if not changed:
+        return UpdatePlan(UPDATE_SKIP)
+    if set(changed) <= _NARROW_PATHS:
+        origin = new.get('originProduct') or {}
+        return UpdatePlan(
+            UPDATE_OPTION_STOCK,
+            changed,
+            sale_price_krw=origin.get('salePrice') if PRICE_PATH in changed else None,
+            stock_quantity=origin.get('stockQuantity') if STOCK_PATH in changed else None,
+        )
+    return UpdatePlan(UPDATE_FULL, changed)
+
+
+class SentPayloadStore:
+    """상품번호별 마지막으로 네이버에 반영된 payload(SQLite)"""
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        path = db_path or settings.naver_payload_db_path
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+
+    def get(self, market_product_id: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload_json FROM sent_payloads WHERE market_product_id = ?", (market_product_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, market_product_id: str, payload: dict[str, Any], source_url: Optional[str] = None) -> None:
+        body = canonical_json(payload)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sent_payloads (market_product_id, source_url, payload_json, payload_hash, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT(market_product_id) DO UPDATE SET "
+                "source_url = COALESCE(excluded.source_url, sent_payloads.source_url), "
+                "payload_json = excluded.payload_json, payload_hash = excluded.payload_hash, "
+                "updated_at = excluded.updated_at",
+                (market_product_id, source_url, body, hashlib.sha256(body.encode('utf-8')).hexdigest(), _now()),
+            )
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sent_payloads").fetchone()[0]
+
+
+@dataclass
+class SyncResult:
+    response: MarketPublishResponse
+    kind: str
+    changed_paths: list[str]
+    request_bytes: int
+    full_payload_bytes: int
+
+    def report(self) -> dict[str, Any]:
+        return {
+            'kind': self.kind,
+            'changed_paths': self.changed_paths[:20],
+            'request_bytes': self.request_bytes,
+            'full_payload_bytes': self.full_payload_bytes,
+        }
+
+
+class NaverProductSync:
+    """등록된 상품을 다시 보낼 때 지난번 payload와 비교해 필요한 만큼만 호출한다.
+
+    바뀐 게 없으면 호출하지 않고, 판매가/재고만 바뀌었으면 option-stock 수정, 그 밖의 변경은 원상품 전체 수정.
+    호출이 성공했을 때만 저장된 payload를 갱신한다(실패하면 다음 동기화 때 다시 같은 차이가 잡힌다).
+    """
+
+    def __init__(self, publisher: NaverMarketPublisher, store: Optional[SentPayloadStore] = None) -> None:
+        self.publisher = publisher
+        self.store = store or SentPayloadStore()
+        self._lock = threading.Lock()
+        self._counts = {
+            'created': 0,
+            UPDATE_SKIP: 0,
+            UPDATE_OPTION_STOCK: 0,
+            UPDATE_FULL: 0,
+            'failed': 0,
+            'request_bytes': 0,
+            'bytes_saved': 0,
+        }
+
+    def record_created(self, market_product_id: str, payload: dict[str, Any], source_url: Optional[str]) -> None:
+        self.store.save(market_product_id, payload, source_url)
+        full_bytes = len(canonical_json(payload).encode('utf-8'))
+        self._count('created', full_bytes, full_bytes)
+
+    def sync(self, market_product_id: str, payload: dict[str, Any], source_url: Optional[str] = None) -> SyncResult:
+        plan = plan_update(self.store.get(market_product_id), payload)
+        full_bytes = len(canonical_json(payload).encode('utf-8'))
+        with span('naver_sync', kind=plan.kind, changed=len(plan.changed_paths)):
+            if plan.kind == UPDATE_SKIP:
+                res = MarketPublishResponse(
+                    success=True, market_product_id=market_product_id, message='네이버 상품 변경 없음: 호출 생략'
+                )
+                request_bytes = 0
+            elif plan.kind == UPDATE_OPTION_STOCK:
+                res = self.publisher.update_option_stock(
+                    market_product_id, plan.sale_price_krw, plan.stock_quantity
+                )
+                # option-stock 요청 본문 크기(바뀐 필드만)
+                narrow = {'salePrice': plan.sale_price_krw, 'stockQuantity': plan.stock_quantity}
+                request_bytes = len(canonical_json({k: v for k, v in narrow.items() if v is not None}).encode('utf-8'))
+            else:
+                res = self.publisher.update_product(market_product_id, payload)
+                request_bytes = full_bytes
+        if res.success and plan.kind != UPDATE_SKIP:
+            self.store.save(market_product_id, payload, source_url)
+        self._count(plan.kind if res.success else 'failed', request_bytes, full_bytes)
+        return SyncResult(res, plan.kind, plan.changed_paths, request_bytes, full_bytes)
+
+    def update_price(self, market_product_id: str, sale_price_krw: int) -> MarketPublishResponse:
+        """재가격 계산용 판매가 수정. 지난번 보낸 판매가와 같으면 호출하지 않는다."""
+        last = self.store.get(market_product_id)
+        if last is None:
+            return self.publisher.update_price(market_product_id, sale_price_krw)
+        new = json.loads(canonical_json(last))
+        new.setdefault('originProduct', {})['salePrice'] = int(sale_price_krw)
+        return self.sync(market_product_id, new).response
+
+    def _count(self, kind: str, request_bytes: int, full_bytes: int) -> None:
+        with self._lock:
+            self._counts[kind] += 1
+            self._counts['request_bytes'] += request_bytes
+            if kind in (UPDATE_SKIP, UPDATE_OPTION_STOCK):
+                self._counts['bytes_saved'] += full_bytes - request_bytes
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        return {**counts, 'tracked_products': self.store.count()}
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import Any
+from typing import Iterable
+from typing import Optional
+
+from app.config import settings
+
+NUM_PERM = 96
+# 32 band x 3 row: 유사도 0.5면 98%, 0.35면 75%, 0.1이면 3%만 후보로 잡힌다.
+BANDS = 32
+ROWS_PER_BAND = NUM_PERM // BANDS
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20240611)
+# (a, b) 고정 시드: 저장된 서명과 새 서명을 비교하려면 프로세스가 바뀌어도 같아야 한다.
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+
+# 몰마다 제목에 붙이는 판촉 문구(상품 동일성과 무관)
+_PROMO = re.compile(
+    r'送料無料|ポイント\d*倍|ポイント|楽天|あす楽|即納|即日発送|公式|正規品|国内正規品|新品|限定|セール|クーポン|'
+    r'\d+%off|翌日配達|在庫あり|free shipping',
+    re.IGNORECASE,
+)
+_BRACKETS = re.compile(r'[【】\[\]（）()「」『』《》〈〉<>★☆◆◇■□●○※!！?？/／|｜,、。・:：;；~〜]+')
+_WORD = re.compile(r'[a-z0-9][a-z0-9\-\.]*')
+# 용량/크기 표기가 서로 다르면(480ml vs 360ml) 같은 시리즈의 다른 상품
+_MEASURE = re.compile(r'\d+(?:\.\d+)?(?:ml|l|g|kg|cm|mm|w|mah|インチ|枚|個|本|入)(?![a-z])')
+# 사이즈/색상이 서로 다르면 같은 상품의 다른 변형(보강 결과의 사이즈·색상 표기가 틀려진다)
+_SIZE = re.compile(
+    r'(?<![a-z0-9])(xxs|xs|s|m|l|xl|xxl|xxxl|[2-5]xl|free|フリー)(?=サイズ|\s|$|[^a-z0-9])'
+    r'|(\d+(?:\.\d+)?)(?=号|サイズ)'
+    r'|(深|浅|薄|厚)(?=型|め|底|タイプ)'
+    r'|(大|中|小)(?=サイズ|型)'
+)
+_COLOR = re.compile(
+    r'ブラック|ホワイト|オフホワイト|レッド|ブルー|ネイビー|グリーン|カーキ|イエロー|ピンク|グレー|グレイ|ベージュ|'
+    r'ブラウン|パープル|オレンジ|シルバー|ゴールド|アイボリー|ミント|ワイン|'
+    r'(?<![a-z])(?:black|white|red|blue|navy|green|khaki|yellow|pink|gr[ae]y|beige|brown|purple|orange|silver|gold)'
+    r'(?![a-z])'
+    r'|(?<![\u4e00-\u9fff])(?:黒|白|赤|青|緑|黄|茶|紫|灰|紺)(?:色)?(?![\u4e00-\u9fff])'
+)
+_COLOR_ALIASES = {
+    '黒': 'ブラック', 'black': 'ブラック', '白': 'ホワイト', 'white': 'ホワイト', '赤': 'レッド', 'red': 'レッド',
+    '青': 'ブルー', 'blue': 'ブルー', '紺': 'ネイビー', 'navy': 'ネイビー', '緑': 'グリーン', 'green': 'グリーン',
+    '黄': 'イエロー', 'yellow': 'イエロー', '茶': 'ブラウン', 'brown': 'ブラウン', '紫': 'パープル',
+    'purple': 'パープル', '灰': 'グレー', 'gray': 'グレー', 'grey': 'グレー', 'グレイ': 'グレー', 'pink': 'ピンク',
+    'beige': 'ベージュ', 'orange': 'オレンジ', 'silver': 'シルバー', 'gold': 'ゴールド', 'khaki': 'カーキ',
+}
+# 부속품/호환품 표기: 모델번호가 같아도 본체와는 다른 상품(替刃 ES-LV9A対応 ≠ シェーバー ES-LV9A)
+_ACCESSORY = re.compile(
+    r'(替刃|替え刃|交換刃|交換用|交換ブラシ|替えブラシ|リフィル|詰め?替え?用?|ケース|カバー|フィルム|スキン|ストラップ|'
+    r'フィルター|パッキン|部品|パーツ|アクセサリー)(?!付)'
+)
+_COMPATIBLE = re.compile(r'対応|専用|互換|(?<=[a-z0-9])\s*用(?![\u4e00-\u9fff])')
+_CJK_RUN = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7a3]+')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nd_products (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source_url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    model_numbers TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    enrichment TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS nd_bands (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    product_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_nd_bands_bucket ON nd_bands (band, bucket);
+CREATE INDEX IF NOT EXISTS idx_nd_bands_product ON nd_bands (product_id);
+"""
+
+
+def _hash64(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def normalize_title(title: str) -> str:
+    t = unicodedata.normalize('NFKC', title or '').lower()
+    t = _PROMO.sub(' ', t)
+    return _BRACKETS.sub(' ', t)
+
+
+def shingles(title: str, model_numbers: Iterable[str], specs: dict[str, str]) -> set[str]:
+    t = normalize_title(title)
+    out: set[str] = set()
+    for w in _WORD.findall(t):
+        if len(w) >= 2:
+            out.add(f'w:{w}')
+    for run in _CJK_RUN.findall(t):
+        if len(run) <= 2:
+            out.add(f'c:{run}')
+            continue
+        out.update(f'c:{run[i:i + 3]}' for i in range(len(run) - 2))
+    for kind, values in variant_attributes(title).items():
+        out.update(f'v:{kind}:{v}' for v in values)
+    for m in model_numbers:
+        out.add(f'm:{unicodedata.normalize("NFKC", m).upper()}')
+    for v in specs.values():
+        v = unicodedata.normalize('NFKC', str(v)).strip().lower()
+        if 0 < len(v) <= 40:
+            out.add(f's:{v}')
+    return out
+
+
+def measures(title: str) -> set[str]:
+    return set(_MEASURE.findall(normalize_title(title)))
+
+
+def variant_attributes(title: str) -> dict[str, set[str]]:
+    """제목의 사이즈(S/M/L, 号, 深型/浅型 등), 색상, 부속품 여부. 한 글자 사이즈(M/L)는 shingle에서 빠지므로 따로 본다."""
+    t = normalize_title(title)
+    sizes = {''.join(g for g in m.groups() if g) for m in _SIZE.finditer(t)}
+    colors = {m.group(0).removesuffix('色') for m in _COLOR.finditer(t)}
+    accessory = set(_ACCESSORY.findall(t))
+    if not accessory and _COMPATIBLE.search(t):
+        accessory = {'対応品'}
+    return {
+        'measure': measures(title),
+        'size': sizes,
+        'color': {_COLOR_ALIASES.get(c, c) for c in colors},
+        # 부속품 표기가 없으면 본체로 본다(한쪽만 부속품이어도 충돌).
+        'accessory': accessory or {'本体'},
+    }
+
+
+def variant_conflict(a: dict[str, set[str]], b: dict[str, set[str]]) -> Optional[str]:
+    """양쪽 다 있는 속성 중 값이 하나도 안 겹치는 것(다른 변형). 없으면 None"""
+    for kind, values in a.items():
+        other = b.get(kind) or set()
+        if values and other and not values & other:
+            return kind
+    return None
+
+
+def minhash(tokens: set[str]) -> array:
+    sig = [_MERSENNE_PRIME] * NUM_PERM
+    for tok in tokens:
+        x = _hash64(tok)
+        sig = list(map(min, sig, [(a * x + b) % _MERSENNE_PRIME for a, b in _PERMUTATIONS]))
+    return array('Q', sig)
+
+
+def band_buckets(sig: array) -> list[tuple[int, int]]:
+    out = []
+    for band in range(BANDS):
+        chunk = sig[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes()
+        out.append((band, int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), 'little', signed=True)))
+    return out
+
+
+def signature_from_bytes(blob: bytes) -> array:
+    sig = array('Q')
+    sig.frombytes(blob)
+    return sig
+
+
+def similarity(a: array, b: array) -> float:
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+@dataclass
+class NearDuplicateMatch:
+    source_url: str
+    title: str
+    similarity: float
+    model_match: bool
+    enrichment: dict[str, Any]
+
+
+class NearDuplicateIndex:
+    """다른 몰/URL의 같은 상품을 찾는 MinHash + LSH 색인(SQLite, band 버킷 테이블)."""
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        path = db_path or settings.near_duplicate_db_path
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._stats = {'lookups': 0, 'matches': 0, 'candidates': 0, 'lookup_ms_total': 0.0, 'stored': 0}
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+
+    def find(
+        self, source_url: str, title: str, model_numbers: list[str], specs: dict[str, str]
+    ) -> Optional[NearDuplicateMatch]:
+        started = time.perf_counter()
+        sig = minhash(shingles(title, model_numbers, specs))
+        models = {m.upper() for m in model_numbers}
+        title_variant = variant_attributes(title)
+        cap = settings.near_duplicate_bucket_cap
+        shared: dict[int, int] = {}
+        with self._lock:
+            for band, bucket in band_buckets(sig):
+                ids = self._conn.execute(
+                    "SELECT product_id FROM nd_bands WHERE band = ? AND bucket = ? LIMIT ?", (band, bucket, cap + 1)
+                ).fetchall()
+                # 너무 흔한 버킷(흔한 단어 조합)은 변별력이 없어 건너뛴다.
+                if len(ids) > cap:
+                    continue
+                for (pid,) in ids:
+                    shared[pid] = shared.get(pid, 0) + 1
+            ids = sorted(shared, key=shared.get, reverse=True)[: settings.near_duplicate_max_candidates]
+            products = (
+                self._conn.execute(
+                    f"SELECT id, source_url, title, model_numbers, signature, enrichment FROM nd_products "
+                    f"WHERE id IN ({', '.join('?' for _ in ids)})",
+                    ids,
+                ).fetchall()
+                if ids
+                else []
+            )
+
+        best: Optional[NearDuplicateMatch] = None
+        for p in products:
+            # 같은 URL 재실행은 최신 원문으로 다시 보강한다.
+            if p['source_url'] == source_url:
+                continue
+            stored_models = set(json.loads(p['model_numbers']))
+            if models and stored_models and not models & stored_models:
+                continue  # 모델번호가 서로 다르면 다른 상품(색상/용량 변형 등)
+            # 용량/사이즈/색상이 다르면 모델번호가 같아도 다른 변형(보강 결과를 재사용하면 표기가 틀린다)
+            if variant_conflict(title_variant, variant_attributes(p['title'])):
+                continue
+            model_match = bool(models & stored_models)
+            threshold = (
+                settings.near_duplicate_model_match_threshold if model_match else settings.near_duplicate_threshold
+            )
+            sim = similarity(sig, signature_from_bytes(p['signature']))
+            if sim >= threshold and (best is None or sim > best.similarity):
+                best = NearDuplicateMatch(
+                    source_url=p['source_url'],
+                    title=p['title'],
+                    similarity=round(sim, 3),
+                    model_match=model_match,
+                    enrichment=json.loads(p['enrichment']),
+                )
+
+        with self._lock:
+            self._stats['lookups'] += 1
+            self._stats['matches'] += int(best is not None)
+            self._stats['candidates'] += len(products)
+            self._stats['lookup_ms_total'] += (time.perf_counter() - started) * 1000
+        return best
+
+    def add(
+        self,
+        source_url: str,
+        title: str,
+        model_numbers: list[str],
+        specs: dict[str, str],
+        enrichment: dict[str, Any],
+    ) -> None:
+        sig = minhash(shingles(title, model_numbers, specs))
+        now = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        models = json.dumps(sorted({m.upper() for m in model_numbers}))
+        with self._lock, self._conn:
+            old = self._conn.execute("SELECT id FROM nd_products WHERE source_url = ?", (source_url,)).fetchone()
+            if old:
+                self._conn.execute("DELETE FROM nd_bands WHERE product_id = ?", (old['id'],))
+                self._conn.execute("DELETE FROM nd_products WHERE id = ?", (old['id'],))
+            cur = self._conn.execute(
+                "INSERT INTO nd_products (source_url, title, model_numbers, signature, enrichment, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (source_url, title, models, sig.tobytes(), json.dumps(enrichment, ensure_ascii=False), now),
+            )
+            self._conn.executemany(
+                "INSERT INTO nd_bands (band, bucket, product_id) VALUES (?, ?, ?)",
+                [(band, bucket, cur.lastrowid) for band, bucket in band_buckets(sig)],
+            )
+            self._stats['stored'] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM nd_products").fetchone()[0]
+            st = dict(self._stats)
+        lookups = st['lookups']
+        return {
+            'products': count,
+            'lookups': lookups,
+            'matches': st['matches'],
+            'match_rate': round(st['matches'] / lookups, 3) if lookups else 0.0,
+            'avg_candidates': round(st['candidates'] / lookups, 1) if lookups else 0.0,
+            'avg_lookup_ms': round(st['lookup_ms_total'] / lookups, 2) if lookups else 0.0,
+            'stored_this_process': st['stored'],
+        }
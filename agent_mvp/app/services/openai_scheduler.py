@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import random
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+from typing import Mapping
+from typing import Optional
+
+from app.config import settings
+
+# 메시지마다 role/구분자에 붙는 토큰(대략)
+_MESSAGE_OVERHEAD_TOKENS = 4
+_WINDOW_S = 60.0
+_DURATION_PART = re.compile(r'([\d.]+)(ms|s|m|h)')
+_DURATION_UNITS = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+
+
+class OpenAIQueueTimeout(RuntimeError):
+    pass
+
+
+def estimate_prompt_tokens(messages: list[dict[str, Any]]) -> int:
+    """tokenizer 없이 어림잡은 프롬프트 토큰 수: ASCII는 약 4자당 1토큰, 일본어/한국어 등은 약 1자당 1토큰."""
+    total = 0
+    for m in messages:
+        text = str(m.get('content') or '')
+        ascii_chars = len(text.encode('ascii', 'ignore'))
+        total += ascii_chars // 4 + (len(text) - ascii_chars) + _MESSAGE_OVERHEAD_TOKENS
+    return total
+
+
+def parse_reset_duration(value: str) -> Optional[float]:
+    """x-ratelimit-reset-* 헤더('1s', '6m0s', '250ms')를 초로."""
+    parts = _DURATION_PART.findall(value or '')
+    if not parts:
+        return None
+    return sum(float(n) * _DURATION_UNITS[unit] for n, unit in parts)
+
+
+def retry_after_s(headers: Mapping[str, str], attempt: int) -> float:
+    """429 응답의 retry-after-ms / retry-after를 따르고, 없으면 지수 backoff(jitter 포함)."""
+    for name, scale in (('retry-after-ms', 0.001), ('retry-after', 1.0)):
+        try:
+            return min(float(headers[name]) * scale, settings.openai_retry_max_s)
+        except (KeyError, ValueError):
+            continue
+    delay = min(settings.openai_retry_base_s * (2**attempt), settings.openai_retry_max_s)
+    return delay * random.uniform(0.5, 1.0)
+
+
+class _Bucket:
+    """분당 한도를 초당 rate로 채우는 token bucket. 실제 사용량 정산으로 음수(빚)가 될 수 있다."""
+
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(max(per_minute, 1))
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_s(self, amount: float) -> float:
+        # 한도보다 큰 요청은 bucket이 가득 찼을 때 보낸다.
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+
+@dataclass
+class Permit:
+    estimated_tokens: int
+    raw_prompt_estimate: int
+    wait_s: float
+    settled: bool = False
+
+
+class OpenAIRateScheduler:
+    """OpenAI 요청을 RPM/TPM 예산 안에서만 보낸다(프로세스 전역, 도착 순서대로).
+
+    예산이 모자라면 실패시키지 않고 기다리며, openai_queue_max_wait_s를 넘기면 OpenAIQueueTimeout.
+    응답의 x-ratelimit-remaining-* 헤더로 예산을 낮춰 맞추고(같은 키를 쓰는 다른 worker 몫 반영),
+    429를 받으면 모든 요청을 backoff 동안 멈춘다.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._requests = _Bucket(settings.openai_rpm_limit)
+        self._tokens = _Bucket(settings.openai_tpm_limit)
+        self._queue: deque[object] = deque()
+        self._paused_until = 0.0
+        # 추정치 보정: 실제 prompt_tokens / 어림값, 최근 completion_tokens 평균(EWMA)
+        self._prompt_ratio = 1.0
+        self._completion_estimate = float(settings.openai_completion_tokens_estimate)
+        self._used: deque[tuple[float, int]] = deque()
+        self._waits: deque[float] = deque(maxlen=200)
+        self._counts = {'admitted': 0, 'queue_timeouts': 0, 'rate_limited_429': 0, 'header_adjustments': 0}
+
+    def acquire(self, messages: list[dict[str, Any]]) -> Permit:
+        raw = estimate_prompt_tokens(messages)
+        ticket = object()
+        started = time.monotonic()
+        deadline = started + settings.openai_queue_max_wait_s
+        with self._cond:
+            estimated = int(raw * self._prompt_ratio + self._completion_estimate)
+            self._queue.append(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._requests.refill(now)
+                    self._tokens.refill(now)
+                    if self._queue[0] is ticket:
+                        wait = max(
+                            self._paused_until - now, self._requests.wait_s(1), self._tokens.wait_s(estimated)
+                        )
+                        if wait <= 0:
+                            break
+                    else:
+                        wait = deadline - now  # 앞 요청이 나가면 notify로 깨어남
+                    if now >= deadline:
+                        self._counts['queue_timeouts'] += 1
+                        raise OpenAIQueueTimeout(
+                            f'OpenAI RPM/TPM 예산 대기 {settings.openai_queue_max_wait_s:.0f}s 초과(추정 {estimated} tokens)'
+                        )
+                    self._cond.wait(min(wait, deadline - now))
+                self._requests.level -= 1
+                self._tokens.level -= estimated
+                self._counts['admitted'] += 1
+                waited = now - started
+                self._waits.append(waited)
+            finally:
+                self._queue.remove(ticket)
+                self._cond.notify_all()
+        return Permit(estimated_tokens=estimated, raw_prompt_estimate=raw, wait_s=waited)
+
+    def settle(self, permit: Permit, prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+        """실제 사용량으로 예산을 정산한다. 사용량을 모르면(오류 응답) 추정치를 그대로 쓴 것으로 둔다."""
+        if permit.settled:
+            return
+        permit.settled = True
+        now = time.monotonic()
+        with self._cond:
+            if prompt_tokens is None or completion_tokens is None:
+                self._record_used(now, permit.estimated_tokens)
+                return
+            actual = prompt_tokens + completion_tokens
+            self._tokens.level -= actual - permit.estimated_tokens
+            self._record_used(now, actual)
+            if permit.raw_prompt_estimate > 0 and prompt_tokens > 0:
+                ratio = min(max(prompt_tokens / permit.raw_prompt_estimate, 0.3), 3.0)
+                self._prompt_ratio = 0.8 * self._prompt_ratio + 0.2 * ratio
+            self._completion_estimate = 0.8 * self._completion_estimate + 0.2 * completion_tokens
+            self._cond.notify_all()
+
+    def rate_limited(self, permit: Permit, delay_s: float) -> None:
+        """429: 이 요청 몫은 돌려주고(소비되지 않음) 모든 요청을 delay_s 동안 멈춘다."""
+        permit.settled = True
+        with self._cond:
+            self._counts['rate_limited_429'] += 1
+            self._requests.level += 1
+            self._tokens.level += permit.estimated_tokens
+            self._paused_until = max(self._paused_until, time.monotonic() + delay_s)
+            self._cond.notify_all()
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        """x-ratelimit-remaining-requests/tokens가 로컬 예산보다 적으면 그만큼으로 낮춘다."""
+        with self._cond:
+            for bucket, name in ((self._requests, 'requests'), (self._tokens, 'tokens')):
+                try:
+                    remaining = float(headers[f'x-ratelimit-remaining-{name}'])
+                except (KeyError, ValueError):
+                    continue
+                bucket.refill(time.monotonic())
+                if remaining < bucket.level:
+                    bucket.level = remaining
+                    self._counts['header_adjustments'] += 1
+                    if remaining < 1:
+                        reset = parse_reset_duration(headers.get(f'x-ratelimit-reset-{name}', ''))
+                        if reset:
+                            self._paused_until = max(self._paused_until, time.monotonic() + reset)
+
+    def snapshot(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._cond:
+            self._requests.refill(now)
+            self._tokens.refill(now)
+            self._trim_used(now)
+            waits = sorted(self._waits)
+            used_tokens = sum(n for _, n in self._used)
+            return {
+                'rpm_limit': settings.openai_rpm_limit,
+                'tpm_limit': settings.openai_tpm_limit,
+                'queued': len(self._queue),
+                'paused_s': round(max(self._paused_until - now, 0.0), 2),
+                'requests_available': round(self._requests.level, 1),
+                'tokens_available': round(self._tokens.level),
+                # 최근 60초 실제 사용량 / 분당 한도
+                'rpm_utilisation': round(len(self._used) / self._requests.capacity, 3),
+                'tpm_utilisation': round(used_tokens / self._tokens.capacity, 3),
+                'queue_wait_p50_ms': round(waits[len(waits) // 2] * 1000, 1) if waits else None,
+                'queue_wait_p95_ms': round(waits[int(0.95 * (len(waits) - 1))] * 1000, 1) if waits else None,
+                'queue_wait_max_ms': round(waits[-1] * 1000, 1) if waits else None,
+                'prompt_estimate_ratio': round(self._prompt_ratio, 3),
+                'completion_tokens_estimate': round(self._completion_estimate),
+                **self._counts,
+            }
+
+    def _record_used(self, now: float, tokens: int) -> None:
+        self._used.append((now, tokens))
+        self._trim_used(now)
+
+    def _trim_used(self, now: float) -> None:
+        while self._used and now - self._used[0][0] > _WINDOW_S:
+            self._used.popleft()
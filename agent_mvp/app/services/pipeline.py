@@ -1,33 +1,202 @@
 from __future__ import annotations
 
+import threading
+import time
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Iterator
 from typing import Optional
+from typing import TextIO
 
 from app.config import settings
 from app.policies import evaluate_policy
 from app.schemas import (
+    NaverBuildPayloadBatchResponse,
+    NaverBuildPayloadRequest,
     NaverBuildPayloadResponse,
     PolicyResult,
+    CatalogRepriceResponse,
+    DriftApplyResponse,
+    DriftEvent,
     PricingResult,
+    PricingScenarioInput,
+    PricingScenarioResult,
+    PricingSimulateRequest,
+    PricingSimulateResponse,
     ProductExtraction,
     PublishResult,
     RunLinkBatchResponse,
     RunLinkResponse,
+    TranslationMemoryEntry,
+    TranslationMemoryUpsertResponse,
 )
-from app.services.llm_client import LLMClient
-from app.services.naver_payload_builder import NaverPayloadBuilder
-from app.tools.base import MarketPublishPayload
-from app.tools.naver_market import NaverMarketPublisher
+from app.services.bulk_io import stream_bulk_results
+from app.services.catalog_store import CatalogItem, CatalogStore
+from app.services.single_flight import SingleFlight, normalize_source_url
+from app.services.tracing import current_trace_id, span, tracer
+from app.tools.base import MarketPublishPayload, MarketPublishResponse
+
+if TYPE_CHECKING:
+    from app.services.llm_client import LLMClient
+    from app.services.naver_images import NaverImageUploader
+    from app.services.naver_payload_builder import NaverPayloadBuilder
+    from app.services.naver_sync import NaverProductSync
+    from app.services.pricing_engine import PricingEngine
+    from app.services.recrawl import RecrawlScheduler
+    from app.services.repricing import CatalogRepricer
+    from app.tools.naver_market import NaverMarketPublisher
+
+
+class _lazy_component:
+    """첫 접근 때 한 번만 만들어 인스턴스에 저장한다. 무거운 import(httpx/bs4/numpy/bcrypt)도 그때 한다."""
+
+    def __init__(self, factory: Callable[[Any], Any]) -> None:
+        self.factory = factory
+        self.name = factory.__name__
+
+    def __get__(self, obj: Any, owner: Any = None) -> Any:
+        if obj is None:
+            return self
+        with obj._init_lock:
+            if self.name not in obj.__dict__:
+                obj.__dict__[self.name] = self.factory(obj)
+        return obj.__dict__[self.name]
 
 
 class LinkPipelineService:
+    # 콜드스타트 때는 아무 것도 만들지 않고, 각 컴포넌트는 처음 쓰일 때 만든다(warm_up으로 미리 가능).
+    COMPONENTS = (
+        'llm',
+        'publisher',
+        'payload_builder',
+        'pricing',
+        'catalog',
+        'repricer',
+        'image_uploader',
+        'product_sync',
+        'recrawler',
+    )
+
     def __init__(self) -> None:
-        self.llm = LLMClient()
-        self.publisher = NaverMarketPublisher()
-        self.payload_builder = NaverPayloadBuilder()
+        self._init_lock = threading.RLock()
+        self.single_flight = SingleFlight()
+
+    @_lazy_component
+    def llm(self) -> LLMClient:
+        from app.services.llm_client import LLMClient
+
+        return LLMClient()
+
+    @_lazy_component
+    def publisher(self) -> NaverMarketPublisher:
+        from app.tools.naver_market import NaverMarketPublisher
+
+        return NaverMarketPublisher()
+
+    @_lazy_component
+    def payload_builder(self) -> NaverPayloadBuilder:
+        from app.services.naver_payload_builder import NaverPayloadBuilder
+
+        return NaverPayloadBuilder()
+
+    @_lazy_component
+    def pricing(self) -> PricingEngine:
+        from app.services.pricing_engine import PricingEngine
+
+        return PricingEngine()
+
+    @_lazy_component
+    def catalog(self) -> CatalogStore:
+        return CatalogStore()
+
+    @_lazy_component
+    def repricer(self) -> CatalogRepricer:
+        from app.services.repricing import CatalogRepricer
+
+        return CatalogRepricer(self.catalog, self.pricing, self.product_sync)
+
+    @_lazy_component
+    def image_uploader(self) -> NaverImageUploader:
+        from app.services.naver_images import NaverImageUploader
+
+        return NaverImageUploader(self.publisher.client)
+
+    @_lazy_component
+    def product_sync(self) -> NaverProductSync:
+        from app.services.naver_sync import NaverProductSync
+
+        return NaverProductSync(self.publisher)
+
+    @_lazy_component
+    def recrawler(self) -> RecrawlScheduler:
+        from app.services.recrawl import RecrawlScheduler
+
+        # 재수집 상태는 catalog_items와 JOIN하므로 새 DB에서도 카탈로그 테이블을 먼저 만든다.
+        self.catalog
+        return RecrawlScheduler(self.llm)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self.__dict__
 
-    def run(self, source_url: str, auto_publish: Optional[bool] = None) -> RunLinkResponse:
-        extracted = self.llm.extract_product_from_link(source_url)
+    def warm_up(self) -> dict[str, float]:
+        """모든 컴포넌트를 미리 만들고 파서(bs4)까지 로드한다. 컴포넌트별 소요 ms를 돌려준다."""
+        timings: dict[str, float] = {}
+        for name in self.COMPONENTS:
+            t0 = time.perf_counter()
+            getattr(self, name)
+            timings[name] = round((time.perf_counter() - t0) * 1000, 1)
+        t0 = time.perf_counter()
+        from app.services import html_parsing
+
+        html_parsing.parse_page_snippet(b'<h1>warm up</h1>')
+        timings['html_parsing'] = round((time.perf_counter() - t0) * 1000, 1)
+        return timings
+
+    def run(
+        self,
+        source_url: str,
+        auto_publish: Optional[bool] = None,
+        force_enrich: Optional[bool] = None,
+    ) -> RunLinkResponse:
         should_auto_publish = settings.auto_publish_on_run_link if auto_publish is None else auto_publish
+        # 같은 링크(추적 파라미터 제외)가 처리 중이면 새로 돌리지 않고 그 결과를 같이 받는다.
+        key = self._flight_key(source_url, should_auto_publish, force_enrich)
+        # 링크 1건 = trace 1개(배치 안의 링크도 각자 trace)
+        with span('run_link', root=True, source_url=source_url, auto_publish=should_auto_publish) as root:
+            result = self.single_flight.do(
+                key, lambda: self._run_once(source_url, should_auto_publish, force_enrich)
+            )
+            leader_trace_id = result.debug.get('trace_id')
+            if root.trace_id and leader_trace_id != root.trace_id:
+                root.set(cache='single_flight_shared', leader_trace_id=leader_trace_id)
+        return result
+
+    def _run_once(self, source_url: str, should_auto_publish: bool, force_enrich: Optional[bool]) -> RunLinkResponse:
+        # 싼 검사(원문 제목 정책 + JPY 원가 마진)를 먼저 하고, 확실히 반려될 상품은
+        # 웹 컨텍스트/LLM 보강을 건너뛴다. force_enrich=true면 검수용으로 끝까지 보강한다.
+        with span('fetch_source') as s:
+            source = self.llm.fetch_source_product(source_url)
+            s.set(fetched=source['fetched'], site=source['source_site'])
+        with span('precheck') as s:
+            category = self.payload_builder.category_resolver.resolve(source['title'], source['specs'])
+            category_name = category.whole_name if category else None
+            from app.services.pricing_engine import parse_weight_g
+
+            weight_g = parse_weight_g(source['specs'])
+            pricing = self._calculate_price(source['source_price_jpy'], category=category_name, weight_g=weight_g)
+            precheck = evaluate_policy(source['title'])
+            precheck_status = self._decide_approval(precheck.blocked, pricing.estimated_margin_rate)
+            s.set(category=category_name, status=precheck_status, margin_rate=pricing.estimated_margin_rate)
+
+        skip_enrichment = (
+            precheck_status == 'rejected' and settings.precheck_skip_enrichment and not force_enrich
+        )
+        if skip_enrichment:
+            extracted = self.llm.skip_enrichment(source)
+        else:
+            with span('enrich'):
+                extracted = self.llm.enrich_product(source, margin_rate=pricing.estimated_margin_rate)
 
         extraction = ProductExtraction(
             source_site=extracted['source_site'],
@@ -47,8 +216,8 @@ class LinkPipelineService:
             llm_detail_sections_ko=extracted.get('llm_detail_sections_ko', []),
         )
 
-        pricing = self._calculate_price(extraction.source_price_jpy)
-        policy_decision = evaluate_policy(extraction.title)
+        # 보강 후 한국어 제목도 다시 검사(원문 제목과 함께)
+        policy_decision = evaluate_policy(f"{source['title']} {extraction.title}")
         policy = PolicyResult(
             risk=policy_decision.risk,
             blocked=policy_decision.blocked,
@@ -56,6 +225,19 @@ class LinkPipelineService:
         )
 
         approval_status = self._decide_approval(policy.blocked, pricing.estimated_margin_rate)
+        notes = [extracted.get('note', '')]
+        if skip_enrichment:
+            notes.append('사전검사 반려로 웹 컨텍스트/LLM 보강 생략')
+        debug = {
+            'min_margin_rate': settings.min_margin_rate,
+            'auto_publish': should_auto_publish,
+            'naver_use_real_api': settings.naver_use_real_api,
+            'llm_enabled': settings.llm_enabled,
+            'llm_model': settings.openai_model,
+            'enrichment_skipped': skip_enrichment,
+            'llm_tiers': extracted.get('llm_tier_report'),
+            'trace_id': current_trace_id(),
+        }
 
         publish_result = PublishResult(
             attempted=False,
@@ -65,12 +247,22 @@ class LinkPipelineService:
         )
         publish_status = 'draft'
 
-        if approval_status == 'approved' and should_auto_publish:
+        if approval_status == 'approved' and should_auto_publish and not source['fetched']:
+            # 수집 실패 fallback(샘플 제목/가격)으로 등록하거나 이미 등록된 상품을 덮어쓰지 않는다.
+            publish_result = PublishResult(
+                attempted=False,
+                published=False,
+                market_product_id=None,
+                message='원문 수집 실패(fallback 데이터): 네이버 등록/수정 생략',
+            )
+            publish_status = 'error'
+        elif approval_status == 'approved' and should_auto_publish:
             overrides = {}
-            if extraction.representative_image_url:
+            image_urls, image_error = self._naver_image_urls(extraction, notes, debug)
+            if image_urls:
                 overrides = {
                     "originProduct": {
-                        "images": [{"url": extraction.representative_image_url}]
+                        "images": [{"url": u} for u in image_urls]
                     }
                 }
             detail_content_html = self._build_detail_content_html(extraction)
@@ -78,12 +270,29 @@ class LinkPipelineService:
                 base = overrides.get("originProduct", {})
                 base["detailContent"] = detail_content_html
                 overrides["originProduct"] = base
-            product_payload, payload_errors, template_used = self.payload_builder.build(
-                title=extraction.title,
-                sale_price_krw=pricing.target_price_krw,
-                overrides=overrides,
-            )
+            with span('build_payload') as s:
+                product_payload, payload_errors, template_used = self.payload_builder.build(
+                    title=extraction.title,
+                    sale_price_krw=pricing.target_price_krw,
+                    overrides=overrides,
+                    specs=extraction.specs,
+                )
+                s.set(template=template_used, errors=len(payload_errors))
+            if image_error:
+                # 빌더가 기본 대표 이미지(placeholder)로 채워 올리지 않도록 발행하지 않는다.
+                payload_errors = [image_error, *payload_errors]
             if payload_errors:
+                self._record_catalog(
+                    extraction,
+                    category_name,
+                    weight_g,
+                    pricing,
+                    policy,
+                    approval_status,
+                    'error',
+                    None,
+                    fetched=source['fetched'],
+                )
                 return RunLinkResponse(
                     extraction=extraction,
                     pricing=pricing,
@@ -96,25 +305,10 @@ class LinkPipelineService:
                         market_product_id=None,
                         message='네이버 payload 필수값 누락: ' + "; ".join(payload_errors),
                     ),
-                    notes=[extracted.get('note', '')],
-                    debug={
-                        'min_margin_rate': settings.min_margin_rate,
-                        'auto_publish': should_auto_publish,
-                        'naver_use_real_api': settings.naver_use_real_api,
-                        'template_used': template_used,
-                        'llm_enabled': settings.llm_enabled,
-                        'llm_model': settings.openai_model,
-                    },
+                    notes=notes,
+                    debug={**debug, 'template_used': template_used},
                 )
-            market_res = self.publisher.publish(
-                MarketPublishPayload(
-                    source_url=extraction.source_url,
-                    title=extraction.title,
-                    target_price_krw=pricing.target_price_krw,
-                    risk=policy.risk,
-                    product_payload=product_payload,
-                )
-            )
+            market_res = self._publish_or_sync(extraction, pricing, policy, product_payload, debug)
             publish_result = PublishResult(
                 attempted=True,
                 published=market_res.success,
@@ -123,6 +317,17 @@ class LinkPipelineService:
             )
             publish_status = 'published' if market_res.success else 'error'
 
+        self._record_catalog(
+            extraction,
+            category_name,
+            weight_g,
+            pricing,
+            policy,
+            approval_status,
+            publish_status,
+            publish_result.market_product_id,
+            fetched=source['fetched'],
+        )
         return RunLinkResponse(
             extraction=extraction,
             pricing=pricing,
@@ -130,36 +335,268 @@ class LinkPipelineService:
             approval_status=approval_status,
             publish_status=publish_status,
             publish_result=publish_result,
-            notes=[extracted.get('note', '')],
-            debug={
-                'min_margin_rate': settings.min_margin_rate,
-                'auto_publish': should_auto_publish,
-                'naver_use_real_api': settings.naver_use_real_api,
-                'llm_enabled': settings.llm_enabled,
-                'llm_model': settings.openai_model,
-            },
+            notes=notes,
+            debug=debug,
         )
 
     def run_batch(
-        self, source_urls: list[str], auto_publish: Optional[bool] = None
+        self,
+        source_urls: list[str],
+        auto_publish: Optional[bool] = None,
+        force_enrich: Optional[bool] = None,
     ) -> RunLinkBatchResponse:
         cleaned = [u.strip() for u in source_urls if u and u.strip()]
-        results = [self.run(url, auto_publish=auto_publish) for url in cleaned]
+        should_auto_publish = settings.auto_publish_on_run_link if auto_publish is None else auto_publish
+        # 배치 안의 중복 링크는 한 번만 처리하고 같은 결과를 돌려준다.
+        by_key: dict[tuple, RunLinkResponse] = {}
+        results = []
+        for url in cleaned:
+            key = self._flight_key(url, should_auto_publish, force_enrich)
+            if key in by_key:
+                self.single_flight.record_coalesced()
+            else:
+                by_key[key] = self.run(url, auto_publish=should_auto_publish, force_enrich=force_enrich)
+            results.append(by_key[key])
         return RunLinkBatchResponse(results=results)
 
-    def _calculate_price(self, source_price_jpy: int) -> PricingResult:
-        cost_krw = round(source_price_jpy * settings.default_fx_rate + settings.default_shipping_cost_krw)
-        target_price = round(cost_krw * (1 + settings.default_markup_rate))
-        fee = target_price * settings.default_market_fee_rate
-        margin = target_price - cost_krw - fee
-        margin_rate = margin / target_price if target_price > 0 else 0
+    def stream_bulk(
+        self,
+        f: TextIO,
+        in_fmt: str,
+        out_fmt: str,
+        auto_publish: Optional[bool] = None,
+        force_enrich: Optional[bool] = None,
+    ) -> Iterator[bytes]:
+        return stream_bulk_results(
+            f,
+            in_fmt,
+            out_fmt,
+            lambda url: self.run(url, auto_publish=auto_publish, force_enrich=force_enrich),
+        )
+
+    def upstream_health(self) -> dict:
+        # /health는 콜드스타트 직후에도 가벼워야 하므로 아직 안 만든 LLMClient는 만들지 않는다.
+        return self.llm.breakers.snapshot() if self.is_loaded('llm') else {}
+
+    def trace_waterfall(self, trace_id: str) -> Optional[dict]:
+        return tracer.waterfall(trace_id)
+
+    def metrics(self) -> dict:
+        out: dict[str, Any] = {
+            'components_loaded': [name for name in self.COMPONENTS if self.is_loaded(name)],
+            'single_flight': self.single_flight.snapshot(),
+            'tracing': tracer.snapshot(),
+        }
+        if self.is_loaded('llm'):
+            out['llm_tiers'] = self.llm.router.snapshot()
+            out['cpu_pool'] = self.llm.cpu_pool.snapshot()
+            out['fetch_hosts'] = self.llm.host_latency.snapshot()
+            out['translation_memory'] = self.llm.translation_memory.snapshot()
+            out['near_duplicates'] = self.llm.near_duplicates.snapshot()
+            out['openai_scheduler'] = self.llm.openai_scheduler.snapshot()
+            if settings.http_cassette_mode != 'off':
+                from app.services.http_cassette import cassette_store
+
+                out['http_cassette'] = cassette_store().snapshot()
+        if self.is_loaded('image_uploader'):
+            out['naver_images'] = self.image_uploader.snapshot()
+        if self.is_loaded('product_sync'):
+            out['naver_sync'] = self.product_sync.snapshot()
+        if self.is_loaded('recrawler'):
+            out['recrawl'] = self.recrawler.snapshot()
+        return out
+
+    def _naver_image_urls(
+        self, extraction: ProductExtraction, notes: list[str], debug: dict
+    ) -> tuple[list[str], Optional[str]]:
+        """(이미지 URL, 오류). 실연동이면 대표+추가 이미지를 네이버 이미지 호스트에 올린 URL로, 아니면 원본 대표 이미지 URL.
+
+        대표 이미지 업로드가 실패하면 오류를 돌려준다(추가 이미지만 실패하면 빼고 진행).
+        """
+        if not (settings.naver_use_real_api and settings.naver_image_upload_enabled):
+            return ([extraction.representative_image_url] if extraction.representative_image_url else []), None
+        source_urls = list(dict.fromkeys(u for u in [extraction.representative_image_url, *extraction.image_urls] if u))
+        source_urls = source_urls[: settings.naver_max_images]
+        if not source_urls:
+            return [], None
+        with span('images') as s:
+            result = self.image_uploader.upload(source_urls)
+            s.set(**result.report())
+        debug['images'] = result.report()
+        if result.failed:
+            notes.append(f'이미지 {len(result.failed)}건 업로드 실패로 제외: ' + '; '.join(result.failed.values())[:300])
+        if source_urls[0] not in result.urls:
+            return [], '대표 이미지 네이버 업로드 실패: ' + (result.failed.get(source_urls[0]) or '알 수 없는 오류')[:200]
+        return [result.urls[u] for u in source_urls if u in result.urls], None
+
+    def _publish_or_sync(
+        self,
+        extraction: ProductExtraction,
+        pricing: PricingResult,
+        policy: PolicyResult,
+        product_payload: dict,
+        debug: dict,
+    ) -> MarketPublishResponse:
+        """처음이면 등록하고, 이미 등록된 링크면 지난번 payload와의 차이만 수정한다(새 상품을 또 만들지 않음)."""
+        # 카탈로그는 단일 실행 key와 같은 정규화 URL로 찾는다(?ref=, utm_* 가 붙은 같은 상품 링크로 중복 등록 방지).
+        # 정규화 전 원본 URL로 저장된 예전 행도 찾아 본다.
+        existing = self.catalog.get(normalize_source_url(extraction.source_url)) or self.catalog.get(
+            extraction.source_url
+        )
+        if existing is not None and existing.market_product_id:
+            result = self.product_sync.sync(existing.market_product_id, product_payload, extraction.source_url)
+            debug['naver_sync'] = result.report()
+            return result.response
+        with span('publish') as s:
+            market_res = self.publisher.publish(
+                MarketPublishPayload(
+                    source_url=extraction.source_url,
+                    title=extraction.title,
+                    target_price_krw=pricing.target_price_krw,
+                    risk=policy.risk,
+                    product_payload=product_payload,
+                )
+            )
+            s.set(success=market_res.success, market_product_id=market_res.market_product_id)
+        if market_res.success and market_res.market_product_id:
+            self.product_sync.record_created(market_res.market_product_id, product_payload, extraction.source_url)
+        return market_res
+
+    def _flight_key(self, source_url: str, auto_publish: bool, force_enrich: Optional[bool]) -> tuple:
+        return normalize_source_url(source_url), bool(auto_publish), bool(force_enrich)
+
+    def _calculate_price(
+        self, source_price_jpy: int, category: Optional[str] = None, weight_g: Optional[float] = None
+    ) -> PricingResult:
+        return self.pricing.price_one(
+            source_price_jpy,
+            category=category,
+            weight_g=weight_g,
+            fx_rate=self.catalog.current_fx_rate(),
+        )
+
+    def _record_catalog(
+        self,
+        extraction: ProductExtraction,
+        category: Optional[str],
+        weight_g: Optional[float],
+        pricing: PricingResult,
+        policy: PolicyResult,
+        approval_status: str,
+        publish_status: str,
+        market_product_id: Optional[str],
+        fetched: bool = True,
+    ) -> None:
+        if not fetched:
+            # 수집 실패 fallback(샘플 제목/원가)으로 기존 가격 입력값을 덮어쓰면 재가격 계산이 가짜 원가로 나간다.
+            return
+        self.catalog.upsert(
+            CatalogItem(
+                source_url=normalize_source_url(extraction.source_url),
+                source_site=extraction.source_site,
+                title=extraction.title,
+                source_price_jpy=extraction.source_price_jpy,
+                category=category,
+                weight_g=weight_g,
+                policy_blocked=policy.blocked,
+                policy_risk=policy.risk,
+                fx_rate=pricing.fx_rate,
+                shipping_cost_krw=pricing.shipping_cost_krw,
+                market_fee_rate=pricing.market_fee_rate,
+                target_price_krw=pricing.target_price_krw,
+                estimated_margin_rate=pricing.estimated_margin_rate,
+                approval_status=approval_status,
+                publish_status=publish_status,
+                market_product_id=market_product_id,
+            )
+        )
+
+    def reprice_catalog(
+        self, fx_rate: float, push_updates: bool = True, dry_run: bool = False
+    ) -> CatalogRepriceResponse:
+        return self.repricer.reprice(fx_rate, push_updates=push_updates, dry_run=dry_run)
+
+    def recrawl_status(self) -> dict:
+        return self.recrawler.snapshot()
 
-        return PricingResult(
-            fx_rate=settings.default_fx_rate,
-            shipping_cost_krw=settings.default_shipping_cost_krw,
-            market_fee_rate=settings.default_market_fee_rate,
-            target_price_krw=target_price,
-            estimated_margin_rate=round(margin_rate, 4),
+    def run_recrawl(self, limit: Optional[int] = None) -> dict:
+        return self.recrawler.run_once(limit)
+
+    def drift_events(self, status: Optional[str] = None, limit: int = 200) -> list[DriftEvent]:
+        return [DriftEvent(**e) for e in self.recrawler.store.events(status, limit)]
+
+    def apply_drift(self, ids: Optional[list[int]] = None, push_updates: bool = True) -> DriftApplyResponse:
+        """대기 중인 가격 변동을 새 원가로 재가격 계산해 반영한다. 재고 변동은 그대로 대기(판매중지 처리 대상)."""
+        from app.services.recrawl import KIND_PRICE, STATUS_APPLIED
+
+        store = self.recrawler.store
+        events = store.pending_events(ids)
+        price_events = [e for e in events if e['kind'] == KIND_PRICE]
+        availability_ids = [e['id'] for e in events if e['kind'] != KIND_PRICE]
+        if not price_events:
+            return DriftApplyResponse(availability_pending_ids=availability_ids)
+        result = self.repricer.reprice_sources(
+            {e['source_url']: e['new_price_jpy'] for e in price_events}, push_updates=push_updates
+        )
+        failed_urls = {it.source_url for it in result.items if it.update_attempted and not it.update_success}
+        applied = [e['id'] for e in price_events if e['source_url'] not in failed_urls]
+        failed = [e['id'] for e in price_events if e['source_url'] in failed_urls]
+        store.resolve(applied, STATUS_APPLIED, f'새 원가로 재가격 계산(환율 {result.fx_rate})')
+        return DriftApplyResponse(
+            applied_ids=applied, failed_ids=failed, availability_pending_ids=availability_ids, reprice=result
+        )
+
+    def dismiss_drift(self, ids: list[int], note: str) -> int:
+        from app.services.recrawl import STATUS_DISMISSED
+
+        return self.recrawler.store.resolve(ids, STATUS_DISMISSED, note)
+
+    def upsert_translations(self, entries: list[TranslationMemoryEntry]) -> TranslationMemoryUpsertResponse:
+        tm = self.llm.translation_memory
+        stored = tm.store([(e.ja, e.ko) for e in entries], source='manual', approved=True)
+        return TranslationMemoryUpsertResponse(stored=stored, entries=tm.snapshot()['entries'])
+
+    def simulate_pricing(self, req: PricingSimulateRequest) -> PricingSimulateResponse:
+        from app.services.pricing_engine import PricingScenario
+
+        inputs = self.pricing.build_inputs(
+            [item.source_price_jpy for item in req.items],
+            [item.category for item in req.items],
+            [item.weight_g for item in req.items],
+        )
+        scenarios = req.scenarios or [PricingScenarioInput(name='default')]
+        results: list[PricingScenarioResult] = []
+        for sc in scenarios:
+            out = self.pricing.price(
+                inputs,
+                PricingScenario(
+                    name=sc.name,
+                    fx_rate=sc.fx_rate,
+                    markup_rate=sc.markup_rate,
+                    market_fee_rate=sc.market_fee_rate,
+                    shipping_cost_krw=sc.shipping_cost_krw,
+                    min_margin_rate=sc.min_margin_rate,
+                    rounding_rule=sc.rounding_rule,
+                ),
+            )
+            approved_count = int(out.margin_ok.sum())
+            results.append(
+                PricingScenarioResult(
+                    name=sc.name,
+                    fx_rate=out.fx_rate,
+                    approved_count=approved_count,
+                    rejected_count=len(inputs) - approved_count,
+                    avg_margin_rate=round(float(out.estimated_margin_rate.mean()), 4) if len(inputs) else 0.0,
+                    total_target_price_krw=int(out.target_price_krw.sum()),
+                    target_price_krw=out.target_price_krw.tolist() if req.include_items else [],
+                    estimated_margin_rate=out.estimated_margin_rate.tolist() if req.include_items else [],
+                    approved=out.margin_ok.tolist() if req.include_items else [],
+                )
+            )
+        return PricingSimulateResponse(
+            item_count=len(inputs),
+            skus=[item.sku for item in req.items] if req.include_items else [],
+            scenarios=results,
         )
 
     def _decide_approval(self, blocked: bool, margin_rate: float) -> str:
@@ -201,6 +638,25 @@ class LinkPipelineService:
             validation_errors=errors,
         )
 
+    def build_naver_payload_batch(
+        self, items: list[NaverBuildPayloadRequest]
+    ) -> NaverBuildPayloadBatchResponse:
+        built = self.payload_builder.build_many(
+            {
+                'title': item.title,
+                'sale_price_krw': item.sale_price_krw,
+                'overrides': item.overrides,
+                'template_hint': item.template_hint,
+            }
+            for item in items
+        )
+        return NaverBuildPayloadBatchResponse(
+            results=[
+                NaverBuildPayloadResponse(payload=payload, template_used=template_used, validation_errors=errors)
+                for payload, errors, template_used in built
+            ]
+        )
+
     def _build_detail_content_html(self, extraction: ProductExtraction) -> str:
         parts: list[str] = []
         if extraction.llm_summary_ko:
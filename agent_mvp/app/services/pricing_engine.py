@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from typing import Optional
+from typing import Sequence
+
+import numpy as np
+
+from app.config import settings
+from app.schemas import PricingResult
+
+DEFAULT_TABLES_PATH = Path(__file__).resolve().parent.parent / "data" / "pricing_tables.json"
+
+_WEIGHT_KEY_RE = re.compile(r"重量|重さ|質量|무게|중량|weight", re.IGNORECASE)
+# ","는 천 단위 구분자(1,500g), 소수점은 "."만 인정한다. "1,5kg" 같은 표기는 숫자 중간부터 읽지 않는다.
+_WEIGHT_VALUE_RE = re.compile(
+    r"(?<![\d.,])(\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)\s*(kg|ｋｇ|キロ|g|ｇ|グラム)", re.IGNORECASE
+)
+
+
+def _ceil_to(unit: int):
+    return lambda p: np.ceil(p / unit) * unit
+
+
+# 목표가 끝자리 규칙. charm_900: 1,000원 단위 올림 후 100원 내려 x,900원으로 맞춘다.
+ROUNDING_RULES = {
+    "none": lambda p: p,
+    "ceil_10": _ceil_to(10),
+    "ceil_100": _ceil_to(100),
+    "ceil_1000": _ceil_to(1000),
+    "charm_900": lambda p: np.ceil((p + 100) / 1000) * 1000 - 100,
+}
+
+
+def resolve_rounding_rule(rule: Optional[str]):
+    """끝자리 규칙 이름 -> 함수. 모르는 이름은 조용히 none으로 바꾸지 않고 ValueError."""
+    name = (rule or settings.pricing_rounding_rule).strip().lower()
+    try:
+        return ROUNDING_RULES[name]
+    except KeyError:
+        raise ValueError(f"알 수 없는 rounding_rule: {name} (가능: {', '.join(ROUNDING_RULES)})") from None
+
+
+@dataclass
+class PricingScenario:
+    """None 필드는 서버 기본값(settings/비용 테이블)을 사용한다."""
+
+    name: str = "default"
+    fx_rate: Optional[float] = None
+    markup_rate: Optional[float] = None
+    market_fee_rate: Optional[float] = None
+    shipping_cost_krw: Optional[int] = None
+    min_margin_rate: Optional[float] = None
+    rounding_rule: Optional[str] = None
+
+
+@dataclass
+class PricingInputs:
+    source_price_jpy: np.ndarray
+    shipping_cost_krw: np.ndarray
+    market_fee_rate: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.source_price_jpy)
+
+
+@dataclass
+class PricingArrays:
+    fx_rate: float
+    shipping_cost_krw: np.ndarray
+    market_fee_rate: np.ndarray
+    target_price_krw: np.ndarray
+    estimated_margin_rate: np.ndarray
+    margin_ok: np.ndarray
+
+
+def parse_weight_g(specs: Optional[dict[str, str]]) -> Optional[float]:
+    for key, value in (specs or {}).items():
+        if not _WEIGHT_KEY_RE.search(key):
+            continue
+        m = _WEIGHT_VALUE_RE.search(value)
+        if not m:
+            continue
+        amount = float(m.group(1).replace(",", ""))
+        unit = m.group(2).lower()
+        return amount * 1000 if unit in ("kg", "ｋｇ", "キロ") else amount
+    return None
+
+
+class PricingEngine:
+    def __init__(self, tables: Optional[dict[str, Any]] = None) -> None:
+        if tables is None:
+            tables = self._load_tables()
+
+        weight_classes = tables.get("weight_classes") or []
+        bounded = sorted(
+            (w for w in weight_classes if w.get("max_g") is not None), key=lambda w: float(w["max_g"])
+        )
+        overflow = [w for w in weight_classes if w.get("max_g") is None]
+        costs = [float(w["shipping_cost_krw"]) for w in bounded]
+        if overflow:
+            costs.append(float(overflow[0]["shipping_cost_krw"]))
+        elif costs:
+            costs.append(costs[-1])
+        # searchsorted(bounds, w, side="left") -> w <= max_g 인 첫 구간
+        self._weight_bounds = np.array([float(w["max_g"]) for w in bounded], dtype=np.float64)
+        self._weight_costs = np.array(costs, dtype=np.float64)
+        self._category_fee_rates: dict[str, float] = {
+            str(k): float(v) for k, v in (tables.get("category_fee_rates") or {}).items()
+        }
+        self._category_surcharges: dict[str, float] = {
+            str(k): float(v) for k, v in (tables.get("category_shipping_surcharge_krw") or {}).items()
+        }
+
+    def _load_tables(self) -> dict[str, Any]:
+        path = settings.pricing_tables_path.strip()
+        table_path = Path(path) if path else DEFAULT_TABLES_PATH
+        if not table_path.exists():
+            return {}
+        with open(table_path, encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+
+    def build_inputs(
+        self,
+        source_price_jpy: Sequence[float],
+        categories: Optional[Sequence[Optional[str]]] = None,
+        weights_g: Optional[Sequence[Optional[float]]] = None,
+    ) -> PricingInputs:
+        n = len(source_price_jpy)
+        prices = np.asarray(source_price_jpy, dtype=np.float64)
+
+        weights = np.full(n, np.nan) if weights_g is None else np.array(
+            [np.nan if w is None else w for w in weights_g], dtype=np.float64
+        )
+        shipping = np.full(n, float(settings.default_shipping_cost_krw))
+        known = ~np.isnan(weights)
+        if known.any() and len(self._weight_costs):
+            shipping[known] = self._weight_costs[np.searchsorted(self._weight_bounds, weights[known])]
+
+        fee_rates = np.full(n, float(settings.default_market_fee_rate))
+        if categories is not None:
+            # 카테고리 문자열은 고유값 단위로 한 번만 조회하고 배열 인덱싱으로 펼친다.
+            codes: dict[Optional[str], int] = {}
+            inverse = np.fromiter(
+                (codes.setdefault(c, len(codes)) for c in categories), dtype=np.int64, count=n
+            )
+            fee_lut = np.array(
+                [self._category_lookup(self._category_fee_rates, c, settings.default_market_fee_rate) for c in codes]
+            )
+            surcharge_lut = np.array(
+                [self._category_lookup(self._category_surcharges, c, 0.0) for c in codes]
+            )
+            fee_rates = fee_lut[inverse]
+            shipping = shipping + surcharge_lut[inverse]
+
+        return PricingInputs(source_price_jpy=prices, shipping_cost_krw=shipping, market_fee_rate=fee_rates)
+
+    def price(self, inputs: PricingInputs, scenario: Optional[PricingScenario] = None) -> PricingArrays:
+        scenario = scenario or PricingScenario()
+        fx_rate = settings.default_fx_rate if scenario.fx_rate is None else scenario.fx_rate
+        markup = settings.default_markup_rate if scenario.markup_rate is None else scenario.markup_rate
+        min_margin = settings.min_margin_rate if scenario.min_margin_rate is None else scenario.min_margin_rate
+        rounder = resolve_rounding_rule(scenario.rounding_rule)
+
+        shipping = inputs.shipping_cost_krw
+        if scenario.shipping_cost_krw is not None:
+            shipping = np.full(len(inputs), float(scenario.shipping_cost_krw))
+        fee_rates = inputs.market_fee_rate
+        if scenario.market_fee_rate is not None:
+            fee_rates = np.full(len(inputs), float(scenario.market_fee_rate))
+
+        cost = np.round(inputs.source_price_jpy * fx_rate + shipping)
+        target = rounder(np.round(cost * (1 + markup)))
+        margin = target - cost - target * fee_rates
+        with np.errstate(divide="ignore", invalid="ignore"):
+            margin_rate = np.where(target > 0, margin / target, 0.0)
+        margin_rate = np.round(margin_rate, 4)
+
+        return PricingArrays(
+            fx_rate=fx_rate,
+            shipping_cost_krw=shipping.astype(np.int64),
+            market_fee_rate=fee_rates,
+            target_price_krw=target.astype(np.int64),
+            estimated_margin_rate=margin_rate,
+            margin_ok=margin_rate >= min_margin,
+        )
+
+    def price_one(
+        self,
+        source_price_jpy: int,
+        *,
+        category: Optional[str] = None,
+        weight_g: Optional[float] = None,
+        fx_rate: Optional[float] = None,
+    ) -> PricingResult:
+        inputs = self.build_inputs([source_price_jpy], [category], [weight_g])
+        out = self.price(inputs, PricingScenario(fx_rate=fx_rate))
+        return PricingResult(
+            fx_rate=out.fx_rate,
+            shipping_cost_krw=int(out.shipping_cost_krw[0]),
+            market_fee_rate=float(out.market_fee_rate[0]),
+            target_price_krw=int(out.target_price_krw[0]),
+            estimated_margin_rate=float(out.estimated_margin_rate[0]),
+        )
+
+    def _category_lookup(self, table: dict[str, float], category: Optional[str], default: float) -> float:
+        # leaf id 또는 "대분류>중분류>소분류" 전체명 -> 가장 긴 접두 경로부터 조회
+        if not category or not table:
+            return default
+        if category in table:
+            return table[category]
+        parts = category.split(">")
+        for i in range(len(parts) - 1, 0, -1):
+            key = ">".join(parts[:i])
+            if key in table:
+                return table[key]
+        return default
+
@@ -0,0 +1,458 @@
+from __future__ import annotations
+
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Optional
+
+from app.config import settings
+from app.services.html_parsing import AVAILABILITY_IN_STOCK, AVAILABILITY_OUT_OF_STOCK
+from app.services.tracing import span
+
+if TYPE_CHECKING:
+    from app.services.llm_client import LLMClient
+
+AVAILABILITY_GONE = 'gone'
+
+KIND_PRICE = 'price'
+KIND_OUT_OF_STOCK = 'out_of_stock'
+KIND_BACK_IN_STOCK = 'back_in_stock'
+KIND_GONE = 'gone'
+AVAILABILITY_KINDS = (KIND_OUT_OF_STOCK, KIND_BACK_IN_STOCK, KIND_GONE)
+# 확정된 새 재고 상태 → 변동 종류
+_AVAILABILITY_KIND = {
+    AVAILABILITY_IN_STOCK: KIND_BACK_IN_STOCK,
+    AVAILABILITY_OUT_OF_STOCK: KIND_OUT_OF_STOCK,
+    AVAILABILITY_GONE: KIND_GONE,
+}
+
+STATUS_PENDING = 'pending'
+STATUS_APPLIED = 'applied'
+STATUS_DISMISSED = 'dismissed'
+
+# 변동이 있으면 주기를 줄이고, 없으면 늘린다(min~max, ±10% jitter로 같은 시각에 몰리지 않게).
+_SHRINK_ON_CHANGE = 0.5
+_GROW_ON_STABLE = 1.5
+_JITTER = 0.1
+_BUDGET_WINDOW_S = 3600.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS recrawl_state (
+    source_url TEXT PRIMARY KEY,
+    interval_s REAL NOT NULL,
+    next_due_at REAL NOT NULL,
+    last_checked_at REAL,
+    last_changed_at REAL,
+    checks INTEGER NOT NULL DEFAULT 0,
+    changes INTEGER NOT NULL DEFAULT 0,
+    failures INTEGER NOT NULL DEFAULT 0,
+    last_price_jpy INTEGER,
+    availability TEXT NOT NULL DEFAULT 'in_stock',
+    pending_availability TEXT,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_recrawl_state_due ON recrawl_state (next_due_at);
+CREATE TABLE IF NOT EXISTS drift_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source_url TEXT NOT NULL,
+    market_product_id TEXT,
+    kind TEXT NOT NULL,
+    old_price_jpy INTEGER,
+    new_price_jpy INTEGER,
+    status TEXT NOT NULL,
+    detected_at TEXT NOT NULL,
+    resolved_at TEXT,
+    note TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_drift_events_status ON drift_events (status, source_url);
+"""
+
+_EVENT_COLUMNS = (
+    'id',
+    'source_url',
+    'market_product_id',
+    'kind',
+    'old_price_jpy',
+    'new_price_jpy',
+    'status',
+    'detected_at',
+    'resolved_at',
+    'note',
+)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def next_interval(interval_s: float, changed: bool) -> float:
+    factor = _SHRINK_ON_CHANGE if changed else _GROW_ON_STABLE
+    return min(max(interval_s * factor, settings.recrawl_min_interval_s), settings.recrawl_max_interval_s)
+
+
+def _jittered(interval_s: float) -> float:
+    return interval_s * random.uniform(1 - _JITTER, 1 + _JITTER)
+
+
+@dataclass
+class RecrawlItem:
+    source_url: str
+    market_product_id: Optional[str]
+    catalog_price_jpy: int
+    interval_s: float
+    last_price_jpy: Optional[int]
+    availability: str
+    pending_availability: Optional[str]
+
+
+class RecrawlStore:
+    """재수집 일정(recrawl_state)과 변동 큐(drift_events). 카탈로그와 같은 SQLite 파일을 쓴다."""
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        path = db_path or settings.catalog_db_path
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+
+    def sync_published(self, now: float) -> int:
+        """새로 등록된 상품을 일정에 넣는다. 첫 확인 시각은 초기 주기 안에서 흩어 놓는다."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT c.source_url, c.source_price_jpy FROM catalog_items c "
+                "LEFT JOIN recrawl_state r ON r.source_url = c.source_url "
+                "WHERE c.publish_status = 'published' AND c.market_product_id IS NOT NULL "
+                "AND r.source_url IS NULL"
+            ).fetchall()
+            if not rows:
+                return 0
+            interval = settings.recrawl_initial_interval_s
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO recrawl_state (source_url, interval_s, next_due_at, last_price_jpy) "
+                    "VALUES (?, ?, ?, ?)",
+                    [
+                        (r['source_url'], interval, now + random.uniform(0, interval), r['source_price_jpy'])
+                        for r in rows
+                    ],
+                )
+        return len(rows)
+
+    def due(self, now: float, limit: int) -> list[RecrawlItem]:
+        """확인할 때가 된 등록 상품(오래 밀린 것부터)"""
+        if limit <= 0:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT r.source_url, c.market_product_id, c.source_price_jpy, r.interval_s, r.last_price_jpy, "
+                "r.availability, r.pending_availability FROM recrawl_state r "
+                "JOIN catalog_items c ON c.source_url = r.source_url "
+                "WHERE r.next_due_at <= ? AND c.publish_status = 'published' AND c.market_product_id IS NOT NULL "
+                "ORDER BY r.next_due_at LIMIT ?",
+                (now, limit),
+            ).fetchall()
+        return [
+            RecrawlItem(
+                source_url=r['source_url'],
+                market_product_id=r['market_product_id'],
+                catalog_price_jpy=r['source_price_jpy'],
+                interval_s=r['interval_s'],
+                last_price_jpy=r['last_price_jpy'],
+                availability=r['availability'],
+                pending_availability=r['pending_availability'],
+            )
+            for r in rows
+        ]
+
+    def due_count(self, now: float) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM recrawl_state r JOIN catalog_items c ON c.source_url = r.source_url "
+                "WHERE r.next_due_at <= ? AND c.publish_status = 'published' AND c.market_product_id IS NOT NULL",
+                (now,),
+            ).fetchone()[0]
+
+    def record_check(
+        self,
+        source_url: str,
+        now: float,
+        *,
+        interval_s: float,
+        next_due_at: float,
+        changed: bool,
+        price_jpy: Optional[int],
+        availability: str,
+        pending_availability: Optional[str],
+    ) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE recrawl_state SET interval_s = ?, next_due_at = ?, last_checked_at = ?, "
+                "last_changed_at = CASE WHEN ? THEN ? ELSE last_changed_at END, checks = checks + 1, "
+                "changes = changes + ?, last_price_jpy = COALESCE(?, last_price_jpy), availability = ?, "
+                "pending_availability = ?, last_error = NULL WHERE source_url = ?",
+                (
+                    interval_s,
+                    next_due_at,
+                    now,
+                    int(changed),
+                    now,
+                    int(changed),
+                    price_jpy,
+                    availability,
+                    pending_availability,
+                    source_url,
+                ),
+            )
+
+    def record_failure(self, source_url: str, now: float, next_due_at: float, error: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE recrawl_state SET next_due_at = ?, last_checked_at = ?, checks = checks + 1, "
+                "failures = failures + 1, last_error = ? WHERE source_url = ?",
+                (next_due_at, now, error[:300], source_url),
+            )
+
+    def record_price(self, item: RecrawlItem, new_price_jpy: int) -> None:
+        """원문 가격이 카탈로그 원가와 다르면 대기 중인 가격 변동 1건으로 합치고, 같아지면 대기 건을 취소한다."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id FROM drift_events WHERE source_url = ? AND kind = ? AND status = ?",
+                (item.source_url, KIND_PRICE, STATUS_PENDING),
+            ).fetchone()
+            if new_price_jpy == item.catalog_price_jpy:
+                if row:
+                    self._resolve(row['id'], STATUS_DISMISSED, '원문 가격이 등록 원가로 돌아옴')
+                return
+            if row:
+                self._conn.execute(
+                    "UPDATE drift_events SET new_price_jpy = ?, detected_at = ? WHERE id = ?",
+                    (new_price_jpy, _now(), row['id']),
+                )
+                return
+            self._insert(item, KIND_PRICE, item.catalog_price_jpy, new_price_jpy)
+
+    def record_availability(self, item: RecrawlItem, kind: str) -> None:
+        """품절/재입고/삭제. 대기 중인 반대 변동(품절 후 재입고 등)과는 서로 상쇄한다."""
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                f"SELECT id, kind FROM drift_events WHERE source_url = ? AND status = ? "
+                f"AND kind IN ({','.join('?' * len(AVAILABILITY_KINDS))})",
+                (item.source_url, STATUS_PENDING, *AVAILABILITY_KINDS),
+            ).fetchall()
+            cancelled = kind == KIND_BACK_IN_STOCK and any(r['kind'] != KIND_BACK_IN_STOCK for r in rows)
+            note = '재입고로 상쇄' if cancelled else f'이후 변동({kind})으로 대체'
+            for row in rows:
+                self._resolve(row['id'], STATUS_DISMISSED, note)
+            if not cancelled:
+                self._insert(item, kind, item.catalog_price_jpy, None)
+
+    def events(self, status: Optional[str] = None, limit: int = 200) -> list[dict[str, Any]]:
+        sql = f"SELECT {', '.join(_EVENT_COLUMNS)} FROM drift_events"
+        args: tuple = ()
+        if status:
+            sql += " WHERE status = ?"
+            args = (status,)
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY id DESC LIMIT ?", (*args, limit)).fetchall()
+        return [dict(r) for r in rows]
+
+    def pending_events(self, ids: Optional[list[int]] = None) -> list[dict[str, Any]]:
+        sql = f"SELECT {', '.join(_EVENT_COLUMNS)} FROM drift_events WHERE status = ?"
+        args: list[Any] = [STATUS_PENDING]
+        if ids is not None:
+            if not ids:
+                return []
+            sql += f" AND id IN ({','.join('?' * len(ids))})"
+            args.extend(ids)
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY id", args).fetchall()
+        return [dict(r) for r in rows]
+
+    def resolve(self, ids: list[int], status: str, note: str) -> int:
+        with self._lock, self._conn:
+            return sum(self._resolve(event_id, status, note) for event_id in ids)
+
+    def counts(self) -> dict[str, Any]:
+        with self._lock:
+            tracked = self._conn.execute("SELECT COUNT(*) FROM recrawl_state").fetchone()[0]
+            events = dict(
+                self._conn.execute("SELECT status, COUNT(*) FROM drift_events GROUP BY status").fetchall()
+            )
+            pending = dict(
+                self._conn.execute(
+                    "SELECT kind, COUNT(*) FROM drift_events WHERE status = ? GROUP BY kind", (STATUS_PENDING,)
+                ).fetchall()
+            )
+            intervals = self._conn.execute(
+                "SELECT MIN(interval_s), AVG(interval_s), MAX(interval_s) FROM recrawl_state"
+            ).fetchone()
+        return {
+            'tracked': tracked,
+            'events': events,
+            'pending_by_kind': pending,
+            'interval_s': {
+                'min': intervals[0],
+                'avg': round(intervals[1], 1) if intervals[1] is not None else None,
+                'max': intervals[2],
+            },
+        }
+
+    def _insert(self, item: RecrawlItem, kind: str, old_price: Optional[int], new_price: Optional[int]) -> None:
+        self._conn.execute(
+            "INSERT INTO drift_events (source_url, market_product_id, kind, old_price_jpy, new_price_jpy, status, "
+            "detected_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (item.source_url, item.market_product_id, kind, old_price, new_price, STATUS_PENDING, _now()),
+        )
+
+    def _resolve(self, event_id: int, status: str, note: str) -> int:
+        return self._conn.execute(
+            "UPDATE drift_events SET status = ?, resolved_at = ?, note = ? WHERE id = ? AND status = ?",
+            (status, _now(), note, event_id, STATUS_PENDING),
+        ).rowcount
+
+
+class RecrawlScheduler:
+    """등록된 상품의 원문 페이지만 다시 받아(웹 컨텍스트/LLM 없음) 가격/재고 변동을 drift_events에 쌓는다.
+
+    상품별 재방문 주기는 변동이 있으면 줄고 없으면 늘어난다. 전체 fetch 수는 recrawl_budget_per_hour로
+    제한하고, 예산이 모자라면 가장 오래 밀린 상품부터 확인한다. 품절/재입고는 recrawl_confirm_delay_s 뒤
+    한 번 더 같은 결과가 나와야 변동으로 본다(일시적인 페이지 오류로 내리지 않도록).
+    """
+
+    def __init__(self, llm: LLMClient, store: Optional[RecrawlStore] = None) -> None:
+        self.llm = llm
+        self.store = store or RecrawlStore()
+        self._executor = ThreadPoolExecutor(max_workers=settings.recrawl_concurrency, thread_name_prefix='recrawl')
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._fetches: deque[float] = deque()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_run: Optional[dict[str, Any]] = None
+        self._counts = {'runs': 0, 'checked': 0, 'changed': 0, 'failed': 0, 'deferred_by_budget': 0}
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='recrawl-scheduler', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(settings.recrawl_tick_s):
+            try:
+                self.run_once()
+            except Exception:
+                continue
+
+    def run_once(self, limit: Optional[int] = None) -> dict[str, Any]:
+        """지금 확인할 상품을 예산 안에서 확인한다. 동시에 두 번 돌지 않는다(이미 도는 중이면 건너뜀)."""
+        if not self._run_lock.acquire(blocking=False):
+            return {'skipped': True, 'reason': '이전 재수집이 아직 진행 중'}
+        try:
+            now = time.time()
+            synced = self.store.sync_published(now)
+            budget = self.budget_remaining()
+            take = budget if limit is None else min(budget, limit)
+            items = self.store.due(now, take)
+            deferred = max(self.store.due_count(now) - len(items), 0)
+            with self._lock:
+                self._fetches.extend([time.monotonic()] * len(items))
+            outcomes = list(self._executor.map(self._check, items))
+            summary = {
+                'synced': synced,
+                'checked': len(items),
+                'changed': sum(1 for o in outcomes if o == 'changed'),
+                'failed': sum(1 for o in outcomes if o == 'failed'),
+                'deferred_by_budget': deferred,
+                'budget_remaining': self.budget_remaining(),
+                'finished_at': _now(),
+            }
+            with self._lock:
+                self._counts['runs'] += 1
+                for key in ('checked', 'changed', 'failed', 'deferred_by_budget'):
+                    self._counts[key] += summary[key]
+                self._last_run = summary
+            return summary
+        finally:
+            self._run_lock.release()
+
+    def budget_remaining(self) -> int:
+        cutoff = time.monotonic() - _BUDGET_WINDOW_S
+        with self._lock:
+            while self._fetches and self._fetches[0] < cutoff:
+                self._fetches.popleft()
+            return max(settings.recrawl_budget_per_hour - len(self._fetches), 0)
+
+    def _check(self, item: RecrawlItem) -> str:
+        with span('recrawl', root=True, source_url=item.source_url) as s:
+            now = time.time()
+            try:
+                snap = self.llm.fetch_source_snapshot(item.source_url)
+            except Exception as e:
+                # 실패는 변동으로 보지 않고 주기도 그대로 둔다.
+                self.store.record_failure(
+                    item.source_url, now, now + _jittered(item.interval_s), f'{type(e).__name__}: {e}'
+                )
+                s.set(outcome='failed')
+                return 'failed'
+
+            price = snap.get('price_jpy')
+            changed = bool(price) and item.last_price_jpy is not None and price != item.last_price_jpy
+            if price:
+                self.store.record_price(item, price)
+
+            observed = snap.get('availability')
+            availability = item.availability
+            pending: Optional[str] = None
+            if observed and observed != item.availability:
+                if item.pending_availability == observed:
+                    availability = observed
+                    changed = True
+                    self.store.record_availability(item, _AVAILABILITY_KIND[observed])
+                else:
+                    pending = observed
+
+            # 확인 대기 중인 재방문은 주기 조정에 넣지 않는다.
+            interval = item.interval_s if pending else next_interval(item.interval_s, changed)
+            delay = settings.recrawl_confirm_delay_s if pending else _jittered(interval)
+            self.store.record_check(
+                item.source_url,
+                now,
+                interval_s=interval,
+                next_due_at=now + delay,
+                changed=changed,
+                price_jpy=price,
+                availability=availability,
+                pending_availability=pending,
+            )
+            s.set(outcome='changed' if changed else 'unchanged', price_jpy=price, availability=observed)
+            return 'changed' if changed else 'unchanged'
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+            last_run = self._last_run
+        return {
+            'enabled': settings.recrawl_enabled,
+            'running': self._thread is not None and not self._stop.is_set(),
+            'budget_per_hour': settings.recrawl_budget_per_hour,
+            'budget_remaining': self.budget_remaining(),
+            'due_now': self.store.due_count(time.time()),
+            **counts,
+            'last_run': last_run,
+            **self.store.counts(),
+        }
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.config import settings
+from app.schemas import CatalogRepriceResponse, RepricedItem
+from app.services.catalog_store import CatalogItem, CatalogStore
+from app.services.naver_sync import NaverProductSync
+from app.services.pricing_engine import PricingEngine, PricingScenario
+
+
+class CatalogRepricer:
+    """저장된 JPY 원가/가격 입력값만으로 전체 카탈로그 가격을 다시 계산한다(재수집/LLM 없음)."""
+
+    def __init__(self, catalog: CatalogStore, pricing: PricingEngine, sync: NaverProductSync) -> None:
+        self.catalog = catalog
+        self.pricing = pricing
+        # 가격수정은 지난번 보낸 payload 기준으로: 이미 그 판매가면 호출 생략
+        self.sync = sync
+
+    def reprice(self, fx_rate: float, *, push_updates: bool = True, dry_run: bool = False) -> CatalogRepriceResponse:
+        items = self.catalog.all_items()
+        if not items:
+            if not dry_run:
+                self.catalog.record_fx_snapshot(fx_rate)
+            return CatalogRepriceResponse(
+                fx_rate=fx_rate,
+                item_count=0,
+                changed_count=0,
+                approval_changed_count=0,
+                updates_sent=0,
+                updates_failed=0,
+                dry_run=dry_run,
+            )
+        result = self._reprice_items(items, fx_rate, push_updates=push_updates, dry_run=dry_run)
+        if not dry_run:
+            self.catalog.record_fx_snapshot(fx_rate)
+        return result
+
+    def reprice_sources(self, new_prices: dict[str, int], *, push_updates: bool = True) -> CatalogRepriceResponse:
+        """재수집에서 원문 가격이 바뀐 항목만 새 JPY 원가와 현재 환율로 다시 계산한다.
+
+        네이버 가격수정이 실패한 항목은 원가도 저장하지 않는다(변동 건으로 남아 다시 적용 가능).
+        """
+        fx_rate = self.catalog.current_fx_rate() or settings.default_fx_rate
+        items = [it for it in (self.catalog.get(url) for url in new_prices) if it is not None]
+        for it in items:
+            it.source_price_jpy = int(new_prices[it.source_url])
+        if not items:
+            return CatalogRepriceResponse(
+                fx_rate=fx_rate,
+                item_count=0,
+                changed_count=0,
+                approval_changed_count=0,
+                updates_sent=0,
+                updates_failed=0,
+                dry_run=False,
+            )
+        result = self._reprice_items(items, fx_rate, push_updates=push_updates, dry_run=False)
+        failed = {e.source_url for e in result.items if e.update_attempted and not e.update_success}
+        self.catalog.update_source_prices(
+            [(it.source_url, it.source_price_jpy) for it in items if it.source_url not in failed]
+        )
+        return result
+
+    def _reprice_items(
+        self, items: list[CatalogItem], fx_rate: float, *, push_updates: bool, dry_run: bool
+    ) -> CatalogRepriceResponse:
+        inputs = self.pricing.build_inputs(
+            [it.source_price_jpy for it in items],
+            [it.category for it in items],
+            [it.weight_g for it in items],
+        )
+        out = self.pricing.price(inputs, PricingScenario(fx_rate=fx_rate))
+        blocked = np.fromiter((it.policy_blocked for it in items), dtype=bool, count=len(items))
+        approved = ~blocked & out.margin_ok
+        old_prices = np.fromiter((it.target_price_krw for it in items), dtype=np.int64, count=len(items))
+        old_approved = np.fromiter((it.approval_status == 'approved' for it in items), dtype=bool, count=len(items))
+        price_changed = out.target_price_krw != old_prices
+        # 판매가가 그대로여도 환율/최소 마진 변화로 승인 여부가 바뀐 항목은 상태를 갱신한다.
+        changed_idx = np.flatnonzero(price_changed | (approved != old_approved))
+
+        result_items: list[RepricedItem] = []
+        to_save = []
+        updates_sent = 0
+        updates_failed = 0
+        approval_changed = 0
+        for i in changed_idx.tolist():
+            it = items[i]
+            new_approval = 'approved' if approved[i] else 'rejected'
+            if new_approval != it.approval_status:
+                approval_changed += 1
+            entry = RepricedItem(
+                source_url=it.source_url,
+                market_product_id=it.market_product_id,
+                old_target_price_krw=it.target_price_krw,
+                new_target_price_krw=int(out.target_price_krw[i]),
+                old_approval_status=it.approval_status,
+                new_approval_status=new_approval,
+                estimated_margin_rate=float(out.estimated_margin_rate[i]),
+            )
+
+            # 반려된 항목(마진 미달/정책)은 네이버 판매가를 건드리지 않는다.
+            if push_updates and not dry_run and it.market_product_id and price_changed[i] and approved[i]:
+                res = self.sync.update_price(it.market_product_id, entry.new_target_price_krw)
+                entry.update_attempted = True
+                entry.update_success = res.success
+                entry.update_message = res.message
+                updates_sent += 1
+                if not res.success:
+                    # 가격수정 실패 건은 저장값을 유지해 다음 sweep에서 다시 변경 대상으로 잡히게 한다.
+                    updates_failed += 1
+                    result_items.append(entry)
+                    continue
+
+            it.fx_rate = out.fx_rate
+            it.shipping_cost_krw = int(out.shipping_cost_krw[i])
+            it.market_fee_rate = float(out.market_fee_rate[i])
+            it.target_price_krw = entry.new_target_price_krw
+            it.estimated_margin_rate = entry.estimated_margin_rate
+            it.approval_status = new_approval
+            to_save.append(it)
+            result_items.append(entry)
+
+        if not dry_run:
+            self.catalog.update_pricing_many(to_save)
+
+        return CatalogRepriceResponse(
+            fx_rate=fx_rate,
+            item_count=len(items),
+            changed_count=int(price_changed.sum()),
+            approval_changed_count=approval_changed,
+            updates_sent=updates_sent,
+            updates_failed=updates_failed,
+            dry_run=dry_run,
+            items=result_items,
+        )
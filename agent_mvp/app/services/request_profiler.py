@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import marshal
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+from app.config import settings
+
+MODE_SAMPLE = 'sample'
+MODE_CPROFILE = 'cprofile'
+MODES = (MODE_SAMPLE, MODE_CPROFILE)
+# sample: flamegraph.pl / speedscope / inferno에 그대로 넣는 folded stack, cprofile: pstats(snakeviz)
+EXTENSIONS = {MODE_SAMPLE: 'folded', MODE_CPROFILE: 'prof'}
+_PROFILE_ID = re.compile(r'^[0-9a-f]{8,40}$')
+# cProfile은 프로세스에 하나만 켤 수 있다(3.12+ sys.monitoring).
+_cprofile_lock = threading.Lock()
+
+
+class ProfileError(ValueError):
+    pass
+
+
+class ProfilerBusyError(ProfileError):
+    pass
+
+
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+class StackSampler:
+    """대상 스레드의 콜스택을 interval마다 읽어 stack별 횟수를 센다(대상 스레드 코드는 건드리지 않음)."""
+
+    def __init__(self, thread_id: int, interval_s: float) -> None:
+        self._thread_id = thread_id
+        self._interval_s = interval_s
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval_s):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(labels))] += 1
+            self.samples += 1
+
+    def folded(self) -> bytes:
+        return ''.join(f'{stack} {n}\n' for stack, n in self.stacks.most_common()).encode('utf-8')
+
+    def top_self(self, limit: int = 10) -> list[dict[str, Any]]:
+        leaves: Counter[str] = Counter()
+        for stack, n in self.stacks.items():
+            leaves[stack.rsplit(';', 1)[-1]] += n
+        total = self.samples or 1
+        return [{'frame': f, 'samples': n, 'ratio': round(n / total, 3)} for f, n in leaves.most_common(limit)]
+
+
+def _cprofile_top(profiler: cProfile.Profile, limit: int = 10) -> list[dict[str, Any]]:
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = sorted(stats.stats.items(), key=lambda kv: kv[1][2], reverse=True)[:limit]  # tottime 순
+    return [
+        {'frame': f'{func} ({os.path.basename(path)}:{line})', 'calls': nc, 'tottime_ms': round(tt * 1000, 2)}
+        for (path, line, func), (_, nc, tt, _, _) in rows
+    ]
+
+
+class ProfileStore:
+    """요청 프로파일 파일 + 메타(JSON) 보관. 최근 profile_retention개만 남긴다(여러 worker가 같은 디렉터리 공유)."""
+
+    def __init__(self, directory: Optional[str] = None, retention: Optional[int] = None) -> None:
+        self._dir = Path(directory or settings.profile_dir)
+        self._retention = retention or settings.profile_retention
+        self._lock = threading.Lock()
+
+    def save(self, mode: str, data: bytes, meta: dict[str, Any]) -> dict[str, Any]:
+        self._dir.mkdir(parents=True, exist_ok=True)
+        profile_id = f'{int(time.time()):x}{uuid.uuid4().hex[:8]}'
+        meta = {
+            'id': profile_id,
+            'mode': mode,
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'bytes': len(data),
+            **meta,
+        }
+        with self._lock:
+            (self._dir / f'{profile_id}.{EXTENSIONS[mode]}').write_bytes(data)
+            (self._dir / f'{profile_id}.json').write_text(json.dumps(meta, ensure_ascii=False), encoding='utf-8')
+            self._prune()
+        return meta
+
+    def list(self) -> list[dict[str, Any]]:
+        out = []
+        for p in sorted(self._dir.glob('*.json'), reverse=True):
+            try:
+                out.append(json.loads(p.read_text(encoding='utf-8')))
+            except (OSError, ValueError):
+                continue  # 다른 worker가 방금 지운 파일
+        return out
+
+    def get(self, profile_id: str) -> tuple[dict[str, Any], Path]:
+        if not _PROFILE_ID.match(profile_id):
+            raise ProfileError('잘못된 profile id')
+        meta_path = self._dir / f'{profile_id}.json'
+        if not meta_path.exists():
+            raise ProfileError(f'profile 없음(보관 {self._retention}개 초과로 삭제됐을 수 있음): {profile_id}')
+        meta = json.loads(meta_path.read_text(encoding='utf-8'))
+        return meta, self._dir / f"{profile_id}.{EXTENSIONS[meta['mode']]}"
+
+    def _prune(self) -> None:
+        metas = sorted(self._dir.glob('*.json'))
+        for old in metas[: max(0, len(metas) - self._retention)]:
+            for p in self._dir.glob(f'{old.stem}.*'):
+                p.unlink(missing_ok=True)
+
+
+def profile_call(
+    store: ProfileStore, mode: str, meta: dict[str, Any], fn: Callable[[], Any]
+) -> tuple[Any, dict[str, Any]]:
+    """fn을 현재 스레드에서 실행하며 프로파일을 잡아 저장한다. 예외가 나도 프로파일은 저장된다."""
+    if mode not in MODES:
+        raise ProfileError(f'profile 모드는 {"/".join(MODES)} 중 하나여야 합니다: {mode}')
+    sampler: Optional[StackSampler] = None
+    profiler: Optional[cProfile.Profile] = None
+    if mode == MODE_SAMPLE:
+        sampler = StackSampler(threading.get_ident(), settings.profile_sample_interval_ms / 1000)
+        sampler.start()
+    else:
+        if not _cprofile_lock.acquire(blocking=False):
+            raise ProfilerBusyError('다른 요청이 cprofile 중입니다. 잠시 후 다시 시도하거나 sample 모드를 쓰세요.')
+        profiler = cProfile.Profile()
+        profiler.enable()
+    started = time.perf_counter()
+    error: Optional[str] = None
+    try:
+        result = fn()
+    except Exception as e:
+        error = f'{type(e).__name__}: {e}'
+        raise
+    finally:
+        duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        if sampler is not None:
+            sampler.stop()
+            data = sampler.folded()
+            summary: dict[str, Any] = {
+                'samples': sampler.samples,
+                'interval_ms': settings.profile_sample_interval_ms,
+                'top_self': sampler.top_self(),
+            }
+        else:
+            profiler.disable()
+            _cprofile_lock.release()
+            profiler.create_stats()
+            data = marshal.dumps(profiler.stats)  # Profile.dump_stats와 같은 형식
+            summary = {'top_self': _cprofile_top(profiler)}
+        saved = store.save(mode, data, {**meta, 'duration_ms': duration_ms, 'error': error, **summary})
+    return result, saved
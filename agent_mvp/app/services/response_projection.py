@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import gzip
+from typing import Any
+from typing import Optional
+
+from fastapi.responses import Response
+
+from app.config import settings
+
+# Apps Script(fillRowValues_)가 실제로 읽는 필드만
+SHEET_FIELDS = (
+    'extraction.source_site',
+    'extraction.source_url',
+    'extraction.title',
+    'extraction.source_price_jpy',
+    'extraction.representative_image_url',
+    'extraction.image_urls',
+    'extraction.source_description',
+    'extraction.key_features',
+    'extraction.specs',
+    'extraction.raw_text_snippet',
+    'extraction.llm_summary_ko',
+    'extraction.llm_product_judgement_ko',
+    'extraction.llm_selling_points_ko',
+    'extraction.llm_detail_outline_ko',
+    'extraction.llm_detail_sections_ko',
+    'pricing.target_price_krw',
+    'pricing.estimated_margin_rate',
+    'policy.risk',
+    'approval_status',
+    'publish_status',
+    'publish_result.market_product_id',
+    'publish_result.message',
+    'notes',
+)
+
+IDS_ONLY_FIELDS = (
+    'extraction.source_url',
+    'approval_status',
+    'publish_status',
+    'publish_result.market_product_id',
+)
+
+PROFILES: dict[str, Optional[tuple[str, ...]]] = {
+    'full': None,
+    'sheet': SHEET_FIELDS,
+    'ids-only': IDS_ONLY_FIELDS,
+}
+
+FieldTree = dict[str, Any]
+
+
+class ProjectionError(ValueError):
+    pass
+
+
+def resolve_fields(fields: Optional[str], profile: Optional[str]) -> Optional[FieldTree]:
+    """fields(콤마 구분 dotted path)가 profile보다 우선. None이면 전체 응답."""
+    if fields:
+        paths = tuple(p.strip() for p in fields.split(',') if p.strip())
+    elif profile:
+        key = profile.strip().lower()
+        if key not in PROFILES:
+            raise ProjectionError(f"알 수 없는 profile: {profile} (가능: {', '.join(PROFILES)})")
+        paths = PROFILES[key]
+    else:
+        return None
+    if paths is None:
+        return None
+
+    tree: FieldTree = {}
+    for path in paths:
+        node = tree
+        parts = path.split('.')
+        for part in parts[:-1]:
+            child = node.get(part)
+            if child is True:
+                break
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = True
+    return tree
+
+
+def project(data: Any, tree: FieldTree) -> Any:
+    if isinstance(data, list):
+        return [project(x, tree) for x in data]
+    if not isinstance(data, dict):
+        return data
+    out = {}
+    for key, sub in tree.items():
+        if key not in data:
+            continue
+        out[key] = data[key] if sub is True else project(data[key], sub)
+    return out
+
+
+def _encoding_qvalues(accept_encoding: str) -> dict[str, float]:
+    """Accept-Encoding -> {coding: q}. q가 없으면 1, 해석 못 하는 q는 0(사용 안 함)."""
+    out: dict[str, float] = {}
+    for part in accept_encoding.lower().split(','):
+        coding, *params = [p.strip() for p in part.split(';')]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            if param.startswith('q='):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        out[coding] = q
+    return out
+
+
+def _pick_encoding(accept_encoding: str) -> Optional[str]:
+    """q가 가장 높은 br/gzip(동률이면 br). 명시되지 않은 coding은 `*`의 q를 따르고, q=0은 거부."""
+    qvalues = _encoding_qvalues(accept_encoding)
+    wildcard = qvalues.get('*', 0.0)
+    best, best_q = None, 0.0
+    for coding in ('br', 'gzip'):
+        q = qvalues.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def json_response(content: Any, accept_encoding: str = '') -> Response:
+    """content가 bytes면 이미 JSON으로 직렬화된 본문으로 보고 그대로 쓴다."""
+    if isinstance(content, bytes):
+        body = content
+    else:
+        import orjson
+
+        body = orjson.dumps(content)
+    headers = {'Vary': 'Accept-Encoding'}
+    if len(body) >= settings.response_compress_min_bytes:
+        encoding = _pick_encoding(accept_encoding)
+        if encoding == 'br':
+            import brotli
+
+            body = brotli.compress(body, quality=settings.response_brotli_quality)
+            headers['Content-Encoding'] = 'br'
+        elif encoding == 'gzip':
+            body = gzip.compress(body, compresslevel=settings.response_gzip_level)
+            headers['Content-Encoding'] = 'gzip'
+    return Response(content=body, media_type='application/json', headers=headers)
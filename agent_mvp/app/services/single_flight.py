@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import re
+import threading
+from typing import Any
+from typing import Callable
+from typing import Hashable
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# 광고/유입 추적용 파라미터(상품 식별과 무관)
+TRACKING_PARAMS = {
+    'gclid',
+    'gbraid',
+    'wbraid',
+    'dclid',
+    'fbclid',
+    'yclid',
+    'msclkid',
+    'twclid',
+    'igshid',
+    'mc_cid',
+    'mc_eid',
+    '_ga',
+    '_gl',
+    'ref',
+    'ref_',
+    'tag',
+    'linkcode',
+    'scid',
+    'sc_e',
+    'spm',
+    'iasid',
+    'l-id',
+    'rafcid',
+    # Amazon 검색결과 유입 파라미터
+    'qid',
+    'sr',
+    'crid',
+    'sprefix',
+    'keywords',
+    'dib',
+    'dib_tag',
+    'content-id',
+}
+TRACKING_PREFIXES = ('utm_', 'pf_rd_', 'pd_rd_', 'sr_', 'ascsubtag')
+# Amazon 경로 끝의 /ref=sr_1_1 같은 추적 세그먼트
+AMAZON_REF_SEGMENT = re.compile(r'/ref=[^/]*$')
+
+
+def normalize_source_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    path = parts.path or '/'
+    if 'amazon.' in host:
+        path = AMAZON_REF_SEGMENT.sub('', path) or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+    query = [
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query.sort()
+    return urlunsplit((parts.scheme.lower(), host, path, urlencode(query), ''))
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """같은 key로 동시에 들어온 호출은 한 번만 실행하고 결과(또는 예외)를 공유한다."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._executions = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._executions += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def record_coalesced(self, n: int = 1) -> None:
+        with self._lock:
+            self._coalesced += n
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                'executions': self._executions,
+                'coalesced': self._coalesced,
+                'in_flight': len(self._calls),
+            }
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import functools
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+
+from app.config import settings
+
+_current_span: ContextVar[Optional['Span']] = ContextVar('trace_span', default=None)
+_EXPORT_BATCH = 256
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def set(self, **attrs: Any) -> None:
+        self.attributes.update({k: v for k, v in attrs.items() if v is not None})
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_span_id': self.parent_id,
+            'name': self.name,
+            'start_time_unix_nano': self.start_ns,
+            'end_time_unix_nano': self.end_ns,
+            'attributes': self.attributes,
+            'status': 'error' if self.error else 'ok',
+            'error': self.error,
+        }
+
+
+class _NoopSpan:
+    trace_id = None
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_value(v: Any) -> dict[str, Any]:
+    if isinstance(v, bool):
+        return {'boolValue': v}
+    if isinstance(v, int):
+        return {'intValue': str(v)}
+    if isinstance(v, float):
+        return {'doubleValue': v}
+    return {'stringValue': str(v)}
+
+
+def otlp_payload(spans: list[Span]) -> dict[str, Any]:
+    """OTLP/HTTP JSON(ExportTraceServiceRequest) 형식"""
+    return {
+        'resourceSpans': [
+            {
+                'resource': {
+                    'attributes': [
+                        {'key': 'service.name', 'value': {'stringValue': settings.tracing_service_name}},
+                        {'key': 'deployment.environment', 'value': {'stringValue': settings.env}},
+                    ]
+                },
+                'scopeSpans': [
+                    {
+                        'scope': {'name': 'agent_mvp'},
+                        'spans': [
+                            {
+                                'traceId': s.trace_id,
+                                'spanId': s.span_id,
+                                'parentSpanId': s.parent_id or '',
+                                'name': s.name,
+                                # http.* 속성이 있으면 CLIENT(3), 아니면 INTERNAL(1)
+                                'kind': 3 if 'http.host' in s.attributes else 1,
+                                'startTimeUnixNano': str(s.start_ns),
+                                'endTimeUnixNano': str(s.end_ns),
+                                'attributes': [{'key': k, 'value': _otlp_value(v)} for k, v in s.attributes.items()],
+                                'status': {'code': 2, 'message': s.error} if s.error else {'code': 1},
+                            }
+                            for s in spans
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class SpanExporter:
+    """끝난 span을 백그라운드 스레드에서 모아 JSON lines 파일 / OTLP collector로 내보낸다(요청 경로를 막지 않음)."""
+
+    def __init__(self, json_path: str, otlp_endpoint: str) -> None:
+        self._json_path = json_path
+        self._otlp_url = f"{otlp_endpoint.rstrip('/')}/v1/traces" if otlp_endpoint else ''
+        self._queue: queue.Queue[Span] = queue.Queue(maxsize=10_000)
+        self.dropped = 0
+        self.export_errors = 0
+        self._thread = threading.Thread(target=self._run, name='span-exporter', daemon=True)
+        self._thread.start()
+
+    def submit(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + 1.0
+            while len(batch) < _EXPORT_BATCH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._export(batch)
+            except Exception:
+                self.export_errors += 1
+
+    def _export(self, spans: list[Span]) -> None:
+        if self._json_path:
+            path = Path(self._json_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open('a', encoding='utf-8') as f:
+                f.writelines(json.dumps(s.to_dict(), ensure_ascii=False, default=str) + '\n' for s in spans)
+        if self._otlp_url:
+            import httpx
+
+            httpx.post(self._otlp_url, json=otlp_payload(spans), timeout=5.0).raise_for_status()
+
+
+class Tracer:
+    """링크 1건 = trace 1개. 최근 trace는 메모리에 두고 /traces/{trace_id} 워터폴로 보여준다."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._traces: OrderedDict[str, list[Span]] = OrderedDict()
+        # 내보내기 스레드는 첫 span이 끝날 때 띄운다(CPU 풀 워커 프로세스처럼 span을 안 만드는 곳은 띄우지 않음).
+        self._exporter: Optional[SpanExporter] = None
+        self._export_enabled = bool(settings.tracing_json_path or settings.tracing_otlp_endpoint)
+
+    @contextmanager
+    def span(self, name: str, *, root: bool = False, **attrs: Any) -> Iterator[Span | _NoopSpan]:
+        """root=True면 새 trace를 시작하고, 아니면 현재 span의 자식. 진행 중인 trace가 없으면 아무것도 안 남긴다."""
+        parent = _current_span.get()
+        if not settings.tracing_enabled or (parent is None and not root):
+            yield NOOP_SPAN
+            return
+        s = Span(
+            trace_id=_new_id(16) if root or parent is None else parent.trace_id,
+            span_id=_new_id(8),
+            parent_id=None if root or parent is None else parent.span_id,
+            name=name,
+            start_ns=time.time_ns(),
+        )
+        s.set(**attrs)
+        token = _current_span.set(s)
+        try:
+            yield s
+        except BaseException as e:
+            s.error = f'{type(e).__name__}: {str(e)[:200]}'
+            raise
+        finally:
+            _current_span.reset(token)
+            s.end_ns = time.time_ns()
+            self._finish(s)
+
+    def _finish(self, s: Span) -> None:
+        with self._lock:
+            spans = self._traces.get(s.trace_id)
+            if spans is None:
+                spans = self._traces[s.trace_id] = []
+                while len(self._traces) > settings.tracing_retention:
+                    self._traces.popitem(last=False)
+            spans.append(s)
+            if self._export_enabled and self._exporter is None:
+                self._exporter = SpanExporter(settings.tracing_json_path, settings.tracing_otlp_endpoint)
+        if self._exporter is not None:
+            self._exporter.submit(s)
+
+    def waterfall(self, trace_id: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            spans = list(self._traces.get(trace_id) or [])
+        if not spans:
+            return None
+        spans.sort(key=lambda s: s.start_ns)
+        t0 = spans[0].start_ns
+        by_id = {s.span_id: s for s in spans}
+
+        def depth(s: Span) -> int:
+            d = 0
+            while s.parent_id and s.parent_id in by_id:
+                s = by_id[s.parent_id]
+                d += 1
+            return d
+
+        return {
+            'trace_id': trace_id,
+            'duration_ms': round((max(s.end_ns for s in spans) - t0) / 1e6, 1),
+            'span_count': len(spans),
+            'spans': [
+                {
+                    'name': s.name,
+                    'span_id': s.span_id,
+                    'parent_span_id': s.parent_id,
+                    'depth': depth(s),
+                    'start_ms': round((s.start_ns - t0) / 1e6, 1),
+                    'duration_ms': round((s.end_ns - s.start_ns) / 1e6, 1),
+                    'status': 'error' if s.error else 'ok',
+                    'error': s.error,
+                    'attributes': s.attributes,
+                }
+                for s in spans
+            ],
+        }
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            kept = len(self._traces)
+        out: dict[str, Any] = {'enabled': settings.tracing_enabled, 'traces_in_memory': kept}
+        if self._exporter is not None:
+            out['export_dropped'] = self._exporter.dropped
+            out['export_errors'] = self._exporter.export_errors
+        return out
+
+
+def render_waterfall(tree: dict[str, Any], width: int = 60) -> str:
+    """터미널용 텍스트 워터폴"""
+    total = tree['duration_ms'] or 1.0
+    lines = [f"trace {tree['trace_id']}  {tree['duration_ms']:.0f} ms  spans {tree['span_count']}"]
+    for s in tree['spans']:
+        start = int(s['start_ms'] / total * width)
+        length = max(1, int(s['duration_ms'] / total * width))
+        bar = ' ' * start + '█' * min(length, width - start)
+        attrs = ' '.join(
+            f'{k}={v}' for k, v in s['attributes'].items() if k in ('http.host', 'http.status_code', 'cache', 'query')
+        )
+        label = ('  ' * s['depth'] + s['name'])[:34]
+        mark = ' !' if s['status'] == 'error' else ''
+        lines.append(f"{label:<34} |{bar:<{width}}| {s['duration_ms']:>8.1f} ms {attrs}{mark}")
+    return '\n'.join(lines)
+
+
+def current_span() -> Span | _NoopSpan:
+    return _current_span.get() or NOOP_SPAN
+
+
+def current_trace_id() -> Optional[str]:
+    s = _current_span.get()
+    return s.trace_id if s is not None else None
+
+
+tracer = Tracer()
+span = tracer.span
+
+
+def traced(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """함수 전체를 span으로 감싼다. 속성은 함수 안에서 current_span().set(...)으로 붙인다."""
+
+    def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with tracer.span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return deco
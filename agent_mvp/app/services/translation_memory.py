@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import unicodedata
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+from app.config import settings
+
+DEFAULT_SEED_PATH = Path(__file__).resolve().parent.parent / 'data' / 'translation_memory_seed.json'
+
+# 가나/한자가 있어야 번역 대상(숫자/영문/한국어만 있으면 그대로 쓴다)
+_JA_CHARS = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uff66-\uff9f]')
+_KO_CHARS = re.compile(r'[가-힣]')
+_SPACES = re.compile(r'\s+')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translation_memory (
+    segment TEXT PRIMARY KEY,
+    ko TEXT NOT NULL,
+    source TEXT NOT NULL,
+    approved INTEGER NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+def normalize_segment(text: str) -> str:
+    return _SPACES.sub(' ', unicodedata.normalize('NFKC', text)).strip()
+
+
+def needs_translation(text: str) -> bool:
+    return bool(_JA_CHARS.search(text))
+
+
+def estimate_tokens(text: str) -> int:
+    # 대략치: 비ASCII(일/한) 1자 ≈ 1토큰, ASCII 4자 ≈ 1토큰
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (len(text) - ascii_chars) + (ascii_chars + 3) // 4
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+@dataclass
+class TranslationPlan:
+    """key_features/specs를 세그먼트로 나눠, 기억에 있는 것과 LLM에 보낼 것(pending)을 구분한다."""
+
+    key_features: list[str]
+    specs: dict[str, str]
+    known: dict[str, str]
+    pending: list[str]
+    segment_count: int = 0
+    hit_count: int = 0
+    tokens_saved: int = 0
+    learned: dict[str, str] = field(default_factory=dict)
+
+    def assemble(self) -> tuple[list[str], dict[str, str]]:
+        """기억/학습한 번역으로 채운 key_features/specs. 번역이 없는 세그먼트는 일본어 그대로 남는다.
+
+        LLM 호출 전에 부르면 프롬프트용(기억에 있는 세그먼트만 한국어로 바뀐 상태)이 된다.
+        """
+        features = [self._translate(f) for f in self.key_features]
+        specs = {self._translate(k): self._translate(v) for k, v in self.specs.items()}
+        return features, specs
+
+    def report(self) -> dict[str, Any]:
+        return {
+            'segments': self.segment_count,
+            'hits': self.hit_count,
+            'hit_rate': round(self.hit_count / self.segment_count, 3) if self.segment_count else 0.0,
+            'sent_to_llm': len(self.pending),
+            'learned': len(self.learned),
+            'tokens_saved_est': self.tokens_saved,
+        }
+
+    def _translate(self, text: str) -> str:
+        if not needs_translation(text):
+            return text
+        norm = normalize_segment(text)
+        return self.known.get(norm) or self.learned.get(norm) or text
+
+
+class TranslationMemory:
+    """정규화한 일본어 세그먼트 → 승인된 한국어 번역(SQLite)."""
+
+    def __init__(self, db_path: Optional[str] = None, seed_path: Optional[str] = None) -> None:
+        path = db_path or settings.translation_memory_db_path
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._counters = {'runs': 0, 'segments': 0, 'hits': 0, 'sent_to_llm': 0, 'learned': 0, 'tokens_saved_est': 0}
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+        self._load_seed(Path(seed_path or settings.translation_memory_seed_path or DEFAULT_SEED_PATH))
+
+    def plan(self, key_features: list[str], specs: dict[str, str]) -> TranslationPlan:
+        segments = [f for f in key_features if needs_translation(f)]
+        for k, v in specs.items():
+            segments.extend(s for s in (k, v) if needs_translation(s))
+        norms = [normalize_segment(s) for s in segments]
+        known = self.lookup(set(norms))
+
+        plan = TranslationPlan(key_features=key_features, specs=specs, known=known, pending=[])
+        seen_pending: set[str] = set()
+        for norm in norms:
+            plan.segment_count += 1
+            if norm in known:
+                plan.hit_count += 1
+                # 프롬프트에는 일본어 대신 한국어가 들어가므로 입력은 거의 같고, 절약분은 번역 출력 토큰뿐이다.
+                plan.tokens_saved += estimate_tokens(known[norm])
+            elif norm not in seen_pending:
+                seen_pending.add(norm)
+                plan.pending.append(norm)
+        return plan
+
+    def learn(self, plan: TranslationPlan, translated: Any) -> None:
+        """LLM이 돌려준 {일본어 세그먼트: 한국어} 번역 중 pending에 해당하는 것을 저장한다.
+
+        세그먼트별로 키를 맞추므로 일부가 빠지거나 순서가 바뀌어도 나머지는 그대로 쓴다.
+        pending 순서의 목록도 받지만, 개수가 다르면 정렬을 믿을 수 없어 쓰지 않는다.
+        """
+        if not plan.pending:
+            return
+        if isinstance(translated, dict):
+            items = [(normalize_segment(str(k)), v) for k, v in translated.items()]
+        elif isinstance(translated, list) and len(translated) == len(plan.pending):
+            items = list(zip(plan.pending, translated))
+        else:
+            return
+        pending = set(plan.pending)
+        pairs = []
+        for ja, ko in items:
+            ko = normalize_segment(str(ko or ''))
+            if ja not in pending or not ko or not _KO_CHARS.search(ko) or needs_translation(ko):
+                continue
+            plan.learned[ja] = ko
+            pairs.append((ja, ko))
+        self.store(pairs, source='llm', approved=settings.translation_memory_auto_approve)
+
+    def record(self, plan: TranslationPlan) -> None:
+        report = plan.report()
+        with self._lock:
+            self._counters['runs'] += 1
+            self._counters['segments'] += report['segments']
+            self._counters['hits'] += report['hits']
+            self._counters['sent_to_llm'] += report['sent_to_llm']
+            self._counters['learned'] += report['learned']
+            self._counters['tokens_saved_est'] += report['tokens_saved_est']
+
+    def lookup(self, norms: set[str]) -> dict[str, str]:
+        if not norms:
+            return {}
+        params = sorted(norms)
+        placeholders = ', '.join('?' for _ in params)
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                f"SELECT segment, ko FROM translation_memory WHERE approved = 1 AND segment IN ({placeholders})",
+                params,
+            ).fetchall()
+            found = {r['segment']: r['ko'] for r in rows}
+            if found:
+                self._conn.executemany(
+                    "UPDATE translation_memory SET hits = hits + 1 WHERE segment = ?", [(s,) for s in found]
+                )
+        return found
+
+    def store(self, pairs: list[tuple[str, str]], *, source: str, approved: bool) -> int:
+        if not pairs:
+            return 0
+        now = _now()
+        rows = [(normalize_segment(ja), ko.strip(), source, int(approved), now) for ja, ko in pairs if ja and ko]
+        # 수동(manual) 등록분은 LLM 결과로 덮어쓰지 않는다.
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO translation_memory (segment, ko, source, approved, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(segment) DO UPDATE SET ko = excluded.ko, source = excluded.source, "
+                "approved = excluded.approved, updated_at = excluded.updated_at "
+                "WHERE translation_memory.source != 'manual' OR excluded.source = 'manual'",
+                rows,
+            )
+        return len(rows)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            total, approved = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(approved), 0) FROM translation_memory"
+            ).fetchone()
+            counters = dict(self._counters)
+        counters['hit_rate'] = round(counters['hits'] / counters['segments'], 3) if counters['segments'] else 0.0
+        return {'entries': total, 'approved_entries': approved, **counters}
+
+    def _load_seed(self, path: Path) -> None:
+        if not path.exists():
+            return
+        data = json.loads(path.read_text(encoding='utf-8'))
+        pairs = [(ja, ko) for ja, ko in (data.get('segments') or {}).items()]
+        now = _now()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO translation_memory (segment, ko, source, approved, updated_at) "
+                "VALUES (?, ?, 'seed', 1, ?)",
+                [(normalize_segment(ja), ko, now) for ja, ko in pairs],
+            )
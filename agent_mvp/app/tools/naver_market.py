@@ -18,6 +18,76 @@ class NaverMarketPublisher:
             return self._publish_real(payload)
         return self._publish_mock(payload)
 
+    def update_price(self, market_product_id: str, sale_price_krw: int) -> MarketPublishResponse:
+        if not settings.naver_use_real_api:
+            return MarketPublishResponse(
+                success=True,
+                market_product_id=market_product_id,
+                message=f"네이버 마켓 MVP mock 가격수정 성공: {sale_price_krw}",
+            )
+        try:
+            self.client.update_sale_price(market_product_id, sale_price_krw)
+            return MarketPublishResponse(
+                success=True,
+                market_product_id=market_product_id,
+                message="네이버 상품 가격수정 성공",
+            )
+        except (NaverAuthError, NaverApiError) as e:
+            return MarketPublishResponse(
+                success=False,
+                market_product_id=market_product_id,
+                message=str(e),
+            )
+
+    def update_option_stock(
+        self,
+        market_product_id: str,
+        sale_price_krw: Optional[int] = None,
+        stock_quantity: Optional[int] = None,
+    ) -> MarketPublishResponse:
+        if not settings.naver_use_real_api:
+            return MarketPublishResponse(
+                success=True,
+                market_product_id=market_product_id,
+                message=f"네이버 마켓 MVP mock 가격/재고 수정 성공: {sale_price_krw}/{stock_quantity}",
+            )
+        try:
+            self.client.update_option_stock(
+                market_product_id, sale_price_krw=sale_price_krw, stock_quantity=stock_quantity
+            )
+            return MarketPublishResponse(
+                success=True,
+                market_product_id=market_product_id,
+                message="네이버 상품 가격/재고 수정 성공",
+            )
+        except (NaverAuthError, NaverApiError) as e:
+            return MarketPublishResponse(
+                success=False,
+                market_product_id=market_product_id,
+                message=str(e),
+            )
+
+    def update_product(self, market_product_id: str, product_payload: dict[str, Any]) -> MarketPublishResponse:
+        if not settings.naver_use_real_api:
+            return MarketPublishResponse(
+                success=True,
+                market_product_id=market_product_id,
+                message="네이버 마켓 MVP mock 상품수정 성공",
+            )
+        try:
+            self.client.update_product(market_product_id, product_payload)
+            return MarketPublishResponse(
+                success=True,
+                market_product_id=market_product_id,
+                message="네이버 상품수정 성공",
+            )
+        except (NaverAuthError, NaverApiError) as e:
+            return MarketPublishResponse(
+                success=False,
+                market_product_id=market_product_id,
+                message=str(e),
+            )
+
     def _publish_mock(self, payload: MarketPublishPayload) -> MarketPublishResponse:
         # MVP 단계: 네이버 실연동 전 mock 응답
         key = f"{payload.source_url}|{payload.title}|{payload.target_price_krw}"
@@ -0,0 +1,88 @@
+"""콜드스타트 측정: app.main import 시간, uvicorn 기동 후 첫 /health 응답까지 시간, 워밍업 시간.
+
+매 회 새 프로세스로 측정한다(모듈 캐시 영향 없음).
+실행: cd agent_mvp && python -m scripts.bench_cold_start [--runs 5]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import app.main; "
+    "print((time.perf_counter() - t) * 1000)"
+)
+HEAVY_MODULES = ("httpx", "bs4", "numpy", "bcrypt", "orjson", "brotli")
+LOADED_SNIPPET = (
+    "import sys, app.main; "
+    f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules) or '-')"
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _import_ms() -> float:
+    out = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], capture_output=True, text=True, check=True)
+    return float(out.stdout.strip())
+
+
+def _first_health_ms() -> tuple[float, float]:
+    """(프로세스 시작 → 첫 /health 200, 그 뒤 POST /warmup 소요) ms"""
+    port = _free_port()
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env={**os.environ, "WARM_UP_ON_STARTUP": "false"},
+    )
+    try:
+        url = f"http://127.0.0.1:{port}"
+        with httpx.Client(timeout=2.0) as client:
+            while True:
+                try:
+                    if client.get(f"{url}/health").status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if proc.poll() is not None:
+                    raise RuntimeError("uvicorn 종료됨")
+                time.sleep(0.005)
+            health_ms = (time.perf_counter() - t0) * 1000
+            t1 = time.perf_counter()
+            client.post(f"{url}/warmup", timeout=60.0)
+            warmup_ms = (time.perf_counter() - t1) * 1000
+        return health_ms, warmup_ms
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    imports = [_import_ms() for _ in range(args.runs)]
+    health, warmup = zip(*(_first_health_ms() for _ in range(args.runs)))
+    loaded = subprocess.run([sys.executable, "-c", LOADED_SNIPPET], capture_output=True, text=True, check=True)
+
+    print(f"import app.main:    median {statistics.median(imports):.0f} ms (min {min(imports):.0f})")
+    print(f"first /health:      median {statistics.median(health):.0f} ms (min {min(health):.0f})")
+    print(f"POST /warmup:       median {statistics.median(warmup):.0f} ms")
+    print(f"import 시 로드된 무거운 모듈: {loaded.stdout.strip()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""NaverPayloadBuilder 처리량 측정.
+
+실행: cd agent_mvp && python -m scripts.bench_payload_builder [--n 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from app.config import settings
+from app.services.category_resolver import SAMPLE_TREE_PATH
+from app.services.naver_payload_builder import NaverPayloadBuilder
+
+SAMPLE_TITLES = [
+    "무선 이어폰 블루투스 5.3 노이즈캔슬링",
+    "ニット セーター レディース 秋冬",
+    "マグカップ 陶器 北欧 350ml",
+    "SEIKO 腕時計 メンズ SBDC101",
+    "테스트 상품",
+]
+
+
+def _items(n: int) -> list[dict]:
+    items = []
+    for i in range(n):
+        items.append(
+            {
+                "title": SAMPLE_TITLES[i % len(SAMPLE_TITLES)],
+                "sale_price_krw": 19900 + i,
+                "specs": {"素材": "綿 100%", "サイズ": "M"},
+                "overrides": {
+                    "originProduct": {
+                        "images": [{"url": f"https://example.com/{i}.jpg"}],
+                        "detailContent": f"<p>상세 {i}</p>",
+                    }
+                },
+            }
+        )
+    return items
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=20000)
+    args = parser.parse_args()
+    # 트리를 지정하지 않았으면 카테고리 색인 비용도 재도록 샘플 트리 사용
+    if not settings.naver_category_tree_path.strip():
+        settings.naver_category_tree_path = str(SAMPLE_TREE_PATH)
+
+    t0 = time.perf_counter()
+    builder = NaverPayloadBuilder()
+    init_ms = (time.perf_counter() - t0) * 1000
+    items = _items(args.n)
+
+    t0 = time.perf_counter()
+    for item in items:
+        builder.build(**item)
+    single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    builder.build_many(items)
+    batch = time.perf_counter() - t0
+
+    print(f"builder init: {init_ms:.1f} ms (templates + category index)")
+    print(f"build():      {args.n / single:,.0f} payloads/s ({single / args.n * 1e6:.1f} us/payload)")
+    print(f"build_many(): {args.n / batch:,.0f} payloads/s ({batch / args.n * 1e6:.1f} us/payload)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""링크 목록을 파이프라인에 통과시키며 외부 HTTP를 기록(record)하거나, 기록을 재생(replay)해 같은 입력으로 시간을 잰다.
+
+1) 기록(실제 외부 호출):  python -m scripts.bench_replay urls.txt --mode record --cassette data/run.sqlite3
+2) 재생(네트워크 없음):    python -m scripts.bench_replay urls.txt --mode replay --cassette data/run.sqlite3
+   --latency-scale 0      외부 지연 없이 앱 자체 CPU 시간만
+   --profile out.prof     cProfile 결과 저장(snakeviz/pstats로 확인)
+변경 전/후 커밋에서 같은 카세트로 재생해 결과를 비교한다. 카탈로그/번역 메모리/유사상품 DB는 매번 임시 경로를 쓴다.
+"""
+from __future__ import annotations
+
+import argparse
+import cProfile
+import os
+import statistics
+import tempfile
+import time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('urls', help='링크 목록 파일(한 줄에 하나)')
+    parser.add_argument('--mode', choices=['record', 'replay'], default='replay')
+    parser.add_argument('--cassette', default='data/http_cassette.sqlite3')
+    parser.add_argument('--latency-scale', type=float, default=1.0)
+    parser.add_argument('--auto-publish', action='store_true')
+    parser.add_argument('--profile', help='cProfile 출력 경로')
+    args = parser.parse_args()
+
+    urls = [u.strip() for u in open(args.urls, encoding='utf-8') if u.strip() and not u.startswith('#')]
+    data_dir = tempfile.mkdtemp(prefix='bench-replay-')
+    # settings는 import 시점에 환경변수를 읽으므로 app 모듈보다 먼저 설정한다.
+    os.environ.update(
+        {
+            'HTTP_CASSETTE_MODE': args.mode,
+            'HTTP_CASSETTE_PATH': args.cassette,
+            'HTTP_REPLAY_LATENCY_SCALE': str(args.latency_scale),
+            'CATALOG_DB_PATH': f'{data_dir}/catalog.sqlite3',
+            'TRANSLATION_MEMORY_DB_PATH': f'{data_dir}/translation_memory.sqlite3',
+            'NEAR_DUPLICATE_DB_PATH': f'{data_dir}/near_duplicates.sqlite3',
+            'NAVER_IMAGE_CACHE_DB_PATH': f'{data_dir}/naver_images.sqlite3',
+            'NAVER_PAYLOAD_DB_PATH': f'{data_dir}/naver_payloads.sqlite3',
+            # 재생은 요청 순서대로 응답을 돌려주므로 hedge(중복 요청)는 끈다.
+            'FETCH_HEDGE_ENABLED': 'false',
+        }
+    )
+    from app.services.pipeline import LinkPipelineService
+
+    service = LinkPipelineService()
+    service.warm_up()
+    profiler = cProfile.Profile() if args.profile else None
+    timings: list[float] = []
+    if profiler:
+        profiler.enable()
+    started = time.perf_counter()
+    for url in urls:
+        t0 = time.perf_counter()
+        res = service.run(url, auto_publish=args.auto_publish)
+        timings.append((time.perf_counter() - t0) * 1000)
+        print(f'{timings[-1]:8.0f} ms  {res.approval_status:<9} {res.publish_status:<9} {url}')
+    total = time.perf_counter() - started
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+
+    print(f'\n{len(urls)}건  합계 {total:.2f}s  중앙값 {statistics.median(timings):.0f} ms  최대 {max(timings):.0f} ms')
+    print(f"http: {service.metrics().get('http_cassette')}")
+    if args.profile:
+        print(f'프로파일 저장: {args.profile}')
+
+
+if __name__ == '__main__':
+    main()
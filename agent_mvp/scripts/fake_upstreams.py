@@ -0,0 +1,330 @@
+"""부하 테스트용 가짜 외부 서비스(쇼핑몰 상품 페이지, DuckDuckGo, Wikipedia, OpenAI, 네이버 커머스 API).
+
+한 포트에서 경로 prefix로 나눠 제공한다.
+  /shop/item/{id}          상품 HTML(JSON-LD/특징/스펙 표), id마다 다른 상품
+  /shop/article/{id}       검색결과 링크가 가리키는 일반 페이지
+  /shop/img/{name}         상품 이미지(JPEG), 이름별로 같은 내용(`*-2.jpg`는 모든 상품 공통 안내 이미지)
+  POST /shop/_drift/{id}   재수집 테스트용 원문 변동(?price=1234, ?stock=out|in|gone)
+  /ddg/html/, /ddg/api/    DuckDuckGo HTML 검색 / Instant Answer
+  /wiki/...                Wikipedia 검색/요약
+  /openai/v1/chat/completions
+  /naver/v1/oauth2/token, /naver/v2/products(/origin-products/{no}), /naver/v1/products/...,
+  /naver/v1/product-images/upload
+  /_stats                  upstream별 요청/오류 수
+
+upstream별 지연/오류 프로필: --profile openai:latency=800,spread=0.6,errors=0.05,status=429,hang=0.01
+  latency  중앙값 ms(로그정규 분포)   spread  로그정규 sigma(꼬리 길이)
+  errors   오류 응답 비율             status  오류 응답 코드
+  hang     응답 없이 hang_s초 대기(클라이언트 timeout 유발) 비율
+실행: cd agent_mvp && python -m scripts.fake_upstreams --port 9100 --profile shop:latency=300
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import email.parser
+import hashlib
+import json
+import random
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from dataclasses import replace
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response
+
+UPSTREAMS = ('shop', 'ddg', 'wikipedia', 'openai', 'naver')
+
+
+@dataclass(frozen=True)
+class UpstreamProfile:
+    latency: float = 50.0
+    spread: float = 0.4
+    errors: float = 0.0
+    status: int = 503
+    hang: float = 0.0
+    hang_s: float = 60.0
+
+
+DEFAULT_PROFILES: dict[str, UpstreamProfile] = {
+    'shop': UpstreamProfile(latency=250.0, spread=0.5),
+    'ddg': UpstreamProfile(latency=150.0, spread=0.4),
+    'wikipedia': UpstreamProfile(latency=80.0, spread=0.3),
+    'openai': UpstreamProfile(latency=1500.0, spread=0.5),
+    'naver': UpstreamProfile(latency=200.0, spread=0.3),
+}
+
+
+def parse_profiles(specs: list[str]) -> dict[str, UpstreamProfile]:
+    """['openai:latency=800,errors=0.05', ...] → 기본 프로필에 덮어쓴 upstream별 프로필"""
+    profiles = dict(DEFAULT_PROFILES)
+    for spec in specs:
+        name, _, params = spec.partition(':')
+        if name not in UPSTREAMS:
+            raise ValueError(f'알 수 없는 upstream: {name} (가능: {", ".join(UPSTREAMS)})')
+        updates: dict[str, Any] = {}
+        for pair in filter(None, params.split(',')):
+            key, _, value = pair.partition('=')
+            if key not in UpstreamProfile.__dataclass_fields__:
+                raise ValueError(f'알 수 없는 프로필 항목: {key}')
+            updates[key] = int(value) if key == 'status' else float(value)
+        profiles[name] = replace(profiles[name], **updates)
+    return profiles
+
+
+# 가나/한자가 있으면 번역 대상 세그먼트
+_JA = re.compile(r'[\u3040-\u30ff\u4e00-\u9fff]')
+_ADJECTIVES = ['北欧', '大容量', '軽量', '防水', '抗菌', '折りたたみ', 'ワイヤレス', '保温', 'コンパクト', 'おしゃれ']
+_NOUNS = ['マグカップ', 'タンブラー', 'イヤホン', 'リュック', '腕時計', 'ランチボックス', '加湿器', 'ドライヤー', 'ニット', '水筒']
+_BRANDS = ['SONY', 'Panasonic', 'ZOJIRUSHI', 'THERMOS', 'MUJI', 'SEIKO', 'Anker', 'TIGER', 'Iris Ohyama', 'Nitori']
+_MATERIALS = ['ステンレス', '陶器', 'ポリエステル', 'ナイロン', '綿100%', 'ABS樹脂']
+_ORIGINS = ['日本製', '中国製', 'ベトナム製']
+_FEATURES = [
+    '毎日使いやすいシンプルなデザインです',
+    '軽くて持ち運びに便利なサイズ感',
+    'お手入れ簡単で清潔に保てます',
+    'ギフトにもおすすめのパッケージ入り',
+    '電子レンジ可',
+    '食洗機対応',
+    '直射日光を避けて保管してください',
+    '手洗いしてください',
+]
+
+
+def product_page(item_id: int, base_url: str, price: int | None = None, in_stock: bool = True) -> str:
+    rnd = random.Random(item_id)
+    brand = rnd.choice(_BRANDS)
+    model = f'{brand[:2].upper()}-{item_id:05d}'
+    title = f'{brand} {rnd.choice(_ADJECTIVES)} {rnd.choice(_NOUNS)} {rnd.choice([350, 480, 600, 1000])}ml {model}'
+    base_price = rnd.randrange(800, 60000, 10)
+    price = price or base_price
+    features = rnd.sample(_FEATURES, 4)
+    specs = {
+        '素材': rnd.choice(_MATERIALS),
+        'サイズ': f'{rnd.randint(5, 40)}×{rnd.randint(5, 40)}×{rnd.randint(5, 40)}cm',
+        '重量': f'{rnd.randint(50, 2000)}g',
+        '原産国': rnd.choice(_ORIGINS),
+        '型番': model,
+    }
+    images = [f'{base_url}/shop/img/{item_id}-{n}.jpg' for n in range(3)]
+    jsonld = {
+        '@context': 'https://schema.org',
+        '@type': 'Product',
+        'name': title,
+        'image': images,
+        'offers': {
+            '@type': 'Offer',
+            'price': price,
+            'priceCurrency': 'JPY',
+            'availability': 'https://schema.org/' + ('InStock' if in_stock else 'OutOfStock'),
+        },
+    }
+    rows = ''.join(f'<tr><th>{k}</th><td>{v}</td></tr>' for k, v in specs.items())
+    items = ''.join(f'<li>{f}</li>' for f in features)
+    return (
+        '<!doctype html><html><head><meta charset="utf-8">'
+        f'<title>{title}</title>'
+        f'<meta property="og:title" content="{title}">'
+        f'<meta property="og:description" content="{brand}の{features[0]}。">'
+        f'<meta property="og:image" content="{images[0]}">'
+        f'<script type="application/ld+json">{json.dumps(jsonld, ensure_ascii=False)}</script>'
+        '</head><body>'
+        f'<h1>{title}</h1><p>{brand}の人気シリーズ。{features[0]}。{features[1]}。</p>'
+        f'<ul>{items}</ul><table>{rows}</table>'
+        '</body></html>'
+    )
+
+
+def image_bytes(name: str) -> bytes:
+    """이름으로 정해지는 가짜 JPEG. 세 번째 이미지(`*-2.jpg`)는 상품과 무관하게 같은 내용(공통 배너)."""
+    seed = 'common-banner' if name.endswith('-2.jpg') else name
+    body = random.Random(seed).randbytes(20_000)
+    return b'\xff\xd8\xff\xe0' + body + b'\xff\xd9'
+
+
+def multipart_files(content_type: str, body: bytes) -> list[bytes]:
+    message = email.parser.BytesParser().parsebytes(f'Content-Type: {content_type}\r\n\r\n'.encode() + body)
+    return [part.get_payload(decode=True) for part in message.get_payload()] if message.is_multipart() else []
+
+
+def create_app(profiles: dict[str, UpstreamProfile], seed: int = 0) -> FastAPI:
+    app = FastAPI(title='fake upstreams')
+    rnd = random.Random(seed)
+    counts: Counter[str] = Counter()
+    lock = threading.Lock()
+    product_seq = iter(range(1, 1 << 62))
+    # 상품 id → {'price': int, 'stock': 'in'|'out'|'gone'}
+    drift: dict[int, dict[str, object]] = {}
+
+    async def simulate(upstream: str) -> Response | None:
+        """프로필대로 지연시키고, 오류를 낼 차례면 오류 응답을 돌려준다."""
+        p = profiles[upstream]
+        with lock:
+            counts[f'{upstream}.requests'] += 1
+            roll = rnd.random()
+            delay = p.latency * rnd.lognormvariate(0.0, p.spread) / 1000 if p.latency > 0 else 0.0
+        if roll < p.hang:
+            with lock:
+                counts[f'{upstream}.hangs'] += 1
+            await asyncio.sleep(p.hang_s)
+            return Response(status_code=504)
+        await asyncio.sleep(delay)
+        if roll < p.hang + p.errors:
+            with lock:
+                counts[f'{upstream}.errors'] += 1
+            return JSONResponse({'error': 'injected'}, status_code=p.status)
+        return None
+
+    @app.get('/shop/item/{item_id}')
+    async def shop_item(item_id: int, request: Request) -> Response:
+        state = drift.get(item_id, {})
+        if state.get('stock') == 'gone':
+            return await simulate('shop') or HTMLResponse('<h1>Not Found</h1>', status_code=404)
+        page = product_page(
+            item_id, str(request.base_url).rstrip('/'), state.get('price'), state.get('stock', 'in') == 'in'
+        )
+        return await simulate('shop') or HTMLResponse(page)
+
+    @app.post('/shop/_drift/{item_id}')
+    def shop_drift(item_id: int, price: int | None = None, stock: str | None = None) -> dict:
+        state = drift.setdefault(item_id, {})
+        if price is not None:
+            state['price'] = price
+        if stock is not None:
+            state['stock'] = stock
+        return {'item_id': item_id, **state}
+
+    @app.get('/shop/img/{name}')
+    async def shop_image(name: str) -> Response:
+        return await simulate('shop') or Response(image_bytes(name), media_type='image/jpeg')
+
+    @app.get('/shop/article/{article_id}')
+    async def shop_article(article_id: int) -> Response:
+        body = f'<html><body><h1>記事 {article_id}</h1><p>{"この商品の使い方とレビューのまとめです。" * 4}</p></body></html>'
+        return await simulate('shop') or HTMLResponse(body)
+
+    @app.get('/ddg/html/')
+    async def ddg_html(request: Request, q: str = '') -> Response:
+        base = str(request.base_url).rstrip('/')
+        links = ''.join(
+            f'<a class="result__a" href="{base}/shop/article/{abs(hash((q, n))) % 100000}">{q} 結果 {n}</a>'
+            for n in range(3)
+        )
+        return await simulate('ddg') or HTMLResponse(f'<html><body>{links}</body></html>')
+
+    @app.get('/ddg/api/')
+    async def ddg_api(q: str = '') -> Response:
+        return await simulate('ddg') or JSONResponse(
+            {'Heading': q, 'AbstractText': f'{q}に関する概要です。', 'AbstractURL': '', 'RelatedTopics': []}
+        )
+
+    @app.get('/wiki/w/api.php')
+    async def wiki_search(srsearch: str = '') -> Response:
+        return await simulate('wikipedia') or JSONResponse({'query': {'search': [{'title': srsearch[:20] or '商品'}]}})
+
+    @app.get('/wiki/api/rest_v1/page/summary/{title}')
+    async def wiki_summary(title: str) -> Response:
+        return await simulate('wikipedia') or JSONResponse(
+            {'extract': f'{title}は日本の製品カテゴリの一つ。', 'content_urls': {'desktop': {'page': ''}}}
+        )
+
+    def _japanese_segments(prompt: dict) -> list[str]:
+        specs = prompt.get('specs') or {}
+        segments = [*(prompt.get('key_features') or []), *specs.keys(), *specs.values()]
+        return [s for s in segments if isinstance(s, str) and _JA.search(s)]
+
+    @app.post('/openai/v1/chat/completions')
+    async def openai_chat(request: Request) -> Response:
+        body = await request.json()
+        failed = await simulate('openai')
+        if failed:
+            return failed
+        prompt = json.loads(body['messages'][-1]['content'])
+        content = {
+            'title_ko': f"{prompt.get('title', '')} (한국어)",
+            'product_judgement_ko': '원문 정보 기준으로 확인된 생활용품입니다.',
+            'summary_ko': '매일 쓰기 좋은 실용적인 상품입니다.',
+            'selling_points_ko': ['가벼운 무게', '간편한 관리', '선물용 포장'],
+            'detail_outline_ko': ['핵심 특징', '상세 스펙', '관리 방법', '구매 전 확인사항'],
+            'detail_sections_ko': ['상품 소개', '핵심 장점', '스펙 안내', '사용 시나리오', '주의사항'],
+            'translated_source_description_ko': '인기 시리즈 상품입니다.',
+            'translated_segments_ko': {seg: f'번역 {n}' for n, seg in enumerate(_japanese_segments(prompt))},
+            'translated_raw_text_snippet_ko': '',
+        }
+        text = json.dumps(content, ensure_ascii=False)
+        return JSONResponse(
+            {
+                'choices': [{'message': {'role': 'assistant', 'content': text}}],
+                'usage': {'prompt_tokens': len(body['messages'][-1]['content']) // 2, 'completion_tokens': len(text) // 2},
+            }
+        )
+
+    @app.post('/naver/v1/oauth2/token')
+    async def naver_token() -> Response:
+        return await simulate('naver') or JSONResponse(
+            {'access_token': 'fake-token', 'expires_in': 10800, 'token_type': 'Bearer'}
+        )
+
+    @app.post('/naver/v2/products')
+    async def naver_create() -> Response:
+        return await simulate('naver') or JSONResponse({'originProductNo': next(product_seq)})
+
+    @app.post('/naver/v1/product-images/upload')
+    async def naver_image_upload(request: Request) -> Response:
+        files = multipart_files(request.headers.get('content-type', ''), await request.body())
+        failed = await simulate('naver')
+        if failed:
+            return failed
+        with lock:
+            counts['naver.images_uploaded'] += len(files)
+        urls = [f'https://shop-phinf.pstatic.net/fake/{hashlib.sha256(f).hexdigest()[:16]}.jpg' for f in files]
+        return JSONResponse({'images': [{'url': u} for u in urls]})
+
+    @app.put('/naver/v1/products/origin-products/{origin_product_no}/option-stock')
+    async def naver_price(origin_product_no: str, request: Request) -> Response:
+        body = await request.body()
+        failed = await simulate('naver')
+        if failed:
+            return failed
+        with lock:
+            counts['naver.option_stock_updates'] += 1
+            counts['naver.update_request_bytes'] += len(body)
+        return JSONResponse({'originProductNo': origin_product_no})
+
+    @app.put('/naver/v2/products/origin-products/{origin_product_no}')
+    async def naver_update(origin_product_no: str, request: Request) -> Response:
+        body = await request.body()
+        failed = await simulate('naver')
+        if failed:
+            return failed
+        with lock:
+            counts['naver.full_updates'] += 1
+            counts['naver.update_request_bytes'] += len(body)
+        return JSONResponse({'originProductNo': origin_product_no})
+
+    @app.get('/_stats')
+    def stats() -> dict[str, int]:
+        with lock:
+            return dict(counts)
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9100)
+    parser.add_argument('--profile', action='append', default=[], help='upstream:key=value,...')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    app = create_app(parse_profiles(args.profile), seed=args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,401 @@
+"""/run-link(-batch) 부하 테스트: 가짜 외부 서비스 + 앱을 띄우고 목표 RPS로 요청을 보낸다.
+
+open-loop 방식(응답을 기다리지 않고 1/RPS 간격으로 발사)이라 앱이 느려지면 동시 요청 수와 지연이 그대로 드러난다.
+--stages로 RPS를 단계별로 올리면 오류율/목표 처리량 미달/p99 SLO 초과가 처음 나타나는 단계를 한계로 보고한다.
+
+실행 예:
+  cd agent_mvp && python -m scripts.loadtest --stages 1x30,2x30,4x30 --batch-size 5
+  python -m scripts.loadtest --stages 2x60 --profile openai:latency=3000,errors=0.05,status=429
+  python -m scripts.loadtest --stages 2x60 --app-workers 4 --json-out loadtest.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+import bcrypt
+import httpx
+
+
+@dataclass
+class Sample:
+    stage: int
+    sent_at: float
+    latency_ms: float
+    status: int  # 0이면 연결 오류/timeout
+    links: int
+
+
+@dataclass
+class Stage:
+    rps: float
+    duration_s: float
+
+
+@dataclass
+class StageReport:
+    rps_target: float
+    duration_s: float
+    sent: int
+    completed: int
+    errors: int
+    error_rate: float
+    throughput_rps: float
+    links_per_s: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    status_counts: dict[str, int] = field(default_factory=dict)
+    rss_mb_max: float = 0.0
+    saturated: bool = False
+    reasons: list[str] = field(default_factory=list)
+
+
+def parse_stages(spec: str) -> list[Stage]:
+    """'1x30,2x30' → [Stage(rps=1, 30초), Stage(rps=2, 30초)]"""
+    stages = []
+    for part in spec.split(','):
+        rps, _, duration = part.strip().partition('x')
+        stages.append(Stage(rps=float(rps), duration_s=float(duration or 30)))
+    return stages
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+def rss_mb(pid: int) -> float:
+    """pid와 하위 프로세스(uvicorn worker, CPU 풀)의 RSS 합계(MB)"""
+    total_kb = 0
+    pending = [pid]
+    while pending:
+        p = pending.pop()
+        try:
+            status = Path(f'/proc/{p}/status').read_text()
+        except OSError:
+            continue
+        for line in status.splitlines():
+            if line.startswith('VmRSS:'):
+                total_kb += int(line.split()[1])
+        for task in Path(f'/proc/{p}/task').glob('*/children'):
+            pending.extend(int(c) for c in task.read_text().split())
+    if total_kb or Path('/proc').exists():
+        return total_kb / 1024
+    # /proc 없는 환경(macOS): 자식 프로세스는 제외하고 본 프로세스만
+    out = subprocess.run(['ps', '-o', 'rss=', '-p', str(pid)], capture_output=True, text=True)
+    return int(out.stdout.strip() or 0) / 1024
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(url: str, proc: subprocess.Popen, timeout_s: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    with httpx.Client(timeout=2.0) as client:
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                raise RuntimeError(f'프로세스가 종료됨: {proc.args}')
+            try:
+                if client.get(url).status_code < 500:
+                    return
+            except httpx.TransportError:
+                pass
+            time.sleep(0.05)
+    raise RuntimeError(f'기동 대기 시간 초과: {url}')
+
+
+def app_env(fake_url: str, data_dir: str) -> dict[str, str]:
+    """앱이 실제 외부 서비스 대신 가짜 서비스만 호출하도록 하는 환경변수"""
+    return {
+        **os.environ,
+        'LLM_ENABLED': 'true',
+        'OPENAI_API_KEY': 'loadtest',
+        'OPENAI_BASE_URL': f'{fake_url}/openai/v1',
+        'DDG_HTML_URL': f'{fake_url}/ddg/html/',
+        'DDG_API_URL': f'{fake_url}/ddg/api/',
+        'WIKIPEDIA_BASE_URL': f'{fake_url}/wiki',
+        'NAVER_USE_REAL_API': 'true',
+        'NAVER_API_BASE_URL': f'{fake_url}/naver',
+        'NAVER_CLIENT_ID': 'loadtest',
+        # 네이버 서명은 client_secret을 bcrypt salt로 쓴다.
+        'NAVER_CLIENT_SECRET': bcrypt.gensalt(rounds=4).decode(),
+        'NAVER_ACCOUNT_ID': 'loadtest',
+        'NAVER_DEFAULT_REPRESENTATIVE_IMAGE_URL': f'{fake_url}/shop/img/default.jpg',
+        'CATALOG_DB_PATH': f'{data_dir}/catalog.sqlite3',
+        'TRANSLATION_MEMORY_DB_PATH': f'{data_dir}/translation_memory.sqlite3',
+        'NEAR_DUPLICATE_DB_PATH': f'{data_dir}/near_duplicates.sqlite3',
+        'NAVER_IMAGE_CACHE_DB_PATH': f'{data_dir}/naver_images.sqlite3',
+        'NAVER_PAYLOAD_DB_PATH': f'{data_dir}/naver_payloads.sqlite3',
+        'WARM_UP_ON_STARTUP': 'false',
+        # 기본 마진으로는 가짜 상품 대부분이 사전검사에서 반려돼 LLM/네이버 경로가 빠진다.
+        'DEFAULT_MARKUP_RATE': '0.6',
+    }
+
+
+class LoadDriver:
+    def __init__(self, args: argparse.Namespace, app_url: str, fake_url: str, app_pid: Optional[int]) -> None:
+        self.args = args
+        self.app_url = app_url
+        self.fake_url = fake_url
+        self.app_pid = app_pid
+        self.samples: list[Sample] = []
+        self.rss: list[tuple[float, float]] = []
+        self.in_flight = 0
+        self._item_ids = itertools.count(args.item_offset)
+        self._started = 0.0
+
+    def _next_urls(self) -> list[str]:
+        urls = []
+        for _ in range(self.args.batch_size):
+            item_id = next(self._item_ids)
+            if self.args.repeat_rate and item_id % int(1 / self.args.repeat_rate) == 0:
+                item_id = self.args.item_offset  # 같은 링크 재요청(single-flight/재처리 경로)
+            urls.append(f'{self.fake_url}/shop/item/{item_id}?utm_source=loadtest')
+        return urls
+
+    async def _one(self, client: httpx.AsyncClient, stage: int) -> None:
+        urls = self._next_urls()
+        params = {'profile': self.args.response_profile}
+        if self.args.batch_size == 1 and not self.args.force_batch:
+            path, body = '/run-link', {'source_url': urls[0], 'auto_publish': self.args.auto_publish}
+        else:
+            path, body = '/run-link-batch', {'source_urls': urls, 'auto_publish': self.args.auto_publish}
+        sent = time.perf_counter()
+        self.in_flight += 1
+        try:
+            res = await client.post(f'{self.app_url}{path}', params=params, json=body)
+            status = res.status_code
+        except httpx.HTTPError:
+            status = 0
+        finally:
+            self.in_flight -= 1
+        self.samples.append(
+            Sample(stage, sent - self._started, (time.perf_counter() - sent) * 1000, status, len(urls))
+        )
+
+    async def _sample_rss(self) -> None:
+        while True:
+            if self.app_pid:
+                self.rss.append((time.perf_counter() - self._started, rss_mb(self.app_pid)))
+            await asyncio.sleep(1.0)
+
+    async def _progress(self) -> None:
+        every = self.args.report_every
+        last = 0
+        while True:
+            await asyncio.sleep(every)
+            now = time.perf_counter() - self._started
+            window = self.samples[last:]
+            last = len(self.samples)
+            lat = sorted(s.latency_ms for s in window if s.status and s.status < 400)
+            errors = sum(1 for s in window if not s.status or s.status >= 400)
+            rss = f'{self.rss[-1][1]:.0f}MB' if self.rss else '-'
+            print(
+                f'[{now:6.1f}s] done {len(window) / every:5.2f}/s  p50 {percentile(lat, 0.5):7.0f}  '
+                f'p95 {percentile(lat, 0.95):7.0f}  p99 {percentile(lat, 0.99):7.0f} ms  '
+                f'err {errors}  in-flight {self.in_flight}  rss {rss}',
+                flush=True,
+            )
+
+    async def run(self, stages: list[Stage]) -> None:
+        limits = httpx.Limits(max_connections=self.args.max_connections, max_keepalive_connections=100)
+        async with httpx.AsyncClient(timeout=self.args.timeout, limits=limits) as client:
+            self._started = time.perf_counter()
+            background = [asyncio.create_task(self._sample_rss()), asyncio.create_task(self._progress())]
+            tasks: list[asyncio.Task] = []
+            t = 0.0
+            for idx, stage in enumerate(stages):
+                print(f'--- stage {idx + 1}: {stage.rps:g} rps x {stage.duration_s:g}s', flush=True)
+                stage_end = t + stage.duration_s
+                interval = 1.0 / stage.rps
+                while t < stage_end:
+                    delay = self._started + t - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    tasks.append(asyncio.create_task(self._one(client, idx)))
+                    t += interval
+                t = stage_end
+            await asyncio.gather(*tasks)
+            for b in background:
+                b.cancel()
+
+    def report(self, stages: list[Stage]) -> list[StageReport]:
+        reports = []
+        t = 0.0
+        for idx, stage in enumerate(stages):
+            samples = [s for s in self.samples if s.stage == idx]
+            ok = [s for s in samples if s.status and s.status < 400]
+            lat = sorted(s.latency_ms for s in ok)
+            # 처리량: 단계 안에 보낸 요청이 끝날 때까지 걸린 시간 기준
+            span = max((s.sent_at + s.latency_ms / 1000 for s in samples), default=t + stage.duration_s) - t
+            span = max(span, stage.duration_s)
+            statuses: dict[str, int] = {}
+            for s in samples:
+                statuses[str(s.status or 'conn_error')] = statuses.get(str(s.status or 'conn_error'), 0) + 1
+            rss = [mb for at, mb in self.rss if t <= at < t + span]
+            r = StageReport(
+                rps_target=stage.rps,
+                duration_s=stage.duration_s,
+                sent=len(samples),
+                completed=len(ok),
+                errors=len(samples) - len(ok),
+                error_rate=round((len(samples) - len(ok)) / len(samples), 4) if samples else 0.0,
+                throughput_rps=round(len(ok) / span, 3),
+                links_per_s=round(sum(s.links for s in ok) / span, 3),
+                p50_ms=round(percentile(lat, 0.5), 1),
+                p95_ms=round(percentile(lat, 0.95), 1),
+                p99_ms=round(percentile(lat, 0.99), 1),
+                max_ms=round(lat[-1], 1) if lat else 0.0,
+                status_counts=statuses,
+                rss_mb_max=round(max(rss), 1) if rss else 0.0,
+            )
+            if r.error_rate > self.args.max_error_rate:
+                r.reasons.append(f'오류율 {r.error_rate:.1%} > {self.args.max_error_rate:.1%}')
+            if r.throughput_rps < stage.rps * 0.9:
+                r.reasons.append(f'처리량 {r.throughput_rps:g}/s < 목표의 90%')
+            if r.p99_ms > self.args.slo_p99_ms:
+                r.reasons.append(f'p99 {r.p99_ms:.0f}ms > SLO {self.args.slo_p99_ms:.0f}ms')
+            r.saturated = bool(r.reasons)
+            reports.append(r)
+            t += stage.duration_s
+        return reports
+
+
+def _get_json(client: httpx.Client, url: str) -> dict[str, Any]:
+    try:
+        return client.get(url).json()
+    except httpx.HTTPError as e:
+        return {'error': f'{type(e).__name__}: {e}'}
+
+
+def _print_reports(reports: list[StageReport]) -> None:
+    print()
+    print(f"{'rps':>6} {'sent':>6} {'ok':>6} {'err%':>6} {'thru/s':>7} {'links/s':>8} "
+          f"{'p50':>7} {'p95':>7} {'p99':>7} {'rss':>7}")
+    for r in reports:
+        print(
+            f'{r.rps_target:6g} {r.sent:6d} {r.completed:6d} {r.error_rate * 100:6.1f} {r.throughput_rps:7.2f} '
+            f'{r.links_per_s:8.2f} {r.p50_ms:7.0f} {r.p95_ms:7.0f} {r.p99_ms:7.0f} {r.rss_mb_max:6.0f}M'
+            + ('  <- ' + '; '.join(r.reasons) if r.saturated else '')
+        )
+    broken = next((r for r in reports if r.saturated), None)
+    if broken:
+        print(f'\n한계: {broken.rps_target:g} rps 단계에서 처음 포화 ({"; ".join(broken.reasons)})')
+    else:
+        print('\n모든 단계가 기준 안에서 처리됨')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--stages', default='1x30,2x30,4x30', help='RPSxSECONDS,... (예: 1x30,2x30)')
+    parser.add_argument('--batch-size', type=int, default=5, help='요청당 링크 수(1이면 /run-link)')
+    parser.add_argument('--force-batch', action='store_true', help='batch-size 1이어도 /run-link-batch 사용')
+    parser.add_argument('--auto-publish', action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument('--response-profile', default='sheet', choices=['full', 'sheet', 'ids-only'])
+    parser.add_argument('--repeat-rate', type=float, default=0.0, help='같은 링크를 다시 보내는 비율')
+    parser.add_argument('--item-offset', type=int, default=1)
+    parser.add_argument('--profile', action='append', default=[], help='가짜 upstream 프로필(fake_upstreams 참고)')
+    parser.add_argument('--app-url', help='이미 떠 있는 앱 주소(지정 시 앱을 직접 띄우지 않음)')
+    parser.add_argument('--app-pid', type=int, help='--app-url 사용 시 메모리를 잴 프로세스')
+    parser.add_argument('--fake-url', help='이미 떠 있는 가짜 upstream 주소')
+    parser.add_argument('--app-workers', type=int, default=1)
+    parser.add_argument('--app-env', action='append', default=[], help='앱에 추가로 줄 KEY=VALUE')
+    parser.add_argument('--timeout', type=float, default=300.0)
+    parser.add_argument('--max-connections', type=int, default=1000)
+    parser.add_argument('--report-every', type=float, default=5.0)
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--slo-p99-ms', type=float, default=60000.0)
+    parser.add_argument('--json-out')
+    args = parser.parse_args()
+    stages = parse_stages(args.stages)
+
+    procs: list[subprocess.Popen] = []
+    data_dir = tempfile.TemporaryDirectory(prefix='loadtest-')
+    try:
+        fake_url = args.fake_url
+        if not fake_url:
+            port = _free_port()
+            cmd = [sys.executable, '-m', 'scripts.fake_upstreams', '--port', str(port)]
+            for p in args.profile:
+                cmd += ['--profile', p]
+            procs.append(subprocess.Popen(cmd))
+            fake_url = f'http://127.0.0.1:{port}'
+            _wait_ready(f'{fake_url}/_stats', procs[-1])
+
+        app_url, app_pid = args.app_url, args.app_pid
+        if not app_url:
+            port = _free_port()
+            env = app_env(fake_url, data_dir.name)
+            env.update(kv.split('=', 1) for kv in args.app_env)
+            cmd = [sys.executable, '-m', 'uvicorn', 'app.main:app', '--port', str(port), '--log-level', 'warning']
+            if args.app_workers > 1:
+                cmd += ['--workers', str(args.app_workers)]
+            procs.append(subprocess.Popen(cmd, env=env))
+            app_url, app_pid = f'http://127.0.0.1:{port}', procs[-1].pid
+            _wait_ready(f'{app_url}/health', procs[-1])
+            httpx.post(f'{app_url}/warmup', timeout=120.0)
+
+        print(f'app {app_url}  fake upstreams {fake_url}', flush=True)
+        driver = LoadDriver(args, app_url, fake_url, app_pid)
+        asyncio.run(driver.run(stages))
+        reports = driver.report(stages)
+        _print_reports(reports)
+
+        # 클라이언트 timeout으로 끊긴 요청은 앱 안에서 계속 돌고 있을 수 있어 넉넉히 기다린다.
+        with httpx.Client(timeout=60.0) as client:
+            upstream_stats = _get_json(client, f'{fake_url}/_stats')
+            app_metrics = _get_json(client, f'{app_url}/metrics') if args.app_workers == 1 else {}
+            health = _get_json(client, f'{app_url}/health')
+        print(f"upstream 호출: {json.dumps(upstream_stats, sort_keys=True)}")
+        print(f"degraded upstreams: {health.get('degraded_upstreams') or '-'}")
+        if args.json_out:
+            Path(args.json_out).write_text(
+                json.dumps(
+                    {
+                        'args': vars(args),
+                        'stages': [asdict(r) for r in reports],
+                        'rss_mb': driver.rss,
+                        'upstream_calls': upstream_stats,
+                        'app_metrics': app_metrics,
+                        'health': health,
+                    },
+                    ensure_ascii=False,
+                    indent=2,
+                    default=str,
+                ),
+                encoding='utf-8',
+            )
+            print(f'결과 저장: {args.json_out}')
+    finally:
+        for proc in reversed(procs):
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        data_dir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
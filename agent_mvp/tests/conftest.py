@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import pytest
+
+from app.config import settings
+
+
+@pytest.fixture(autouse=True)
+def isolated_settings(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    """SQLite 경로는 테스트별 임시 디렉터리, 외부 호출(LLM/네이버 실연동)은 끈다."""
+    for name in (
+        'catalog_db_path',
+        'translation_memory_db_path',
+        'near_duplicate_db_path',
+        'naver_payload_db_path',
+        'naver_image_cache_db_path',
+        'http_cassette_path',
+    ):
+        monkeypatch.setattr(settings, name, str(tmp_path / f'{name}.sqlite3'))
+    monkeypatch.setattr(settings, 'llm_enabled', False)
+    monkeypatch.setattr(settings, 'naver_use_real_api', False)
+    monkeypatch.setattr(settings, 'http_cassette_mode', 'off')
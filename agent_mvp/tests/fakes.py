@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import Any
+from typing import Optional
+
+from app.tools.base import MarketPublishPayload, MarketPublishResponse
+
+
+class RecordingPublisher:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, Any]] = []
+
+    def publish(self, payload: MarketPublishPayload) -> MarketPublishResponse:
+        self.calls.append(('publish', payload.product_payload))
+        return MarketPublishResponse(success=True, market_product_id='9000001', message='ok')
+
+    def update_product(self, market_product_id: str, product_payload: dict[str, Any]) -> MarketPublishResponse:
+        self.calls.append(('update_product', product_payload))
+        return MarketPublishResponse(success=True, market_product_id=market_product_id, message='ok')
+
+    def update_option_stock(
+        self, market_product_id: str, sale_price_krw: Optional[int] = None, stock_quantity: Optional[int] = None
+    ) -> MarketPublishResponse:
+        self.calls.append(('update_option_stock', sale_price_krw))
+        return MarketPublishResponse(success=True, market_product_id=market_product_id, message='ok')
+
+    def update_price(self, market_product_id: str, sale_price_krw: int) -> MarketPublishResponse:
+        self.calls.append(('update_price', sale_price_krw))
+        return MarketPublishResponse(success=True, market_product_id=market_product_id, message='ok')
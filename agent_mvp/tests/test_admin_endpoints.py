@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app import main
+from app.main import app
+
+TOKEN = 'test-admin-token'
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch) -> TestClient:
+    monkeypatch.setattr(settings, 'admin_token', TOKEN)
+    # 테스트마다 임시 DB 경로로 서비스를 새로 만든다
+    monkeypatch.setattr(main, '_service', None)
+    return TestClient(app)
+
+
+def test_reprice_requires_admin_token(client: TestClient) -> None:
+    body = {'fx_rate': 9.0, 'dry_run': True}
+    assert client.post('/catalog/reprice', json=body).status_code == 403
+    assert client.post('/catalog/reprice', json=body, headers={'X-Admin-Token': 'wrong'}).status_code == 403
+    assert client.post('/catalog/reprice', json=body, headers={'X-Admin-Token': TOKEN}).status_code == 200
+
+
+def test_admin_endpoints_disabled_without_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, 'admin_token', None)
+    assert TestClient(app).post('/catalog/reprice', json={'fx_rate': 9.0}).status_code == 404
+
+
+@pytest.mark.parametrize(
+    'path, body',
+    [
+        ('/recrawl/run', {'limit': 1}),
+        ('/catalog/drift/apply', {'ids': [1], 'push_updates': False}),
+        ('/catalog/drift/dismiss', {'ids': [1]}),
+    ],
+)
+def test_recrawl_and_drift_require_admin_token(client: TestClient, path: str, body: dict) -> None:
+    assert client.post(path, json=body).status_code == 403
+    assert client.post(path, json=body, headers={'X-Admin-Token': TOKEN}).status_code == 200
+
+
+def test_translation_memory_upsert_requires_admin_token(client: TestClient) -> None:
+    body = {'entries': [{'ja': '素材', 'ko': '소재'}]}
+    assert client.post('/translation-memory', json=body).status_code == 403
+    res = client.post('/translation-memory', json=body, headers={'X-Admin-Token': TOKEN})
+    assert res.status_code == 200
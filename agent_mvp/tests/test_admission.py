@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.services.admission import (
+    LANE_BATCH,
+    LANE_INTERACTIVE,
+    AdmissionController,
+    AdmissionMiddleware,
+    AdmissionRejected,
+    lane_for,
+)
+
+
+@pytest.fixture
+def controller(monkeypatch: pytest.MonkeyPatch) -> AdmissionController:
+    # 슬롯 3개 중 1개는 interactive 예약 → batch는 최대 2개
+    monkeypatch.setattr(settings, 'admission_max_concurrency', 3)
+    monkeypatch.setattr(settings, 'admission_interactive_reserved', 1)
+    monkeypatch.setattr(settings, 'admission_interactive_queue', 4)
+    monkeypatch.setattr(settings, 'admission_interactive_max_wait_s', 1.0)
+    monkeypatch.setattr(settings, 'admission_batch_queue', 1)
+    monkeypatch.setattr(settings, 'admission_batch_max_wait_s', 0.05)
+    return AdmissionController()
+
+
+def test_route_lanes() -> None:
+    assert lane_for('/run-link') == LANE_INTERACTIVE
+    assert lane_for('/pricing/simulate/') == LANE_INTERACTIVE
+    assert lane_for('/bulk/run') == LANE_BATCH
+    assert lane_for('/health') is None
+    assert lane_for('/admin/profiles') is None
+
+
+def test_batch_leaves_the_reserved_slot_for_interactive(controller: AdmissionController) -> None:
+    async def scenario() -> None:
+        await controller.acquire(LANE_BATCH)
+        await controller.acquire(LANE_BATCH)
+        # batch는 예약 슬롯을 못 쓰고 대기하다 시간 초과
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire(LANE_BATCH)
+        assert rejected.value.reason == 'timeout'
+        # interactive는 기다리지 않는다
+        assert await controller.acquire(LANE_INTERACTIVE) == 0.0
+
+    asyncio.run(scenario())
+    lanes = controller.snapshot()['lanes']
+    assert (lanes[LANE_BATCH]['running'], lanes[LANE_INTERACTIVE]['running']) == (2, 1)
+    assert lanes[LANE_BATCH]['rejected_timeout'] == 1
+
+
+def test_full_batch_queue_is_rejected_with_retry_after(controller: AdmissionController) -> None:
+    async def scenario() -> None:
+        await controller.acquire(LANE_BATCH)
+        await controller.acquire(LANE_BATCH)
+        queued = asyncio.create_task(controller.acquire(LANE_BATCH))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire(LANE_BATCH)
+        assert rejected.value.reason == 'queue_full'
+        assert rejected.value.retry_after_s >= 1
+        with pytest.raises(AdmissionRejected):
+            await queued
+
+    asyncio.run(scenario())
+    assert controller.snapshot()['lanes'][LANE_BATCH]['rejected_queue_full'] == 1
+
+
+def test_released_slot_goes_to_interactive_before_batch(
+    controller: AdmissionController, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(controller._lanes[LANE_BATCH], 'max_wait_s', 1.0)
+
+    async def scenario() -> list[str]:
+        for lane in (LANE_BATCH, LANE_BATCH, LANE_INTERACTIVE):
+            await controller.acquire(lane)
+        order: list[str] = []
+
+        async def wait(lane: str) -> None:
+            await controller.acquire(lane)
+            order.append(lane)
+
+        batch = asyncio.create_task(wait(LANE_BATCH))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(wait(LANE_INTERACTIVE))
+        await asyncio.sleep(0)
+        # batch가 먼저 줄 섰어도 interactive 슬롯 반납분은 interactive가 받는다
+        controller.release(LANE_INTERACTIVE, 0.01)
+        await interactive
+        assert not batch.done()
+        # batch는 전체 실행 수가 batch 슬롯(2) 아래로 내려가야 들어간다
+        controller.release(LANE_BATCH, 0.01)
+        await asyncio.sleep(0.01)
+        assert not batch.done()
+        controller.release(LANE_INTERACTIVE, 0.01)
+        await batch
+        return order
+
+    assert asyncio.run(scenario()) == [LANE_INTERACTIVE, LANE_BATCH]
+
+
+def test_middleware_answers_429_with_retry_after(controller: AdmissionController) -> None:
+    async def app(scope, receive, send) -> None:
+        await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+        await send({'type': 'http.response.body', 'body': b'{}'})
+
+    middleware = AdmissionMiddleware(app, controller)
+
+    async def call(path: str) -> list[dict]:
+        sent: list[dict] = []
+
+        async def send(message: dict) -> None:
+            sent.append(message)
+
+        await middleware({'type': 'http', 'path': path}, None, send)
+        return sent
+
+    async def scenario() -> tuple[list[dict], list[dict]]:
+        await controller.acquire(LANE_BATCH)
+        await controller.acquire(LANE_BATCH)
+        return await call('/bulk/run'), await call('/run-link')
+
+    rejected, admitted = asyncio.run(scenario())
+    assert rejected[0]['status'] == 429
+    assert (b'retry-after', b'1') in rejected[0]['headers']
+    assert admitted[0]['status'] == 200
+    assert (b'x-admission-lane', b'interactive') in admitted[0]['headers']
+    # 응답이 끝나면 interactive 슬롯 반납
+    assert controller.snapshot()['lanes'][LANE_INTERACTIVE]['running'] == 0
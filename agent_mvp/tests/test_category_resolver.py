@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import pytest
+
+from app.config import settings
+from app.services.category_resolver import SAMPLE_TREE_PATH, NaverCategoryResolver
+
+
+@pytest.fixture
+def resolver() -> NaverCategoryResolver:
+    return NaverCategoryResolver.from_file(SAMPLE_TREE_PATH)
+
+
+def test_leaf_label_as_whole_word_resolves(resolver: NaverCategoryResolver) -> None:
+    match = resolver.resolve('Anker USB-C ケーブル 1m 急速充電')
+    assert match is not None
+    assert match.leaf_category_id == 50001204
+
+
+def test_shared_bigram_is_not_a_label_match(resolver: NaverCategoryResolver) -> None:
+    # 食パン과 パンツ는 パン bigram만 겹친다
+    assert resolver.resolve('食パン 6枚切り 国産小麦') is None
+    assert resolver.resolve('ケーブルカー 模型 鉄道') is None
+
+
+def test_no_tree_configured_means_default_leaf(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, 'naver_category_tree_path', '')
+    resolver = NaverCategoryResolver.from_settings()
+    assert resolver.leaf_count == 0
+    assert resolver.resolve('Anker USB-C ケーブル 1m 急速充電') is None
+
+
+def test_configured_tree_is_loaded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, 'naver_category_tree_path', str(SAMPLE_TREE_PATH))
+    assert NaverCategoryResolver.from_settings().leaf_count > 0
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import json
+
+from app.services.html_parsing import detect_availability, parse_source_snapshot
+
+RECOMMENDATIONS = '<ul class="reco"><li>他のカラー: ブラック 在庫切れ</li><li>sold out</li></ul>'
+
+
+def _page(body: str, availability: str = '') -> str:
+    jsonld = ''
+    if availability:
+        product = {'@type': 'Product', 'name': 'テスト商品', 'offers': {'price': '1200', 'availability': availability}}
+        jsonld = f'<script type="application/ld+json">{json.dumps(product)}</script>'
+    return f'<html><head>{jsonld}</head><body><h1>テスト商品</h1><span id="price">￥1,200</span>{body}</body></html>'
+
+
+def test_structured_in_stock_wins_over_sold_out_text_elsewhere() -> None:
+    html = _page(RECOMMENDATIONS, availability='https://schema.org/InStock')
+    assert parse_source_snapshot(html.encode('utf-8'))['availability'] == 'in_stock'
+
+
+def test_sold_out_text_outside_buy_box_is_ignored() -> None:
+    assert detect_availability(_page(RECOMMENDATIONS)) is None
+
+
+def test_sold_out_text_inside_availability_block_is_detected() -> None:
+    html = _page('<div id="availability"><span class="a-color-price">現在在庫切れです。</span></div>' + RECOMMENDATIONS)
+    assert detect_availability(html) == 'out_of_stock'
+
+
+def test_disabled_cart_button_text_is_detected() -> None:
+    assert detect_availability(_page('<button class="btn add-to-cart" disabled>売り切れ</button>')) == 'out_of_stock'
+
+
+def test_microdata_availability_is_structured() -> None:
+    html = _page('<link itemprop="availability" href="https://schema.org/OutOfStock" />')
+    assert detect_availability(html) == 'out_of_stock'
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import pytest
+
+from app.config import settings
+from app.services.naver_images import NaverImageStore, NaverImageUploader
+
+SRC = 'https://cdn.shop.example/item/main.jpg'
+PNG = b'\x89PNG\r\n\x1a\n'
+
+
+class FakeImageClient:
+    def __init__(self) -> None:
+        self.uploads: list[str] = []
+
+    def upload_images(self, images: list[tuple[str, bytes, str]]) -> list[str]:
+        names = [name for name, _, _ in images]
+        self.uploads.extend(names)
+        return [f'https://shop-phinf.example/{name}' for name in names]
+
+
+@pytest.fixture
+def uploader(monkeypatch: pytest.MonkeyPatch) -> NaverImageUploader:
+    up = NaverImageUploader(FakeImageClient(), NaverImageStore(':memory:'))
+    up.served = {SRC: PNG + b'v1'}
+    up.downloads = []
+
+    def download(http, url: str) -> bytes:
+        up.downloads.append(url)
+        return up.served[url]
+
+    monkeypatch.setattr(up, '_download', download)
+    return up
+
+
+def _age_sources(store: NaverImageStore, seconds: float) -> None:
+    from app.services.naver_images import _now
+
+    with store._conn:
+        store._conn.execute('UPDATE source_images SET fetched_at = ?', (_now(-seconds),))
+
+
+def test_fresh_source_mapping_is_a_cache_hit(uploader: NaverImageUploader) -> None:
+    first = uploader.upload([SRC])
+    again = uploader.upload([SRC])
+    assert again.urls == first.urls
+    assert again.cache_hits == 1
+    assert uploader.downloads == [SRC]
+
+
+def test_expired_mapping_picks_up_a_replaced_image(
+    uploader: NaverImageUploader, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, 'naver_image_source_ttl_s', 3600)
+    first = uploader.upload([SRC])
+    # 몰이 같은 URL의 이미지를 바꿔 올림
+    uploader.served[SRC] = PNG + b'v2'
+    _age_sources(uploader.store, 7200)
+
+    again = uploader.upload([SRC])
+    assert again.cache_hits == 0
+    assert again.urls[SRC] != first.urls[SRC]
+    assert len(uploader.client.uploads) == 2
+
+
+def test_expired_mapping_with_same_content_is_not_reuploaded(
+    uploader: NaverImageUploader, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, 'naver_image_source_ttl_s', 3600)
+    first = uploader.upload([SRC])
+    _age_sources(uploader.store, 7200)
+
+    again = uploader.upload([SRC])
+    assert again.urls == first.urls
+    assert (again.downloaded, again.uploaded, again.deduplicated) == (1, 0, 1)
+    assert len(uploader.client.uploads) == 1
+    # 다시 확인했으니 매핑은 새로 유효
+    assert uploader.upload([SRC]).cache_hits == 1
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+from app.services.naver_sync import (
+    UPDATE_FULL,
+    UPDATE_OPTION_STOCK,
+    UPDATE_SKIP,
+    NaverProductSync,
+    SentPayloadStore,
+    plan_update,
+)
+from app.tools.base import MarketPublishResponse
+from tests.fakes import RecordingPublisher
+
+PAYLOAD: dict[str, Any] = {
+    'originProduct': {
+        'name': '조지루시 스테인리스 머그 480ml',
+        'salePrice': 29900,
+        'stockQuantity': 10,
+        'images': {'representativeImage': {'url': 'https://shop-phinf.example/a.jpg'}, 'optionalImages': []},
+        'detailContent': '<p>상세</p>',
+    },
+    'smartstoreChannelProduct': {'naverShoppingRegistration': True},
+}
+
+
+def _changed(**origin: Any) -> dict[str, Any]:
+    new = copy.deepcopy(PAYLOAD)
+    new['originProduct'].update(origin)
+    return new
+
+
+def test_no_baseline_is_a_full_update() -> None:
+    assert plan_update(None, PAYLOAD).kind == UPDATE_FULL
+
+
+def test_identical_payload_is_skipped() -> None:
+    plan = plan_update(PAYLOAD, copy.deepcopy(PAYLOAD))
+    assert plan.kind == UPDATE_SKIP
+    assert plan.changed_paths == []
+
+
+def test_price_only_change_uses_option_stock() -> None:
+    plan = plan_update(PAYLOAD, _changed(salePrice=31900))
+    assert plan.kind == UPDATE_OPTION_STOCK
+    assert (plan.sale_price_krw, plan.stock_quantity) == (31900, None)
+
+
+def test_price_and_stock_change_uses_option_stock() -> None:
+    plan = plan_update(PAYLOAD, _changed(salePrice=31900, stockQuantity=0))
+    assert plan.kind == UPDATE_OPTION_STOCK
+    assert (plan.sale_price_krw, plan.stock_quantity) == (31900, 0)
+
+
+def test_any_other_change_is_a_full_update() -> None:
+    plan = plan_update(PAYLOAD, _changed(salePrice=31900, name='조지루시 스테인리스 머그 600ml'))
+    assert plan.kind == UPDATE_FULL
+    assert plan.changed_paths == ['originProduct.name', 'originProduct.salePrice']
+
+
+def test_list_values_compare_as_a_whole() -> None:
+    new = copy.deepcopy(PAYLOAD)
+    new['originProduct']['images']['optionalImages'] = [{'url': 'https://shop-phinf.example/b.jpg'}]
+    plan = plan_update(PAYLOAD, new)
+    assert plan.kind == UPDATE_FULL
+    assert plan.changed_paths == ['originProduct.images.optionalImages']
+
+
+def test_removed_field_is_a_change() -> None:
+    new = copy.deepcopy(PAYLOAD)
+    del new['smartstoreChannelProduct']
+    assert plan_update(PAYLOAD, new).kind == UPDATE_FULL
+
+
+class FailingPublisher(RecordingPublisher):
+    def update_option_stock(self, market_product_id: str, sale_price_krw=None, stock_quantity=None):
+        super().update_option_stock(market_product_id, sale_price_krw, stock_quantity)
+        return MarketPublishResponse(success=False, market_product_id=market_product_id, message='500')
+
+
+def test_failed_update_keeps_the_old_baseline() -> None:
+    sync = NaverProductSync(FailingPublisher(), SentPayloadStore(':memory:'))
+    sync.record_created('1', PAYLOAD, None)
+
+    assert not sync.sync('1', _changed(salePrice=31900)).response.success
+    # 실패했으니 다음 동기화에서도 같은 차이를 다시 보낸다
+    assert sync.sync('1', _changed(salePrice=31900)).kind == UPDATE_OPTION_STOCK
+    assert sync.store.get('1') == PAYLOAD
+
+
+def test_update_price_skips_when_price_already_sent() -> None:
+    publisher = RecordingPublisher()
+    sync = NaverProductSync(publisher, SentPayloadStore(':memory:'))
+    sync.record_created('1', PAYLOAD, None)
+
+    sync.update_price('1', 29900)
+    sync.update_price('1', 31900)
+    assert publisher.calls == [('update_option_stock', 31900)]
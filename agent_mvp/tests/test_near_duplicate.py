@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pytest
+
+from app.services.near_duplicate import NearDuplicateIndex, variant_attributes
+
+ENRICHMENT = {'title_ko': '보강 결과'}
+
+
+@pytest.fixture
+def index() -> NearDuplicateIndex:
+    return NearDuplicateIndex(':memory:')
+
+
+def _find(index: NearDuplicateIndex, stored: tuple[str, list[str]], query: tuple[str, list[str]]):
+    index.add('https://shop-a.example/item/1', stored[0], stored[1], {}, ENRICHMENT)
+    return index.find('https://shop-b.example/item/2', query[0], query[1], {})
+
+
+def test_same_product_from_another_shop_matches(index: NearDuplicateIndex) -> None:
+    match = _find(
+        index,
+        ('象印 ステンレスマグ SM-ZB48 ブラック 480ml', ['SM-ZB48']),
+        ('【送料無料】象印 SM-ZB48 ステンレスマグ 480ml 黒', ['SM-ZB48']),
+    )
+    assert match is not None and match.model_match
+
+
+@pytest.mark.parametrize(
+    'stored, query',
+    [
+        (('ユニクロ エアリズム Tシャツ Mサイズ', []), ('ユニクロ エアリズム Tシャツ Lサイズ', [])),
+        (('無印良品 ポリプロピレン収納ケース 深型', []), ('無印良品 ポリプロピレン収納ケース 浅型', [])),
+        (('象印 ステンレスマグ SM-ZB48 ブラック', ['SM-ZB48']), ('象印 ステンレスマグ SM-ZB48 ホワイト', ['SM-ZB48'])),
+    ],
+)
+def test_size_and_colour_variants_do_not_match(index: NearDuplicateIndex, stored, query) -> None:
+    assert _find(index, stored, query) is None
+
+
+@pytest.mark.parametrize(
+    'stored, query',
+    [
+        (
+            ('パナソニック ラムダッシュ メンズシェーバー ES-LV9A 5枚刃', ['ES-LV9A']),
+            ('パナソニック 替刃 ラムダッシュ ES-LV9A 対応 5枚刃', ['ES-LV9A']),
+        ),
+        (
+            ('Anker PowerCore 10000 A1263', ['A1263']),
+            ('Anker PowerCore 10000 専用ケース A1263 対応', ['A1263']),
+        ),
+    ],
+)
+def test_accessory_does_not_match_host_product(index: NearDuplicateIndex, stored, query) -> None:
+    assert _find(index, stored, query) is None
+    # 반대 방향(부속품이 먼저 색인된 경우)도 마찬가지
+    other = NearDuplicateIndex(':memory:')
+    assert _find(other, query, stored) is None
+
+
+def test_same_accessory_from_another_shop_matches(index: NearDuplicateIndex) -> None:
+    match = _find(
+        index,
+        ('パナソニック 替刃 ラムダッシュ ES-LV9A 対応 5枚刃', ['ES-LV9A']),
+        ('ラムダッシュ 替刃 ES-LV9A対応 5枚刃 パナソニック', ['ES-LV9A']),
+    )
+    assert match is not None
+
+
+def test_accessory_markers() -> None:
+    assert variant_attributes('iPhone 15 用 ケース')['accessory'] == {'ケース'}
+    assert variant_attributes('ES-LV9A用')['accessory'] == {'対応品'}
+    assert variant_attributes('メンズシェーバー 家庭用')['accessory'] == {'本体'}
+    assert variant_attributes('収納ケース付き シェーバー')['accessory'] == {'本体'}
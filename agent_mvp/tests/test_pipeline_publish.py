@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from typing import Any
+from typing import Optional
+
+import pytest
+
+from app.config import settings
+from app.services.catalog_store import CatalogStore
+from app.services.naver_sync import NaverProductSync, SentPayloadStore
+from app.services.pipeline import LinkPipelineService
+from tests.fakes import RecordingPublisher
+
+URL = 'https://www.amazon.co.jp/dp/B0TEST0001'
+
+
+class FakeLLM:
+    """fetch 성공/실패를 바꿔 가며 원문 수집 결과를 돌려준다(보강은 하지 않음)."""
+
+    def __init__(self) -> None:
+        self.fetched = True
+        self.price_jpy = 2000
+
+    def fetch_source_product(self, source_url: str) -> dict[str, Any]:
+        if self.fetched:
+            return self._source(source_url, '象印 ステンレスマグ SM-ZB48', self.price_jpy, True)
+        # LLMClient.fetch_source_product의 실패 fallback과 같은 샘플 값
+        return self._source(source_url, 'Amazon JP 샘플 상품', 6800, False)
+
+    def enrich_product(self, source: dict[str, Any], margin_rate: Optional[float] = None) -> dict[str, Any]:
+        return self.skip_enrichment(source)
+
+    def skip_enrichment(self, source: dict[str, Any]) -> dict[str, Any]:
+        return dict(source)
+
+    def _source(self, url: str, title: str, price: int, fetched: bool) -> dict[str, Any]:
+        return {
+            'source_site': 'amazon_jp',
+            'source_url': url,
+            'title': title,
+            'source_price_jpy': price,
+            'representative_image_url': 'https://img.example/real.jpg' if fetched else None,
+            'image_urls': [],
+            'source_description': '',
+            'key_features': [],
+            'specs': {},
+            'raw_text_snippet': '',
+            'note': 'HTML 추출' if fetched else 'fallback extraction 사용: ConnectError',
+            'fetched': fetched,
+        }
+
+
+@pytest.fixture
+def service(monkeypatch: pytest.MonkeyPatch) -> LinkPipelineService:
+    # render.yaml 배포 설정: 낮은 최소 마진 + 기본 대표 이미지(fallback도 사전검사를 통과한다)
+    monkeypatch.setattr(settings, 'min_margin_rate', 0.12)
+    monkeypatch.setattr(settings, 'naver_default_representative_image_url', 'https://img.example/default.jpg')
+    svc = LinkPipelineService()
+    publisher = RecordingPublisher()
+    svc.__dict__['llm'] = FakeLLM()
+    svc.__dict__['publisher'] = publisher
+    svc.__dict__['catalog'] = CatalogStore(':memory:')
+    svc.__dict__['product_sync'] = NaverProductSync(publisher, SentPayloadStore(':memory:'))
+    return svc
+
+
+def test_first_run_publishes_and_rerun_without_changes_skips(service: LinkPipelineService) -> None:
+    first = service.run(URL, auto_publish=True)
+    assert first.publish_status == 'published'
+    assert [c[0] for c in service.publisher.calls] == ['publish']
+
+    again = service.run(URL, auto_publish=True)
+    assert again.publish_status == 'published'
+    assert again.debug['naver_sync']['kind'] == 'skip'
+    assert [c[0] for c in service.publisher.calls] == ['publish']
+
+
+def test_failed_refetch_of_published_url_sends_no_update(service: LinkPipelineService) -> None:
+    assert service.run(URL, auto_publish=True).publish_status == 'published'
+    before = service.catalog.get(URL)
+
+    service.llm.fetched = False
+    res = service.run(URL, auto_publish=True)
+
+    assert res.publish_status == 'error'
+    assert not res.publish_result.attempted
+    assert [c[0] for c in service.publisher.calls] == ['publish']
+    # 마지막으로 보낸 payload도 그대로(다음 정상 수집 때 비교 기준)
+    sent = service.product_sync.store.get('9000001')
+    assert sent['originProduct']['name'] == '象印 ステンレスマグ SM-ZB48'
+    assert service.catalog.get(URL).market_product_id == before.market_product_id
+
+
+def test_failed_fetch_of_new_url_does_not_publish(service: LinkPipelineService) -> None:
+    service.llm.fetched = False
+    res = service.run(URL, auto_publish=True)
+    assert res.publish_status == 'error'
+    assert service.publisher.calls == []
+
+
+def test_failed_refetch_keeps_catalog_pricing_inputs(service: LinkPipelineService) -> None:
+    service.run(URL, auto_publish=True)
+    before = service.catalog.get(URL)
+
+    service.llm.fetched = False
+    service.run(URL, auto_publish=True)
+
+    after = service.catalog.get(URL)
+    assert (after.title, after.source_price_jpy, after.category, after.weight_g) == (
+        before.title,
+        before.source_price_jpy,
+        before.category,
+        before.weight_g,
+    )
+
+
+def test_tracking_params_sync_the_same_naver_product(service: LinkPipelineService) -> None:
+    assert service.run(URL, auto_publish=True).publish_status == 'published'
+
+    service.llm.price_jpy = 2400
+    res = service.run(URL + '/ref=sr_1_3?utm_source=line&tag=affiliate-22', auto_publish=True)
+
+    assert res.publish_status == 'published'
+    assert [c[0] for c in service.publisher.calls][0] == 'publish'
+    assert 'publish' not in [c[0] for c in service.publisher.calls][1:]
+    assert [it.source_url for it in service.catalog.all_items()] == [URL]
+    assert service.catalog.get(URL).source_price_jpy == 2400
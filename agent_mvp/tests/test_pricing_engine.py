@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services.pricing_engine import PricingEngine, PricingScenario, parse_weight_g, resolve_rounding_rule
+
+TABLES = {
+    'weight_classes': [
+        {'max_g': 500, 'shipping_cost_krw': 5000},
+        {'max_g': 2000, 'shipping_cost_krw': 9000},
+        {'max_g': None, 'shipping_cost_krw': 15000},
+    ],
+    'category_fee_rates': {'디지털/가전': 0.06},
+    'category_shipping_surcharge_krw': {'디지털/가전>휴대폰액세서리': 1000},
+}
+
+
+@pytest.fixture
+def engine() -> PricingEngine:
+    return PricingEngine(TABLES)
+
+
+@pytest.mark.parametrize(
+    'specs, expected',
+    [
+        ({'重量': '1,500g'}, 1500.0),
+        ({'本体重量': '約1.2kg'}, 1200.0),
+        ({'무게': '350 g'}, 350.0),
+        ({'Weight': '12,345.5g'}, 12345.5),
+        # 소수점 쉼표 표기는 "5kg"로 잘못 읽지 않는다
+        ({'重量': '1,5kg'}, None),
+        ({'サイズ': '500g'}, None),
+        (None, None),
+    ],
+)
+def test_parse_weight_g(specs, expected) -> None:
+    assert parse_weight_g(specs) == expected
+
+
+def test_unknown_rounding_rule_is_rejected() -> None:
+    with pytest.raises(ValueError, match='charm_990'):
+        resolve_rounding_rule('charm_990')
+
+
+def test_rounding_rule_defaults_to_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, 'pricing_rounding_rule', ' CEIL_100 ')
+    assert resolve_rounding_rule(None)(np.array([12301.0]))[0] == 12400
+
+
+def test_charm_900_rounding(engine: PricingEngine) -> None:
+    rule = resolve_rounding_rule('charm_900')
+    assert list(rule(np.array([12001.0, 12900.0, 12901.0]))) == [12900, 12900, 13900]
+
+
+def test_weight_class_and_category_tables(engine: PricingEngine) -> None:
+    inputs = engine.build_inputs(
+        [1000, 1000, 1000, 1000],
+        ['디지털/가전>휴대폰액세서리>케이블', None, None, '생활/건강'],
+        [500, 501, 5000, None],
+    )
+    assert list(inputs.shipping_cost_krw) == [6000, 9000, 15000, settings.default_shipping_cost_krw]
+    assert list(inputs.market_fee_rate) == [0.06, *[settings.default_market_fee_rate] * 3]
+
+
+def test_scenario_with_unknown_rounding_rule_raises(engine: PricingEngine) -> None:
+    with pytest.raises(ValueError):
+        engine.price(engine.build_inputs([1000]), PricingScenario(rounding_rule='round_up'))
+
+
+def test_price_one_matches_batch(engine: PricingEngine) -> None:
+    one = engine.price_one(2000, category='디지털/가전', weight_g=1500.0, fx_rate=9.0)
+    batch = engine.price(engine.build_inputs([2000], ['디지털/가전'], [1500.0]), PricingScenario(fx_rate=9.0))
+    assert one.target_price_krw == int(batch.target_price_krw[0])
+    assert one.shipping_cost_krw == 9000
+
+
+def test_simulate_endpoint_returns_400_for_unknown_rounding_rule() -> None:
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    body = {
+        'items': [{'source_price_jpy': 2000}],
+        'scenarios': [{'name': 'typo', 'rounding_rule': 'charm900'}],
+    }
+    res = TestClient(app).post('/pricing/simulate', json=body)
+    assert res.status_code == 400
+    assert 'charm900' in res.json()['detail']
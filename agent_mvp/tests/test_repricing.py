@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import pytest
+
+from app.config import settings
+from app.services.catalog_store import CatalogItem, CatalogStore
+from app.services.naver_sync import NaverProductSync, SentPayloadStore
+from app.services.pricing_engine import PricingEngine
+from app.services.repricing import CatalogRepricer
+from tests.fakes import RecordingPublisher
+
+FX = 9.0
+
+
+@pytest.fixture
+def repricer() -> CatalogRepricer:
+    publisher = RecordingPublisher()
+    return CatalogRepricer(
+        CatalogStore(':memory:'), PricingEngine(), NaverProductSync(publisher, SentPayloadStore(':memory:'))
+    )
+
+
+def _add(repricer: CatalogRepricer, url: str, price_jpy: int, market_product_id: str = '1001') -> CatalogItem:
+    pricing = repricer.pricing.price_one(price_jpy, fx_rate=FX)
+    item = CatalogItem(
+        source_url=url,
+        source_site='rakuten',
+        title='テスト商品',
+        source_price_jpy=price_jpy,
+        category=None,
+        weight_g=None,
+        policy_blocked=False,
+        policy_risk='low',
+        fx_rate=pricing.fx_rate,
+        shipping_cost_krw=pricing.shipping_cost_krw,
+        market_fee_rate=pricing.market_fee_rate,
+        target_price_krw=pricing.target_price_krw,
+        estimated_margin_rate=pricing.estimated_margin_rate,
+        approval_status='approved',
+        publish_status='published',
+        market_product_id=market_product_id,
+    )
+    repricer.catalog.upsert(item)
+    return item
+
+
+def _calls(repricer: CatalogRepricer) -> list[str]:
+    return [c[0] for c in repricer.sync.publisher.calls]
+
+
+def test_approval_change_at_unchanged_price_is_saved(
+    repricer: CatalogRepricer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    item = _add(repricer, 'https://item.rakuten.co.jp/shop/a/', 3000)
+    monkeypatch.setattr(settings, 'min_margin_rate', item.estimated_margin_rate + 0.05)
+
+    res = repricer.reprice(FX)
+
+    assert res.changed_count == 0
+    assert res.approval_changed_count == 1
+    assert repricer.catalog.get(item.source_url).approval_status == 'rejected'
+    assert _calls(repricer) == []
+
+
+def test_rejected_items_get_no_price_push(repricer: CatalogRepricer, monkeypatch: pytest.MonkeyPatch) -> None:
+    item = _add(repricer, 'https://item.rakuten.co.jp/shop/b/', 3000)
+    monkeypatch.setattr(settings, 'min_margin_rate', item.estimated_margin_rate + 0.05)
+
+    res = repricer.reprice(FX * 1.2)
+
+    assert res.changed_count == 1
+    assert res.items[0].new_approval_status == 'rejected'
+    assert not res.items[0].update_attempted
+    assert _calls(repricer) == []
+
+
+def test_approved_price_change_is_pushed(repricer: CatalogRepricer, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, 'min_margin_rate', 0.05)
+    item = _add(repricer, 'https://item.rakuten.co.jp/shop/c/', 3000)
+
+    res = repricer.reprice(FX * 1.2)
+
+    assert res.items[0].update_attempted and res.items[0].update_success
+    assert _calls(repricer) == ['update_price']
+    assert repricer.catalog.get(item.source_url).target_price_krw == res.items[0].new_target_price_krw
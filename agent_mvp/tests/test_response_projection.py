@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import gzip
+
+import orjson
+import pytest
+
+from app.config import settings
+from app.services.response_projection import json_response
+
+CONTENT = {'items': [{'title': '象印 ステンレスマグ', 'price': 2000}] * 50}
+
+
+@pytest.fixture(autouse=True)
+def compress_everything(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, 'response_compress_min_bytes', 1)
+
+
+@pytest.mark.parametrize(
+    'accept_encoding, expected',
+    [
+        ('gzip, deflate, br', 'br'),
+        ('gzip, br;q=0', 'gzip'),
+        ('br;q=0, gzip;q=0', None),
+        ('br;q=0.5, gzip', 'gzip'),
+        ('br;q=0.8, gzip;q=0.8', 'br'),
+        ('*;q=0', None),
+        ('*', 'br'),
+        ('br;q=0, *', 'gzip'),
+        ('identity', None),
+        ('', None),
+    ],
+)
+def test_content_encoding_follows_qvalues(accept_encoding: str, expected: str) -> None:
+    res = json_response(CONTENT, accept_encoding)
+    assert res.headers.get('content-encoding') == expected
+    assert res.headers['vary'] == 'Accept-Encoding'
+
+
+def test_gzip_body_round_trips() -> None:
+    res = json_response(CONTENT, 'gzip, br;q=0')
+    assert orjson.loads(gzip.decompress(res.body)) == CONTENT
@@ -8,6 +8,12 @@ const CONFIG = {
   AGENT_BASE_URL: 'https://YOUR-AGENT-URL', // 예: https://my-agent.onrender.com
   TIMEOUT_MS: 60000,
   AUTO_PUBLISH: true,
+  CHUNK_SIZE: 5, // 요청 1건당 링크 수
+  PARALLEL_REQUESTS: 4, // fetchAll로 동시에 보내는 요청 수
+  MAX_RUNTIME_MS: 5 * 60 * 1000, // Apps Script 6분 제한 전에 멈추고 체크포인트 저장
+  CHECKPOINT_KEY: 'agent_checkpoint',
+  LOCK_WAIT_MS: 10 * 1000, // 다른 실행이 체크포인트를 처리 중일 때 기다리는 최대 시간
+  MAX_RATE_LIMIT_RETRIES: 5, // 429(서버 대기열 가득)로 거절된 묶음을 다시 보내는 최대 횟수
 };
 
 const COL = {
@@ -42,6 +48,8 @@ function onOpen() {
     .createMenu('Agent 자동화')
     .addItem('선택 행 실행', 'runSelectedRows')
     .addItem('전체 행 실행', 'runAllRows')
+    .addItem('중단된 실행 이어하기', 'resumeFromCheckpoint')
+    .addItem('체크포인트 초기화', 'clearCheckpoint')
     .addItem('헤더 만들기', 'ensureHeaders')
     .addToUi();
 }
@@ -79,77 +87,239 @@ function processRows_(sheet, startRow, numRows) {
   if (startRow < 2) startRow = 2;
   if (numRows <= 0) return;
 
-  const values = sheet.getRange(startRow, 1, numRows, COL.llm_detail_sections_ko).getValues();
-  const urls = [];
-  const map = [];
+  withDocumentLock_(function () {
+    // 이전 실행이 남긴 재개 트리거가 새 체크포인트를 이어받아 같은 행을 두 번 처리하지 않게 먼저 지운다.
+    deleteResumeTriggers_();
+    // 속성 저장소 용량 제한(9KB) 때문에 URL 목록 대신 범위와 진행 위치만 저장
+    // retry: 429로 거절돼 Retry-After 뒤 다시 보낼 묶음(rows 인덱스 구간)
+    saveCheckpoint_({ sheetName: sheet.getName(), startRow: startRow, numRows: numRows, next: 0, retry: [] });
+    processCheckpoint_(sheet);
+  }, true);
+}
 
-  for (let i = 0; i < values.length; i++) {
-    const url = String(values[i][COL.source_url - 1] || '').trim();
-    if (!url) continue;
-    urls.push(url);
-    map.push(i);
+function collectRows_(sheet, startRow, numRows) {
+  const urlValues = sheet.getRange(startRow, COL.source_url, numRows, 1).getValues();
+  const rows = [];
+  for (let i = 0; i < urlValues.length; i++) {
+    const url = String(urlValues[i][0] || '').trim();
+    if (url) rows.push({ row: startRow + i, url: url });
   }
-  if (urls.length === 0) return;
-
-  const res = callAgentBatch_(urls);
-  const now = new Date();
-
-  for (let i = 0; i < res.length; i++) {
-    const rowIndex = map[i];
-    const out = res[i];
-
-    values[rowIndex][COL.source_site - 1] = safe_(out, 'extraction.source_site');
-    values[rowIndex][COL.title - 1] = safe_(out, 'extraction.title');
-    values[rowIndex][COL.source_price_jpy - 1] = safe_(out, 'extraction.source_price_jpy');
-    values[rowIndex][COL.target_price_krw - 1] = safe_(out, 'pricing.target_price_krw');
-    values[rowIndex][COL.estimated_margin_rate - 1] = safe_(out, 'pricing.estimated_margin_rate');
-    values[rowIndex][COL.policy_risk - 1] = safe_(out, 'policy.risk');
-    values[rowIndex][COL.approval_status - 1] = safe_(out, 'approval_status');
-    values[rowIndex][COL.publish_status - 1] = safe_(out, 'publish_status');
-    values[rowIndex][COL.market_product_id - 1] = safe_(out, 'publish_result.market_product_id');
-    values[rowIndex][COL.publish_message - 1] = safe_(out, 'publish_result.message');
-    values[rowIndex][COL.representative_image_url - 1] = safe_(out, 'extraction.representative_image_url');
-    values[rowIndex][COL.image_urls - 1] = stringifyList_(safe_(out, 'extraction.image_urls'));
-    values[rowIndex][COL.source_description - 1] = safe_(out, 'extraction.source_description');
-    values[rowIndex][COL.key_features - 1] = stringifyList_(safe_(out, 'extraction.key_features'));
-    values[rowIndex][COL.specs_json - 1] = stringifyJson_(safe_(out, 'extraction.specs'));
-    values[rowIndex][COL.llm_summary_ko - 1] = safe_(out, 'extraction.llm_summary_ko');
-    values[rowIndex][COL.llm_selling_points_ko - 1] = stringifyList_(safe_(out, 'extraction.llm_selling_points_ko'));
-    values[rowIndex][COL.llm_detail_outline_ko - 1] = stringifyList_(safe_(out, 'extraction.llm_detail_outline_ko'));
-    values[rowIndex][COL.raw_text_snippet - 1] = safe_(out, 'extraction.raw_text_snippet');
-    values[rowIndex][COL.llm_product_judgement_ko - 1] = safe_(out, 'extraction.llm_product_judgement_ko');
-    values[rowIndex][COL.llm_detail_sections_ko - 1] = stringifyList_(safe_(out, 'extraction.llm_detail_sections_ko'));
-
-    const notes = safe_(out, 'notes');
-    values[rowIndex][COL.notes - 1] = Array.isArray(notes) ? notes.join(' | ') : '';
-    values[rowIndex][COL.last_run_at - 1] = now;
+  return rows;
+}
+
+function resumeFromCheckpoint() {
+  // 다른 실행이 체크포인트를 처리 중이면 그 실행이 남은 행과 재개 트리거를 맡는다.
+  withDocumentLock_(function () {
+    deleteResumeTriggers_();
+    const cp = loadCheckpoint_();
+    if (!cp) return;
+    const sheet = SpreadsheetApp.getActiveSpreadsheet().getSheetByName(cp.sheetName);
+    if (!sheet) {
+      clearCheckpoint();
+      return;
+    }
+    processCheckpoint_(sheet);
+  }, false);
+}
+
+// 문서 단위 잠금: 한 번에 한 실행만 체크포인트를 읽고 쓴다. 잠금을 못 얻으면 실행하지 않는다.
+function withDocumentLock_(fn, notify) {
+  const lock = LockService.getDocumentLock();
+  if (!lock.tryLock(CONFIG.LOCK_WAIT_MS)) {
+    if (notify) SpreadsheetApp.getActiveSpreadsheet().toast('이미 실행 중인 작업이 있습니다. 끝난 뒤 다시 실행하세요.');
+    return;
   }
+  try {
+    fn();
+  } finally {
+    lock.releaseLock();
+  }
+}
 
-  sheet.getRange(startRow, 1, numRows, COL.llm_detail_sections_ko).setValues(values);
+function clearCheckpoint() {
+  PropertiesService.getDocumentProperties().deleteProperty(CONFIG.CHECKPOINT_KEY);
+  deleteResumeTriggers_();
 }
 
-function callAgentBatch_(sourceUrls) {
-  const url = CONFIG.AGENT_BASE_URL.replace(/\/$/, '') + '/run-link-batch';
-  const payload = {
-    source_urls: sourceUrls,
-    auto_publish: CONFIG.AUTO_PUBLISH,
-  };
+function processCheckpoint_(sheet) {
+  const startedAt = Date.now();
+  const cp = loadCheckpoint_();
+  if (!cp) return;
+  cp.retry = cp.retry || [];
+  const rows = collectRows_(sheet, cp.startRow, cp.numRows);
+
+  while (cp.next < rows.length || cp.retry.length) {
+    if (Date.now() - startedAt > CONFIG.MAX_RUNTIME_MS) {
+      // 실행 시간 초과 전 중단: 1분 뒤 남은 행부터 자동 재개
+      saveCheckpoint_(cp);
+      ScriptApp.newTrigger('resumeFromCheckpoint').timeBased().after(60 * 1000).create();
+      SpreadsheetApp.getActiveSpreadsheet().toast(
+        cp.next + '/' + rows.length + '행 처리, 나머지는 자동으로 이어서 실행합니다.'
+      );
+      return;
+    }
+
+    // 429로 미뤄 둔 묶음을 먼저, 남는 자리에 새 묶음
+    const chunks = [];
+    while (chunks.length < CONFIG.PARALLEL_REQUESTS && cp.retry.length) chunks.push(cp.retry.shift());
+    while (chunks.length < CONFIG.PARALLEL_REQUESTS && cp.next < rows.length) {
+      const end = Math.min(cp.next + CONFIG.CHUNK_SIZE, rows.length);
+      chunks.push({ start: cp.next, end: end, attempts: 0 });
+      cp.next = end;
+    }
+    const chunkRows = chunks.map(function (chunk) { return rows.slice(chunk.start, chunk.end); });
 
-  const response = UrlFetchApp.fetch(url, {
+    const responses = UrlFetchApp.fetchAll(chunkRows.map(function (chunk) {
+      return buildBatchRequest_(chunk.map(function (r) { return r.url; }));
+    }));
+
+    // 이번 묶음이 걸친 행 범위를 한 번만 읽어 변경 비교에 사용
+    let firstRow = Infinity;
+    let lastRow = 0;
+    chunkRows.forEach(function (chunk) {
+      firstRow = Math.min(firstRow, chunk[0].row);
+      lastRow = Math.max(lastRow, chunk[chunk.length - 1].row);
+    });
+    const block = sheet.getRange(firstRow, 1, lastRow - firstRow + 1, COL.llm_detail_sections_ko).getValues();
+
+    const now = new Date();
+    let retryAfterMs = 0;
+    for (let c = 0; c < chunks.length; c++) {
+      const waitMs = rateLimitedMs_(responses[c]);
+      if (waitMs !== null && chunks[c].attempts < CONFIG.MAX_RATE_LIMIT_RETRIES) {
+        // 오류로 적지 않고 Retry-After 뒤 다시 보낸다.
+        cp.retry.push({ start: chunks[c].start, end: chunks[c].end, attempts: chunks[c].attempts + 1 });
+        retryAfterMs = Math.max(retryAfterMs, waitMs);
+        continue;
+      }
+      const results = parseBatchResponse_(responses[c]);
+      for (let i = 0; i < chunkRows[c].length; i++) {
+        const row = chunkRows[c][i].row;
+        const out = results.error ? null : results.items[i];
+        writeRowIfChanged_(sheet, row, block[row - firstRow], out, results.error, now);
+      }
+    }
+    SpreadsheetApp.flush();
+    saveCheckpoint_(cp);
+
+    if (retryAfterMs > 0) {
+      // 서버가 바쁘다: 이번 실행은 멈추고 Retry-After 뒤 체크포인트에서 거절된 묶음부터 재개
+      ScriptApp.newTrigger('resumeFromCheckpoint').timeBased().after(retryAfterMs).create();
+      SpreadsheetApp.getActiveSpreadsheet().toast(
+        '서버 대기열이 가득 차 ' + Math.ceil(retryAfterMs / 1000) + '초 뒤 자동으로 이어서 실행합니다.'
+      );
+      return;
+    }
+  }
+
+  clearCheckpoint();
+}
+
+function writeRowIfChanged_(sheet, row, oldValues, out, errorMessage, now) {
+  const newValues = oldValues.slice();
+
+  if (out) {
+    fillRowValues_(newValues, out);
+  } else {
+    newValues[COL.publish_status - 1] = 'error';
+    newValues[COL.publish_message - 1] = errorMessage || '응답 없음';
+  }
+  newValues[COL.last_run_at - 1] = now;
+
+  // 바뀐 셀만 연속 구간 단위로 기록
+  let runStart = -1;
+  for (let c = 0; c <= newValues.length; c++) {
+    const changed = c < newValues.length && String(newValues[c]) !== String(oldValues[c]);
+    if (changed && runStart < 0) runStart = c;
+    if (!changed && runStart >= 0) {
+      sheet.getRange(row, runStart + 1, 1, c - runStart).setValues([newValues.slice(runStart, c)]);
+      runStart = -1;
+    }
+  }
+}
+
+function fillRowValues_(values, out) {
+  values[COL.source_site - 1] = safe_(out, 'extraction.source_site');
+  values[COL.title - 1] = safe_(out, 'extraction.title');
+  values[COL.source_price_jpy - 1] = safe_(out, 'extraction.source_price_jpy');
+  values[COL.target_price_krw - 1] = safe_(out, 'pricing.target_price_krw');
+  values[COL.estimated_margin_rate - 1] = safe_(out, 'pricing.estimated_margin_rate');
+  values[COL.policy_risk - 1] = safe_(out, 'policy.risk');
+  values[COL.approval_status - 1] = safe_(out, 'approval_status');
+  values[COL.publish_status - 1] = safe_(out, 'publish_status');
+  values[COL.market_product_id - 1] = safe_(out, 'publish_result.market_product_id');
+  values[COL.publish_message - 1] = safe_(out, 'publish_result.message');
+  values[COL.representative_image_url - 1] = safe_(out, 'extraction.representative_image_url');
+  values[COL.image_urls - 1] = stringifyList_(safe_(out, 'extraction.image_urls'));
+  values[COL.source_description - 1] = safe_(out, 'extraction.source_description');
+  values[COL.key_features - 1] = stringifyList_(safe_(out, 'extraction.key_features'));
+  values[COL.specs_json - 1] = stringifyJson_(safe_(out, 'extraction.specs'));
+  values[COL.llm_summary_ko - 1] = safe_(out, 'extraction.llm_summary_ko');
+  values[COL.llm_selling_points_ko - 1] = stringifyList_(safe_(out, 'extraction.llm_selling_points_ko'));
+  values[COL.llm_detail_outline_ko - 1] = stringifyList_(safe_(out, 'extraction.llm_detail_outline_ko'));
+  values[COL.raw_text_snippet - 1] = safe_(out, 'extraction.raw_text_snippet');
+  values[COL.llm_product_judgement_ko - 1] = safe_(out, 'extraction.llm_product_judgement_ko');
+  values[COL.llm_detail_sections_ko - 1] = stringifyList_(safe_(out, 'extraction.llm_detail_sections_ko'));
+
+  const notes = safe_(out, 'notes');
+  values[COL.notes - 1] = Array.isArray(notes) ? notes.join(' | ') : '';
+}
+
+function buildBatchRequest_(sourceUrls) {
+  return {
+    url: CONFIG.AGENT_BASE_URL.replace(/\/$/, '') + '/run-link-batch?profile=sheet',
     method: 'post',
     contentType: 'application/json',
     muteHttpExceptions: true,
-    payload: JSON.stringify(payload),
+    payload: JSON.stringify({
+      source_urls: sourceUrls,
+      auto_publish: CONFIG.AUTO_PUBLISH,
+    }),
+  };
+}
+
+// 429면 Retry-After(초, 없으면 60초)를 ms로, 아니면 null
+function rateLimitedMs_(response) {
+  if (response.getResponseCode() !== 429) return null;
+  const headers = response.getHeaders() || {};
+  let seconds = NaN;
+  Object.keys(headers).forEach(function (k) {
+    if (k.toLowerCase() === 'retry-after') seconds = parseInt(headers[k], 10);
   });
+  return (isNaN(seconds) || seconds < 1 ? 60 : seconds) * 1000;
+}
 
+function parseBatchResponse_(response) {
   const code = response.getResponseCode();
   const text = response.getContentText() || '';
   if (code >= 400) {
-    throw new Error('Agent API 오류: ' + code + ' ' + text.slice(0, 500));
+    return { error: 'Agent API 오류: ' + code + ' ' + text.slice(0, 300), items: [] };
   }
+  try {
+    return { error: '', items: JSON.parse(text).results || [] };
+  } catch (e) {
+    return { error: 'Agent API 응답 파싱 실패: ' + text.slice(0, 300), items: [] };
+  }
+}
+
+function saveCheckpoint_(cp) {
+  PropertiesService.getDocumentProperties().setProperty(CONFIG.CHECKPOINT_KEY, JSON.stringify(cp));
+}
+
+function loadCheckpoint_() {
+  const raw = PropertiesService.getDocumentProperties().getProperty(CONFIG.CHECKPOINT_KEY);
+  if (!raw) return null;
+  try {
+    return JSON.parse(raw);
+  } catch (e) {
+    return null;
+  }
+}
 
-  const json = JSON.parse(text);
-  return json.results || [];
+function deleteResumeTriggers_() {
+  ScriptApp.getProjectTriggers().forEach(function (t) {
+    if (t.getHandlerFunction() === 'resumeFromCheckpoint') ScriptApp.deleteTrigger(t);
+  });
 }
 
 function safe_(obj, path) {